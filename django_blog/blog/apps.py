@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blog'
+
+    def ready(self):
+        # Register signal handlers (search vector maintenance, etc.)
+        from . import signals  # noqa: F401
+        # Register custom field lookups (ilike_contains)
+        from . import lookups  # noqa: F401
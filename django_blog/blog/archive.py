@@ -0,0 +1,76 @@
+import datetime
+
+from django.db.models import Case, F, IntegerField, Q, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import MonthlyPostCount
+
+
+def month_of(moment):
+    """
+    First day of the (local-time) calendar month containing ``moment``.
+    """
+    return timezone.localtime(moment).date().replace(day=1)
+
+
+def month_bounds(year, month):
+    """
+    Aware datetimes ``[start, end)`` spanning a calendar month.
+
+    Raises ValueError for an invalid month.
+    """
+    start = datetime.date(year, month, 1)
+    end = datetime.date(year + month // 12, month % 12 + 1, 1)
+    tz = timezone.get_current_timezone()
+    return (
+        datetime.datetime.combine(start, datetime.time.min, tzinfo=tz),
+        datetime.datetime.combine(end, datetime.time.min, tzinfo=tz),
+    )
+
+
+def adjust_monthly_counts(deltas):
+    """
+    Apply ``{(author_id, month): change}`` to the rollup, updating both the
+    author's row and the site-wide row of each month, in two queries.
+    """
+    changes = {}
+    for (author_id, month), delta in deltas.items():
+        for key in ((author_id, month), (None, month)):
+            changes[key] = changes.get(key, 0) + delta
+    changes = {key: delta for key, delta in changes.items() if delta}
+    if not changes:
+        return
+
+    # Only increments may need a new row. A decrement's row exists unless
+    # its author is being deleted, and recreating it would reference them
+    MonthlyPostCount.objects.bulk_create(
+        [
+            MonthlyPostCount(author_id=author_id, month=month)
+            for (author_id, month), delta in changes.items() if delta > 0
+        ],
+        ignore_conflicts=True,
+    )
+    rows = [
+        Q(author__isnull=True, month=month) if author_id is None else Q(author_id=author_id, month=month)
+        for author_id, month in changes
+    ]
+    change = Case(
+        *[When(row, then=Value(delta)) for row, delta in zip(rows, changes.values())],
+        output_field=IntegerField(),
+    )
+    match = Q()
+    for row in rows:
+        match |= row
+    MonthlyPostCount.objects.filter(match).update(post_count=Greatest(F("post_count") + change, Value(0)))
+
+
+def archive_months(author=None):
+    """
+    Months with posts, newest first, for the site or for one author.
+
+    One query on a partial unique index of the rollup table.
+    """
+    rows = MonthlyPostCount.objects.filter(post_count__gt=0)
+    rows = rows.filter(author=author) if author is not None else rows.filter(author__isnull=True)
+    return rows.order_by("-month").only("month", "post_count")
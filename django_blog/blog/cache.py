@@ -0,0 +1,67 @@
+import time
+
+from django.core.cache import cache
+
+
+# How long rendered fragments live; correctness comes from the version keys,
+# so this only bounds how long orphaned fragments occupy memory.
+FRAGMENT_TIMEOUT = 60 * 60 * 24
+
+GLOBAL_TAGS_KEY = "blog:tags:v"
+# Bumped on every post write; all cached feed bytes hang off it
+FEEDS_VERSION_KEY = "blog:feeds:v"
+# The search corpus version: bumped on post and tag writes; cached search
+# results hang off it
+SEARCH_VERSION_KEY = "blog:search:v"
+
+
+def card_version_key(post_id):
+    return f"blog:post:{post_id}:card:v"
+
+
+def comments_version_key(post_id):
+    return f"blog:post:{post_id}:comments:v"
+
+
+def _new_version():
+    # A fresh token rather than an incremented counter: if a version key is
+    # evicted, the regenerated value can never collide with an old fragment.
+    return str(time.time_ns())
+
+
+def get_versions(keys):
+    """
+    Fetch several version tokens in one cache round trip, creating any that are missing.
+    """
+    versions = cache.get_many(keys)
+    missing = {key: _new_version() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return versions
+
+
+def bump(*keys):
+    """
+    Invalidate every fragment rendered under the given version keys.
+    """
+    cache.set_many({key: _new_version() for key in keys}, timeout=None)
+
+
+def attach_card_versions(posts):
+    """
+    Set ``post.card_version`` on each post so templates can key fragments on it.
+
+    One ``get_many`` covers the whole page, instead of a cache read per card.
+    """
+    posts = list(posts)
+    keys = [card_version_key(post.pk) for post in posts]
+    versions = get_versions(keys + [GLOBAL_TAGS_KEY])
+    tags_version = versions[GLOBAL_TAGS_KEY]
+    for post, key in zip(posts, keys):
+        post.card_version = f"{versions[key]}.{tags_version}"
+    return posts
+
+
+def comments_version(post_id):
+    return get_versions([comments_version_key(post_id)])[comments_version_key(post_id)]
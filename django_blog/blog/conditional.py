@@ -0,0 +1,141 @@
+import hashlib
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_vary_headers, quote_etag
+from django.utils.http import http_date
+
+from .cache import GLOBAL_TAGS_KEY, card_version_key, comments_version_key, get_versions
+from .models import Post
+
+
+def make_etag(*parts):
+    """
+    Hash arbitrary validator parts into a compact, quoted ETag.
+    """
+    digest = hashlib.md5("|".join(str(part) for part in parts).encode(), usedforsecurity=False)
+    return quote_etag(digest.hexdigest())
+
+
+class ConditionalGetMixin:
+    """
+    Answer If-None-Match / If-Modified-Since with 304 before rendering.
+
+    Views implement ``get_validators()`` returning ``(etag, last_modified)``
+    from a cheap query; when the client's copy is current the template,
+    the main queryset and the fragment cache are never touched.
+    """
+
+    def get_validators(self):
+        return None, None
+
+    def get_viewer_validator(self):
+        """
+        Pages differ per user (edit links, CSRF tokens in forms), so the
+        viewer is part of every ETag. Anonymous visitors all share one.
+        """
+        if not self.request.user.is_authenticated:
+            return "anon"
+        return f"{self.request.user.pk}:{self.request.COOKIES.get(settings.CSRF_COOKIE_NAME, '')}"
+
+    def not_modified(self, etag, last_modified):
+        """
+        Return a 304 (or 412) response if the client's validators still match.
+        """
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        return get_conditional_response(self.request, etag=etag, last_modified=timestamp)
+
+    def add_validator_headers(self, response, etag, last_modified):
+        if etag and not response.has_header("ETag"):
+            response["ETag"] = etag
+        if last_modified and not response.has_header("Last-Modified"):
+            response["Last-Modified"] = http_date(int(last_modified.timestamp()))
+        # Pages show per-user links, so shared caches must keep users apart
+        patch_vary_headers(response, ["Cookie"])
+        return response
+
+    def get(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators()
+        response = self.not_modified(etag, last_modified)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        return self.add_validator_headers(response, etag, last_modified)
+
+
+class AsyncConditionalGetMixin(ConditionalGetMixin):
+    """
+    Async variant: validators come from ``aget_validators()``. List it
+    directly before the mixin providing the async ``get()`` it wraps
+    (e.g. AsyncKeysetListMixin), so ``super().get()`` resolves to that.
+    """
+
+    async def aget_validators(self):
+        return None, None
+
+    async def get(self, request, *args, **kwargs):
+        etag, last_modified = await self.aget_validators()
+        response = self.not_modified(etag, last_modified)
+        if response is None:
+            response = await super().get(request, *args, **kwargs)
+        return self.add_validator_headers(response, etag, last_modified)
+
+
+class PostDetailConditionalMixin(ConditionalGetMixin):
+    """
+    Validators for a single post: one primary-key lookup plus one cache read.
+
+    ETag only. The page also changes with comment edits, tag renames and
+    the viewer, none of which a timestamp captures, so a Last-Modified
+    would let If-Modified-Since revalidate a stale copy.
+    """
+
+    def get_validator_row(self):
+        return Post.objects.filter(pk=self.kwargs["pk"]).values("updated_at", "last_comment_at")
+
+    def get_validators(self):
+        return self.validators_for(self.get_validator_row().first())
+
+    def validators_for(self, row):
+        pk = self.kwargs["pk"]
+        if row is None:
+            return None, None  # let the normal path raise 404
+        versions = get_versions([card_version_key(pk), comments_version_key(pk), GLOBAL_TAGS_KEY])
+        etag = make_etag(
+            pk, row["updated_at"], row["last_comment_at"],
+            *sorted(versions.items()), self.get_viewer_validator(),
+        )
+        return etag, None
+
+
+class PostListConditionalMixin(ConditionalGetMixin):
+    """
+    Validators for a keyset-paginated list: the visible page's ids,
+    timestamps and counters, read in one narrow indexed query. ETag only,
+    for the same reason as PostDetailConditionalMixin.
+    """
+
+    def get_validator_rows(self):
+        queryset = self.get_queryset()
+        page = self.get_page_queryset(queryset, self.get_paginate_by(queryset))
+        return page.values_list("id", "updated_at", "last_comment_at", "comment_count")
+
+    def get_validators(self):
+        return self.validators_for(list(self.get_validator_rows()))
+
+    def validators_for(self, rows):
+        if not rows:
+            return None, None
+        versions = get_versions([card_version_key(row[0]) for row in rows] + [GLOBAL_TAGS_KEY])
+        etag = make_etag(
+            self.request.get_full_path(), rows, *sorted(versions.items()), self.get_viewer_validator(),
+        )
+        return etag, None
+
+
+class AsyncPostDetailConditionalMixin(AsyncConditionalGetMixin, PostDetailConditionalMixin):
+    async def aget_validators(self):
+        return self.validators_for(await self.get_validator_row().afirst())
+
+
+class AsyncPostListConditionalMixin(AsyncConditionalGetMixin, PostListConditionalMixin):
+    async def aget_validators(self):
+        return self.validators_for([row async for row in self.get_validator_rows()])
@@ -0,0 +1,43 @@
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+def pool_metrics(connection=None):
+    """
+    Snapshot of a connection's pool (default: the ``default`` database), or
+    of its persistent-connection settings when it isn't pooled.
+
+    Counters (requests, waits, connections opened) are cumulative since the
+    pool was created in this process; sample twice and subtract for rates.
+    """
+    connection = connection or connections[DEFAULT_DB_ALIAS]
+    alias = connection.alias
+    pool = getattr(connection, "pool", None)
+    if pool is None:
+        return {
+            "alias": alias,
+            "pooled": False,
+            "conn_max_age": connection.settings_dict["CONN_MAX_AGE"],
+            "health_checks": connection.settings_dict["CONN_HEALTH_CHECKS"],
+        }
+
+    stats = pool.get_stats()
+    requests = stats.get("requests_num", 0)
+    wait_ms = stats.get("requests_wait_ms", 0)
+    size, idle = stats.get("pool_size", 0), stats.get("pool_available", 0)
+    return {
+        "alias": alias,
+        "pooled": True,
+        "min_size": stats.get("pool_min", pool.min_size),
+        "max_size": stats.get("pool_max", pool.max_size),
+        "size": size,
+        "in_use": size - idle,
+        "idle": idle,
+        "waiting": stats.get("requests_waiting", 0),
+        "requests": requests,
+        "wait_ms_total": wait_ms,
+        "wait_ms_avg": round(wait_ms / requests, 3) if requests else 0.0,
+        "request_errors": stats.get("requests_errors", 0),  # timeouts and queue overflows
+        "connections_opened": stats.get("connections_num", 0),
+        "connect_ms_total": stats.get("connections_ms", 0),
+        "connections_lost": stats.get("connections_lost", 0),
+    }
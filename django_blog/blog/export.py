@@ -0,0 +1,117 @@
+import csv
+import json
+import zlib
+
+from django.contrib.contenttypes.models import ContentType
+from taggit.models import TaggedItem
+
+from .models import Comment, Post
+
+
+# Rows fetched per server-side cursor round trip (and per tag prefetch)
+EXPORT_CHUNK_SIZE = 2000
+
+
+def post_rows(chunk_size=EXPORT_CHUNK_SIZE):
+    posts = (
+        Post.objects.select_related("author")
+        .prefetch_related("tags")
+        .only("id", "title", "content", "created_at", "updated_at", "comment_count", "author__username")
+        .order_by("pk")
+    )
+    # With prefetch_related, iterator() prefetches tags once per chunk
+    for post in posts.iterator(chunk_size=chunk_size):
+        yield {
+            "id": post.pk,
+            "title": post.title,
+            "content": post.content,
+            "author": post.author.username,
+            "tags": [tag.name for tag in post.tags.all()],
+            "comment_count": post.comment_count,
+            "created_at": post.created_at.isoformat(),
+            "updated_at": post.updated_at.isoformat(),
+        }
+
+
+def comment_rows(chunk_size=EXPORT_CHUNK_SIZE):
+    comments = Comment.objects.order_by("pk").values_list(
+        "pk", "post_id", "author__username", "content", "created_at", "updated_at"
+    )
+    for pk, post_id, author, content, created_at, updated_at in comments.iterator(chunk_size=chunk_size):
+        yield {
+            "id": pk,
+            "post": post_id,
+            "author": author,
+            "content": content,
+            "created_at": created_at.isoformat(),
+            "updated_at": updated_at.isoformat(),
+        }
+
+
+def tag_rows(chunk_size=EXPORT_CHUNK_SIZE):
+    assignments = (
+        TaggedItem.objects.filter(content_type=ContentType.objects.get_for_model(Post))
+        .order_by("pk")
+        .values_list("object_id", "tag__name", "tag__slug")
+    )
+    for post_id, name, slug in assignments.iterator(chunk_size=chunk_size):
+        yield {"post": post_id, "tag": name, "slug": slug}
+
+
+# dataset name → (row generator, CSV column order)
+DATASETS = {
+    "posts": (post_rows, ["id", "title", "content", "author", "tags", "comment_count", "created_at", "updated_at"]),
+    "comments": (comment_rows, ["id", "post", "author", "content", "created_at", "updated_at"]),
+    "tags": (tag_rows, ["post", "tag", "slug"]),
+}
+
+FORMATS = ("jsonl", "csv")
+
+
+class _Echo:
+    """
+    File-like object whose write() returns the value, so csv.writer can
+    produce one line at a time without buffering.
+    """
+
+    def write(self, value):
+        return value
+
+
+def jsonl_lines(rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+
+def csv_lines(rows, columns):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        values = dict(row, tags=",".join(row["tags"])) if "tags" in row else row
+        yield writer.writerow([values[column] for column in columns])
+
+
+def gzip_chunks(chunks):
+    """
+    Compress a stream of byte chunks into one gzip member as it is produced.
+    """
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_chunks(dataset, fmt="jsonl", compress=False, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield the serialized ``dataset`` as byte chunks, optionally gzip-compressed.
+
+    Rows come from a server-side cursor, so memory use stays flat however
+    large the table is.
+    """
+    row_source, columns = DATASETS[dataset]
+    rows = row_source(chunk_size)
+    lines = csv_lines(rows, columns) if fmt == "csv" else jsonl_lines(rows)
+    chunks = (line.encode("utf-8") for line in lines)
+    return gzip_chunks(chunks) if compress else chunks
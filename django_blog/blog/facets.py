@@ -0,0 +1,84 @@
+import datetime
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connections
+from django.utils import timezone
+from taggit.models import Tag, TaggedItem
+
+from .models import Post
+
+
+# Tag facets shown beside search results
+FACET_TAGS = 10
+# Selected tags a search may combine; more are ignored
+MAX_SELECTED_TAGS = 3
+
+
+def selected_facets(params):
+    """
+    The ``(tags, year)`` selection from request parameters: up to
+    ``MAX_SELECTED_TAGS`` distinct tag slugs, sorted, and a year or None.
+    """
+    tags = tuple(sorted({slug for slug in params.getlist("tag") if slug})[:MAX_SELECTED_TAGS])
+    try:
+        year = int(params.get("year", ""))
+    except ValueError:
+        year = None
+    if year is not None and not datetime.MINYEAR <= year <= datetime.MAXYEAR:
+        year = None  # created_at__year cannot build a range for it
+    return tags, year
+
+
+def narrow(queryset, tags=(), year=None):
+    """
+    Restrict a Post queryset to posts carrying every tag in ``tags`` and
+    written in ``year``. Each tag is an ``id IN (...)`` semi-join and the
+    year a ``created_at`` range, so the filters join the text query's
+    WHERE clause instead of costing queries of their own.
+    """
+    for slug in tags:
+        queryset = queryset.tagged(slug)
+    if year is not None:
+        queryset = queryset.filter(created_at__year=year)
+    return queryset
+
+
+def facet_counts(matches, tag_limit=FACET_TAGS):
+    """
+    Tag and year counts over the posts in ``matches``, in one grouped query.
+
+    Both GROUP BYs read the same CTE of matching ids, joined with UNION ALL;
+    the ORM can express either one but not both in a single statement.
+    Returns ``{"tags": [{"slug", "name", "count"}], "years": [{"year", "count"}]}``,
+    tags by count and years newest first.
+    """
+    ids_sql, params = matches.order_by().values("id", "created_at").query.sql_with_params()
+    sql = f"""
+        WITH matches AS ({ids_sql})
+        (
+            SELECT 'tag', t.slug, t.name, COUNT(*)
+            FROM matches m
+            JOIN {TaggedItem._meta.db_table} ti ON ti.object_id = m.id AND ti.content_type_id = %s
+            JOIN {Tag._meta.db_table} t ON t.id = ti.tag_id
+            GROUP BY t.id
+            ORDER BY COUNT(*) DESC, t.name
+            LIMIT %s
+        )
+        UNION ALL
+        (
+            SELECT 'year', EXTRACT(YEAR FROM m.created_at AT TIME ZONE %s)::int::text, NULL, COUNT(*)
+            FROM matches m
+            GROUP BY 2
+            ORDER BY 2 DESC
+        )
+    """
+    params = (*params, ContentType.objects.get_for_model(Post).id, tag_limit, timezone.get_current_timezone_name())
+    facets = {"tags": [], "years": []}
+    with connections[matches.db].cursor() as cursor:
+        cursor.execute(sql, params)
+        for kind, key, name, count in cursor.fetchall():
+            if kind == "tag":
+                facets["tags"].append({"slug": key, "name": name, "count": count})
+            else:
+                facets["years"].append({"year": int(key), "count": count})
+    return facets
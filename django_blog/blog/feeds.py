@@ -0,0 +1,137 @@
+from django.contrib.auth.models import User
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed
+from taggit.models import Tag
+
+from .cache import FEEDS_VERSION_KEY, FRAGMENT_TIMEOUT, get_versions
+from .conditional import make_etag
+from .models import Post
+
+
+# Number of newest posts in every feed
+FEED_ITEMS = 20
+
+
+class CachedFeedMixin:
+    """
+    Serve a Feed's serialized bytes from the cache until the next post write.
+
+    The ETag is derived from the feed, its arguments and the shared feed
+    version, so a matching If-None-Match returns 304 after a single cache
+    read and no database query. No Last-Modified is sent: the newest item's
+    timestamp misses deletes and tag renames, which bump the version only.
+    """
+
+    # Feeds only read, so blog.routers may serve them from a replica
+    replica_reads = True
+
+    def __call__(self, request, *args, **kwargs):
+        version = get_versions([FEEDS_VERSION_KEY])[FEEDS_VERSION_KEY]
+        etag = make_etag(type(self).__name__, request.get_host(), args, sorted(kwargs.items()), version)
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            cache_key = f"blog:feed:{etag.strip(chr(34))}"
+            entry = cache.get(cache_key)
+            if entry is None:
+                generated = super().__call__(request, *args, **kwargs)
+                entry = (generated["Content-Type"], generated.content)
+                cache.set(cache_key, entry, FRAGMENT_TIMEOUT)
+            content_type, body = entry
+            response = HttpResponse(body, content_type=content_type)
+        response["ETag"] = etag
+        return response
+
+
+class LatestPostsFeed(CachedFeedMixin, Feed):
+    """
+    RSS feed of the newest posts.
+    """
+    title = "Django Blog"
+    description = "Latest posts from Django Blog."
+
+    def link(self):
+        return reverse("post_list")
+
+    def items(self):
+        return Post.objects.for_feed()[:FEED_ITEMS]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.excerpt
+
+    def item_author_name(self, item):
+        return item.author.username
+
+    def item_pubdate(self, item):
+        return item.created_at
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+    def item_categories(self, item):
+        return [tag.name for tag in item.tags.all()]
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
+
+
+class TagPostsFeed(LatestPostsFeed):
+    """
+    RSS feed of the newest posts with a given tag.
+    """
+
+    def get_object(self, request, tag_slug):
+        return get_object_or_404(Tag, slug=tag_slug)
+
+    def title(self, obj):
+        return f'Django Blog: posts tagged "{obj.name}"'
+
+    def description(self, obj):
+        return f'Latest posts tagged "{obj.name}".'
+
+    def link(self, obj):
+        return reverse("posts_by_tag", args=[obj.slug])
+
+    def items(self, obj):
+        return Post.objects.for_feed().tagged(obj)[:FEED_ITEMS]
+
+
+class TagPostsAtomFeed(TagPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = TagPostsFeed.description
+
+
+class AuthorPostsFeed(LatestPostsFeed):
+    """
+    RSS feed of the newest posts by one author.
+    """
+
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def title(self, obj):
+        return f"Django Blog: posts by {obj.username}"
+
+    def description(self, obj):
+        return f"Latest posts by {obj.username}."
+
+    def link(self, obj):
+        return reverse("post_list")
+
+    def items(self, obj):
+        return Post.objects.for_feed().filter(author=obj)[:FEED_ITEMS]
+
+
+class AuthorPostsAtomFeed(AuthorPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = AuthorPostsFeed.description
@@ -2,6 +2,7 @@ from django import forms
 from django.contrib.auth.models import User
 from django.contrib.auth.forms import UserCreationForm
 from .models import Post
+from taggit.forms import TagWidget
 from taggit.models import Tag
 from .models import Comment
 
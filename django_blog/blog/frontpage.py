@@ -0,0 +1,142 @@
+import datetime
+
+from django.core.cache import cache
+from django.db.models import Sum
+from django.utils import timezone
+
+from .archive import month_of
+from .models import MonthlyPostCount, Post
+from .tags import tag_cloud
+
+
+FRONT_PAGE_KEY = "blog:frontpage"
+# Writes and view flushes drop the page and cron can run refresh_front_page; the
+# timeout only bounds how stale the time windows below can get without either
+FRONT_PAGE_TIMEOUT = 60 * 60
+
+# Size of each section
+FRONT_PAGE_POSTS = 10
+FRONT_PAGE_TAGS = 20
+FRONT_PAGE_DISCUSSED = 5
+FRONT_PAGE_POPULAR = 5
+FRONT_PAGE_AUTHORS = 5
+# "Most discussed" counts posts commented on this recently
+DISCUSSED_WINDOW = datetime.timedelta(days=7)
+# "Top authors" counts posts from this many calendar months
+AUTHOR_MONTHS = 12
+
+
+def _post_summary(post, tags=True):
+    summary = {
+        "id": post.pk,
+        "title": post.title,
+        "excerpt": post.excerpt,
+        "author": post.author.username,
+        "created_at": post.created_at,
+        "reading_time": post.reading_time,
+        "comment_count": post.comment_count,
+    }
+    if tags:
+        summary["tags"] = [{"name": tag.name, "slug": tag.slug} for tag in post.tags.all()]
+    return summary
+
+
+def latest_posts(limit=FRONT_PAGE_POSTS):
+    posts = Post.objects.for_listing().order_by("-created_at", "-id")[:limit]
+    return [_post_summary(post) for post in posts]
+
+
+def popular_tags(limit=FRONT_PAGE_TAGS):
+    return [
+        {"name": stat.tag.name, "slug": stat.tag.slug, "post_count": stat.post_count, "weight": stat.weight}
+        for stat in tag_cloud(limit=limit)
+    ]
+
+
+def most_discussed(limit=FRONT_PAGE_DISCUSSED, now=None):
+    """
+    Posts with the most comments among those commented on within
+    ``DISCUSSED_WINDOW``; the window is a range on the activity index.
+    """
+    since = (now or timezone.now()) - DISCUSSED_WINDOW
+    posts = (
+        Post.objects.select_related("author")
+        .only("id", "title", "excerpt", "created_at", "reading_time", "comment_count", "author__username")
+        .filter(last_comment_at__gte=since)
+        .order_by("-comment_count", "-id")[:limit]
+    )
+    return [_post_summary(post, tags=False) for post in posts]
+
+
+def popular_posts(limit=FRONT_PAGE_POPULAR):
+    """
+    Posts with the highest ``hot_score``: views decayed with a 48-hour
+    half-life (see blog.popularity), read from the partial hot-score index.
+    """
+    posts = (
+        Post.objects.select_related("author")
+        .only("id", "title", "excerpt", "created_at", "reading_time", "comment_count", "author__username")
+        .filter(hot_score__isnull=False)
+        .order_by("-hot_score", "-id")[:limit]
+    )
+    return [_post_summary(post, tags=False) for post in posts]
+
+
+def top_authors(limit=FRONT_PAGE_AUTHORS, now=None):
+    """
+    Authors with the most posts over the last ``AUTHOR_MONTHS`` months,
+    summed from the monthly rollup rather than counted from Post.
+    """
+    current = month_of(now or timezone.now())
+    index = current.year * 12 + current.month - AUTHOR_MONTHS  # months since year 0, zero-based
+    since = datetime.date(index // 12, index % 12 + 1, 1)
+    rows = (
+        MonthlyPostCount.objects.filter(author__isnull=False, month__gte=since)
+        .values("author__username")
+        .annotate(post_count=Sum("post_count"))
+        .filter(post_count__gt=0)
+        .order_by("-post_count", "author__username")[:limit]
+    )
+    return [{"username": row["author__username"], "post_count": row["post_count"]} for row in rows]
+
+
+def build_front_page(now=None):
+    """
+    Assemble the front page context from plain values (no model
+    instances), so rendering it can never fall back to a query.
+    """
+    now = now or timezone.now()
+    return {
+        "latest_posts": latest_posts(),
+        "popular_tags": popular_tags(),
+        "most_discussed": most_discussed(now=now),
+        "popular_posts": popular_posts(),
+        "top_authors": top_authors(now=now),
+        "built_at": now,
+    }
+
+
+def refresh_front_page():
+    context = build_front_page()
+    cache.set(FRONT_PAGE_KEY, context, FRONT_PAGE_TIMEOUT)
+    return context
+
+
+def invalidate_front_page():
+    """
+    Drop the cached front page; the next request rebuilds it. A burst of
+    writes (a post and its tags, a post and its comments) costs one
+    rebuild instead of one per row.
+    """
+    cache.delete(FRONT_PAGE_KEY)
+
+
+def front_page():
+    """
+    The cached front page context: one cache read, rebuilt only if it
+    has been invalidated, has expired or was evicted.
+    """
+    context = cache.get(FRONT_PAGE_KEY)
+    if context is None:
+        context = refresh_front_page()
+    return context
@@ -0,0 +1,21 @@
+from django.db.models import CharField, Lookup
+
+
+@CharField.register_lookup
+class IContainsIndexed(Lookup):
+    """
+    ``field__ilike_contains=value``: a case-insensitive substring match
+    compiled as ``field ILIKE '%value%'``.
+
+    Django's ``icontains`` compiles to ``UPPER(field::text) LIKE UPPER(...)``
+    on PostgreSQL, an expression the ``gin_trgm_ops`` indexes on the bare
+    column cannot serve; ILIKE on the column itself can.
+    """
+
+    lookup_name = "ilike_contains"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        rhs_params = [f"%{connection.ops.prep_for_like_query(value)}%" for value in rhs_params]
+        return f"{lhs} ILIKE {rhs}", [*lhs_params, *rhs_params]
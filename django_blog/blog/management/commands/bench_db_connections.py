@@ -0,0 +1,95 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from blog.dbpool import pool_metrics
+from blog.models import Post
+
+from .bench_http import percentile
+
+
+# How each mode connects: a new connection per request, one connection kept
+# for the whole run, or connections borrowed from a psycopg 3 pool
+MODES = {
+    "new": {"CONN_MAX_AGE": 0},
+    "persistent": {"CONN_MAX_AGE": None},
+    "pool": {"CONN_MAX_AGE": 0, "pool": {"min_size": 1, "max_size": 1}},
+}
+
+
+def mode_settings(base, mode):
+    settings_dict = {**base, "CONN_MAX_AGE": MODES[mode]["CONN_MAX_AGE"]}
+    options = {key: value for key, value in base.get("OPTIONS", {}).items() if key != "pool"}
+    if "pool" in MODES[mode]:
+        options["pool"] = MODES[mode]["pool"]
+    settings_dict["OPTIONS"] = options
+    return settings_dict
+
+
+class Command(BaseCommand):
+    help = (
+        "Time simulated requests (open/reuse a connection, run the list page's "
+        "query, finish the request) with a new connection per request, a "
+        "persistent connection and a connection pool, to show how much of the "
+        "latency is connection setup."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--queries", type=int, default=3, help="Queries per simulated request.")
+        parser.add_argument("--mode", choices=sorted(MODES), action="append", help="Default: all modes.")
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1 or options["queries"] < 1:
+            raise CommandError("--requests and --queries must be positive.")
+        base = connections[DEFAULT_DB_ALIAS].settings_dict
+        baseline = None
+        for mode in options["mode"] or MODES:
+            # A temporary alias per mode, so nothing is shared with the default
+            # connection (or with Django's per-alias pool registry)
+            alias = f"bench_{mode}"
+            connections.settings[alias] = mode_settings(base, mode)
+            connection = connections[alias]
+            try:
+                latencies = self.run(connection, options["requests"], options["queries"])
+                metrics = pool_metrics(connection)
+            finally:
+                connection.close()
+                if connection.pool:
+                    connection.close_pool()
+                del connections[alias]
+                del connections.settings[alias]
+            mean = statistics.fmean(latencies)
+            baseline = baseline if baseline is not None else mean
+            self.report(mode, sorted(latencies), mean, baseline, metrics)
+
+    def run(self, connection, requests, queries):
+        sql = f"SELECT id, title FROM {Post._meta.db_table} ORDER BY created_at DESC, id DESC LIMIT 10"
+        latencies = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            # What Django's request_started / request_finished handlers do
+            connection.close_if_unusable_or_obsolete()
+            with connection.cursor() as cursor:
+                for _ in range(queries):
+                    cursor.execute(sql)
+                    cursor.fetchall()
+            connection.close_if_unusable_or_obsolete()
+            latencies.append(time.perf_counter() - started)
+        return latencies
+
+    def report(self, mode, latencies, mean, baseline, metrics):
+        ms = 1000
+        line = (
+            f"{mode:<11} mean {mean * ms:7.2f} ms  p50 {percentile(latencies, 0.50) * ms:7.2f}  "
+            f"p90 {percentile(latencies, 0.90) * ms:7.2f}  p99 {percentile(latencies, 0.99) * ms:7.2f}  "
+            f"({mean / baseline:.0%} of first mode)"
+        )
+        if metrics["pooled"]:
+            line += (
+                f"\n{'':<11} pool: {metrics['connections_opened']} connections opened for "
+                f"{metrics['requests']} checkouts, wait {metrics['wait_ms_avg']} ms avg"
+            )
+        self.stdout.write(line)
@@ -0,0 +1,90 @@
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+async def fetch(host, port, request_bytes):
+    """
+    One HTTP/1.1 request on a fresh connection; returns (status, seconds).
+    """
+    started = time.perf_counter()
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(request_bytes)
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()  # Connection: close, so read to EOF
+    finally:
+        writer.close()
+    status = int(status_line.split()[1]) if status_line else 0
+    return status, time.perf_counter() - started
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test running blog servers and report requests/s and latency percentiles, "
+        "e.g. to compare the WSGI and ASGI (async view) deployments of the same URLs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("urls", nargs="+", help="Absolute http:// URLs, requested round-robin.")
+        parser.add_argument("--requests", type=int, default=1000)
+        parser.add_argument("--concurrency", type=int, default=50)
+
+    def handle(self, *args, **options):
+        targets = []
+        for url in options["urls"]:
+            parts = urlsplit(url)
+            if parts.scheme != "http" or not parts.hostname:
+                raise CommandError(f"Only absolute http:// URLs are supported: {url}")
+            path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+            request_bytes = (
+                f"GET {path} HTTP/1.1\r\nHost: {parts.netloc}\r\nConnection: close\r\n\r\n"
+            ).encode()
+            targets.append((parts.hostname, parts.port or 80, request_bytes))
+
+        latencies, statuses, elapsed = asyncio.run(
+            self.run(targets, options["requests"], options["concurrency"])
+        )
+        if not latencies:
+            raise CommandError("Every request failed; is the server running?")
+        latencies.sort()
+        errors = sum(1 for status in statuses if not 200 <= status < 400)
+        ms = 1000
+        self.stdout.write(
+            f"{len(statuses)} requests, concurrency {options['concurrency']}, {errors} errors\n"
+            f"throughput: {len(latencies) / elapsed:.1f} req/s\n"
+            f"latency ms: p50 {percentile(latencies, 0.50) * ms:.1f}  "
+            f"p90 {percentile(latencies, 0.90) * ms:.1f}  "
+            f"p99 {percentile(latencies, 0.99) * ms:.1f}  "
+            f"mean {statistics.fmean(latencies) * ms:.1f}"
+        )
+
+    async def run(self, targets, total, concurrency):
+        queue = asyncio.Queue()
+        for i in range(total):
+            queue.put_nowait(targets[i % len(targets)])
+        latencies, statuses = [], []
+
+        async def worker():
+            while not queue.empty():
+                host, port, request_bytes = queue.get_nowait()
+                try:
+                    status, seconds = await fetch(host, port, request_bytes)
+                except OSError:
+                    statuses.append(0)  # connection failure: an error, not a latency
+                    continue
+                statuses.append(status)
+                latencies.append(seconds)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return latencies, statuses, time.perf_counter() - started
@@ -0,0 +1,32 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from blog.export import DATASETS, EXPORT_CHUNK_SIZE, FORMATS, export_chunks
+
+
+class Command(BaseCommand):
+    help = "Stream posts, comments or tag assignments to JSONL or CSV with constant memory."
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", choices=sorted(DATASETS))
+        parser.add_argument("--format", choices=FORMATS, default="jsonl")
+        parser.add_argument("--gzip", action="store_true", help="gzip-compress the output.")
+        parser.add_argument("--output", "-o", default="-", help="File to write, or - for stdout.")
+        parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        chunks = export_chunks(options["dataset"], options["format"], options["gzip"], options["chunk_size"])
+        if options["output"] == "-":
+            out = sys.stdout.buffer
+            for chunk in chunks:
+                out.write(chunk)
+            out.flush()
+            return
+
+        written = 0
+        with open(options["output"], "wb") as out:
+            for chunk in chunks:
+                out.write(chunk)
+                written += len(chunk)
+        self.stderr.write(self.style.SUCCESS(f"Wrote {written} bytes to {options['output']}."))
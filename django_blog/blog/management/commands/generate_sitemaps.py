@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog import sitemaps
+
+
+class Command(BaseCommand):
+    help = "Write sitemap.xml and its id-range shards to BLOG_SITEMAP_ROOT."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--section", choices=sorted(sitemaps.SECTIONS), help="Only regenerate this section.")
+        parser.add_argument("--shard", type=int, help="Only regenerate this shard (requires --section).")
+
+    def handle(self, *args, **options):
+        section, shard = options["section"], options["shard"]
+        if shard is not None and section is None:
+            raise CommandError("--shard requires --section.")
+
+        sections = [section] if section else list(sitemaps.SECTIONS)
+        written = 0
+        for name in sections:
+            shards = [shard] if shard is not None else range(sitemaps.shard_count(name))
+            for number in shards:
+                path = sitemaps.write_shard(name, number)
+                written += 1
+                self.stdout.write(f"Wrote {path.name}")
+
+        sitemaps.write_index()
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} sitemap shards and the index to {sitemaps.sitemap_root()}."))
@@ -0,0 +1,240 @@
+import json
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from taggit.models import Tag, TaggedItem
+
+from blog import sitemaps
+from blog.archive import adjust_monthly_counts, month_of
+from blog.cache import FEEDS_VERSION_KEY, GLOBAL_TAGS_KEY, SEARCH_VERSION_KEY, bump
+from blog.frontpage import invalidate_front_page
+from blog.models import Comment, Post
+from blog.rendering import render_html
+from blog.search import update_search_vectors
+from blog.tags import adjust_tag_stats
+
+
+@contextmanager
+def preserved_timestamps(*models):
+    """
+    Let bulk_create keep the imported created_at / updated_at values instead of
+    overwriting them through auto_now / auto_now_add.
+    """
+    saved = []
+    for model in models:
+        for field in model._meta.concrete_fields:
+            if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False):
+                saved.append((field, field.auto_now, field.auto_now_add))
+                field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-load posts, comments and tags from JSONL. Each line is either\n"
+        '  {"type": "post", "id": "<source id>", "author": "<username>", "title": ..., '
+        '"content": ..., "tags": [...], "created_at": "<ISO 8601>"}\n'
+        'or\n'
+        '  {"type": "comment", "post": "<source post id>", "author": "<username>", '
+        '"content": ..., "created_at": "<ISO 8601>"}\n'
+        "Comments may reference posts from earlier lines of the same import."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="JSONL file to read, or - for stdin.")
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        self.batch_size = options["batch_size"]
+        if self.batch_size < 1:
+            raise CommandError("--batch-size must be positive.")
+
+        self.post_type = ContentType.objects.get_for_model(Post)
+        self.author_ids = {}   # username → User.pk
+        self.post_ids = {}     # source post id → Post.pk
+        self.tag_ids = {}      # tag name → Tag.pk
+        self.pending_posts = []
+        self.pending_comments = []
+        self.touched_shards = {"posts": set(), "tags": set()}
+        self.counts = {"posts": 0, "comments": 0, "tags": 0, "skipped": 0}
+        self.started = time.monotonic()
+
+        stream = sys.stdin if options["path"] == "-" else open(options["path"], encoding="utf-8")
+        try:
+            with preserved_timestamps(Post, Comment):
+                for line_number, line in enumerate(stream, start=1):
+                    if line.strip():
+                        self.read_record(line, line_number)
+                self.flush_posts()
+                self.flush_comments()
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        self.refresh_caches()
+        self.stdout.write(self.style.SUCCESS(f"Imported {self.progress()}."))
+
+    def read_record(self, line, line_number):
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            raise CommandError(f"Line {line_number}: invalid JSON ({exc}).")
+
+        kind = record.get("type")
+        if kind == "post":
+            self.pending_posts.append(record)
+            if len(self.pending_posts) >= self.batch_size:
+                self.flush_posts()
+        elif kind == "comment":
+            self.pending_comments.append(record)
+            if len(self.pending_comments) >= self.batch_size:
+                # Comments may point at posts still waiting in the buffer
+                self.flush_posts()
+                self.flush_comments()
+        else:
+            raise CommandError(f"Line {line_number}: unknown record type {kind!r}.")
+
+    def progress(self):
+        elapsed = max(time.monotonic() - self.started, 1e-6)
+        rows = self.counts["posts"] + self.counts["comments"]
+        return (
+            f"{self.counts['posts']} posts, {self.counts['comments']} comments, "
+            f"{self.counts['tags']} tag assignments, {self.counts['skipped']} skipped "
+            f"in {elapsed:.1f}s ({rows / elapsed:.0f} rows/s)"
+        )
+
+    def resolve_authors(self, records):
+        """
+        Fill the username → id map for a batch with one query.
+        """
+        missing = {r.get("author") for r in records} - self.author_ids.keys()
+        if missing:
+            self.author_ids.update(User.objects.filter(username__in=missing).values_list("username", "pk"))
+
+    def resolve_tags(self, names):
+        """
+        Map tag names to ids in bulk, creating the missing tags with one
+        INSERT. Names whose slug collides with an existing tag fall back to
+        taggit's own save(), which picks a unique slug.
+        """
+        missing = set(names) - self.tag_ids.keys()
+        if missing:
+            self.tag_ids.update(Tag.objects.filter(name__in=missing).values_list("name", "pk"))
+            missing -= self.tag_ids.keys()
+        if missing:
+            Tag.objects.bulk_create(
+                [Tag(name=name, slug=Tag().slugify(name)) for name in missing], ignore_conflicts=True
+            )
+            self.tag_ids.update(Tag.objects.filter(name__in=missing).values_list("name", "pk"))
+            for name in missing - self.tag_ids.keys():
+                self.tag_ids[name] = Tag.objects.create(name=name).pk
+            self.touched_shards["tags"].update(sitemaps.shard_for(self.tag_ids[name]) for name in missing)
+
+    def parse_created(self, record):
+        value = record.get("created_at")
+        created = parse_datetime(value) if value else None
+        return created or timezone.now()
+
+    def flush_posts(self):
+        records, self.pending_posts = self.pending_posts, []
+        if not records:
+            return
+        self.resolve_authors(records)
+
+        posts, sources = [], []
+        for record in records:
+            author_id = self.author_ids.get(record.get("author"))
+            if author_id is None:
+                self.counts["skipped"] += 1
+                continue
+            created = self.parse_created(record)
+            post = Post(
+                title=record.get("title", ""),
+                content=record.get("content", ""),
+                author_id=author_id,
+                created_at=created,
+                updated_at=parse_datetime(record.get("updated_at") or "") or created,
+            )
+            post.render_content()
+            posts.append(post)
+            sources.append(record)
+
+        with transaction.atomic():
+            Post.objects.bulk_create(posts)
+
+            self.resolve_tags({name for record in sources for name in record.get("tags", [])})
+            tagged = [
+                TaggedItem(content_type=self.post_type, object_id=post.pk, tag_id=self.tag_ids[name])
+                for post, record in zip(posts, sources)
+                for name in set(record.get("tags", []))
+            ]
+            TaggedItem.objects.bulk_create(tagged, ignore_conflicts=True)
+            if tagged:
+                adjust_tag_stats(Counter(item.tag_id for item in tagged), used_at=max(p.created_at for p in posts))
+            adjust_monthly_counts(Counter((post.author_id, month_of(post.created_at)) for post in posts))
+
+            if posts:
+                update_search_vectors(Post.objects.filter(pk__gte=posts[0].pk, pk__lte=posts[-1].pk))
+
+        for post, record in zip(posts, sources):
+            if "id" in record:
+                self.post_ids[str(record["id"])] = post.pk
+            self.touched_shards["posts"].add(sitemaps.shard_for(post.pk))
+        self.counts["posts"] += len(posts)
+        self.counts["tags"] += len(tagged)
+        self.stdout.write(self.progress())
+
+    def flush_comments(self):
+        records, self.pending_comments = self.pending_comments, []
+        if not records:
+            return
+        self.resolve_authors(records)
+
+        comments = []
+        for record in records:
+            author_id = self.author_ids.get(record.get("author"))
+            post_id = self.post_ids.get(str(record.get("post")))
+            if author_id is None or post_id is None:
+                self.counts["skipped"] += 1
+                continue
+            created = self.parse_created(record)
+            content = record.get("content", "")
+            comments.append(Comment(
+                post_id=post_id,
+                author_id=author_id,
+                content=content,
+                rendered_html=render_html(content),
+                created_at=created,
+                updated_at=parse_datetime(record.get("updated_at") or "") or created,
+            ))
+
+        with transaction.atomic():
+            Comment.objects.bulk_create(comments)
+            Post.objects.filter(pk__in={c.post_id for c in comments}).refresh_comment_counters()
+
+        self.counts["comments"] += len(comments)
+        self.stdout.write(self.progress())
+
+    def refresh_caches(self):
+        """
+        bulk_create skips the signal handlers, so invalidate what they would have.
+        """
+        bump(FEEDS_VERSION_KEY, GLOBAL_TAGS_KEY, SEARCH_VERSION_KEY)
+        invalidate_front_page()
+        if sitemaps.is_generated():
+            for section, shards in self.touched_shards.items():
+                for shard in sorted(shards):
+                    sitemaps.write_shard(section, shard)
+            sitemaps.write_index()
@@ -0,0 +1,63 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from blog.models import Post
+from blog.related import refresh_related
+
+
+def refresh_batch(post_ids):
+    try:
+        return len(post_ids), refresh_related(post_ids)
+    finally:
+        # Worker threads open their own connections; don't leak them
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = "Recompute the related-posts table for every post, in id-ordered batches across worker threads."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--workers", type=int, default=4)
+
+    def batches(self, batch_size):
+        last_id = 0
+        while True:
+            ids = list(Post.objects.filter(pk__gt=last_id).order_by("pk").values_list("pk", flat=True)[:batch_size])
+            if not ids:
+                return
+            yield ids
+            last_id = ids[-1]
+
+    def handle(self, *args, **options):
+        batches = self.batches(options["batch_size"])
+        workers = options["workers"]
+        if workers <= 1:
+            self.report((len(ids), refresh_related(ids)) for ids in batches)
+            return
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            self.report(self.run_parallel(pool, batches, workers))
+
+    def run_parallel(self, pool, batches, workers):
+        """
+        Yield batch results while keeping at most two batches per worker in
+        flight, so the id list is never materialized all at once.
+        """
+        pending = deque()
+        for ids in batches:
+            pending.append(pool.submit(refresh_batch, ids))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+    def report(self, results):
+        posts = entries = 0
+        for done, written in results:
+            posts += done
+            entries += written
+            self.stdout.write(f"Refreshed {posts} posts")
+        self.stdout.write(self.style.SUCCESS(f"Stored {entries} related-post entries for {posts} posts."))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+from blog.search import update_search_vectors
+
+
+class Command(BaseCommand):
+    help = "Recompute Post.search_vector for every post, one UPDATE per batch of ascending ids."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        last_id = 0
+        total = 0
+        while True:
+            batch = list(Post.objects.filter(pk__gt=last_id).order_by("pk").values_list("pk", flat=True)[:batch_size])
+            if not batch:
+                break
+            update_search_vectors(Post.objects.filter(pk__in=batch))
+            last_id = batch[-1]
+            total += len(batch)
+            self.stdout.write(f"Indexed {total} posts (last id {last_id})")
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt search vectors for {total} posts."))
@@ -0,0 +1,32 @@
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+
+from blog.models import MonthlyPostCount, Post
+
+
+class Command(BaseCommand):
+    help = "Rebuild the MonthlyPostCount rollup (posts per month, per author and site-wide) from Post."
+
+    def handle(self, *args, **options):
+        per_author = (
+            Post.objects.annotate(month=TruncMonth("created_at")).order_by()
+            .values("author_id", "month").annotate(n=Count("pk"))
+        )
+        counts = Counter()
+        for row in per_author:
+            month = row["month"].date()
+            counts[(row["author_id"], month)] += row["n"]
+            counts[(None, month)] += row["n"]
+
+        rows = [
+            MonthlyPostCount(author_id=author_id, month=month, post_count=n)
+            for (author_id, month), n in counts.items()
+        ]
+        with transaction.atomic():
+            MonthlyPostCount.objects.all().delete()
+            MonthlyPostCount.objects.bulk_create(rows, batch_size=1000)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {len(rows)} monthly archive counts."))
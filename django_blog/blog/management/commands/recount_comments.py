@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute Post.comment_count and Post.last_comment_at from the Comment table, "
+        "one batch of post ids per UPDATE, to repair drift."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        last_id = 0
+        total = 0
+        while True:
+            ids = list(Post.objects.filter(pk__gt=last_id).order_by("pk").values_list("pk", flat=True)[:batch_size])
+            if not ids:
+                break
+            Post.objects.filter(pk__gte=ids[0], pk__lte=ids[-1]).refresh_comment_counters()
+            last_id = ids[-1]
+            total += len(ids)
+            self.stdout.write(f"Recounted {total} posts (last id {last_id})")
+        self.stdout.write(self.style.SUCCESS(f"Recounted comments for {total} posts."))
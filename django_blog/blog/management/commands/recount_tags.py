@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Max, OuterRef, Subquery
+
+from blog.models import Post, TagStat
+from blog.tags import post_tagged_items
+
+
+class Command(BaseCommand):
+    help = "Recompute TagStat (post count and last use per tag) from taggit's TaggedItem table."
+
+    def handle(self, *args, **options):
+        created = Post.objects.filter(pk=OuterRef("object_id")).values("created_at")
+        rows = (
+            post_tagged_items().order_by().values("tag_id")
+            .annotate(post_count=Count("pk"), last_used_at=Max(Subquery(created)))
+        )
+        stats = [TagStat(**row) for row in rows]
+        with transaction.atomic():
+            TagStat.objects.all().delete()
+            TagStat.objects.bulk_create(stats, batch_size=1000)
+        self.stdout.write(self.style.SUCCESS(f"Recounted {len(stats)} tags."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from blog.frontpage import refresh_front_page
+
+
+class Command(BaseCommand):
+    help = "Rebuild the cached front page context (run from cron to keep its time windows current)."
+
+    def handle(self, *args, **options):
+        context = refresh_front_page()
+        self.stdout.write(self.style.SUCCESS(
+            f"Front page rebuilt: {len(context['latest_posts'])} posts, {len(context['popular_tags'])} tags, "
+            f"{len(context['most_discussed'])} discussed, {len(context['top_authors'])} authors."
+        ))
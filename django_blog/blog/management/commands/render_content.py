@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.models import Comment, Post
+from blog.rendering import render_html
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfill pre-rendered fields (Post.rendered_html/excerpt/word_count/reading_time "
+        "and Comment.rendered_html) in chunks of ascending id."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        posts = self.backfill(Post, ["content"], Post.RENDERED_FIELDS, batch_size, lambda p: p.render_content())
+        comments = self.backfill(
+            Comment, ["content"], ["rendered_html"], batch_size,
+            lambda c: setattr(c, "rendered_html", render_html(c.content)),
+        )
+        self.stdout.write(self.style.SUCCESS(f"Rendered {posts} posts and {comments} comments."))
+
+    def backfill(self, model, source_fields, target_fields, batch_size, render):
+        last_id = 0
+        total = 0
+        while True:
+            batch = list(model.objects.filter(pk__gt=last_id).order_by("pk").only("pk", *source_fields)[:batch_size])
+            if not batch:
+                return total
+            for obj in batch:
+                render(obj)
+            # bulk_update skips save(), signals and auto_now, so updated_at is untouched
+            with transaction.atomic():
+                model.objects.bulk_update(batch, target_fields)
+            last_id = batch[-1].pk
+            total += len(batch)
+            self.stdout.write(f"{model.__name__}: rendered {total} (last id {last_id})")
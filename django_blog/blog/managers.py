@@ -0,0 +1,71 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+class PostQuerySet(models.QuerySet):
+    """
+    Query helpers that load exactly what each kind of page renders.
+
+    Every relation a template touches is joined or prefetched up front, so
+    the number of queries per page is fixed no matter how many posts it shows.
+    """
+
+    def for_listing(self):
+        """
+        Posts for list pages: author joined, tags prefetched, and the
+        full ``content`` / ``rendered_html`` left unloaded; cards show the
+        pre-computed ``excerpt`` instead.
+        """
+        return (
+            self.select_related("author")
+            .prefetch_related("tags")
+            .defer("content", "rendered_html", "search_vector")
+        )
+
+    def for_detail(self):
+        """
+        A single post page: author joined and tags prefetched.
+
+        Comments are not prefetched here; see ``Post.comments_for_display``.
+        """
+        return self.select_related("author").prefetch_related("tags").defer("search_vector")
+
+    def for_feed(self):
+        """
+        Newest-first posts for syndication feeds: just the columns a feed
+        item needs, author joined, tags (categories) prefetched.
+        """
+        return (
+            self.select_related("author")
+            .prefetch_related("tags")
+            .only("id", "title", "excerpt", "created_at", "updated_at", "author__username")
+            .order_by("-created_at", "-id")
+        )
+
+    def tagged(self, tag):
+        """
+        Posts carrying ``tag`` (a Tag or a tag slug), as an ``id IN (...)``
+        semi-join on taggit's table. Filtering on ``tags=`` joins through
+        ``object_id::bigint``, a cast that keeps the planner off the
+        (content_type, object_id) index.
+        """
+        lookup = {"tag__slug": tag} if isinstance(tag, str) else {"tag": tag}
+        tagged_items = self.model._meta.get_field("tags").through.objects.filter(
+            content_type=ContentType.objects.get_for_model(self.model), **lookup
+        )
+        return self.filter(pk__in=tagged_items.values("object_id"))
+
+    def refresh_comment_counters(self):
+        """
+        Recompute ``comment_count`` and ``last_comment_at`` from the Comment
+        table for every post in this queryset, in a single UPDATE.
+        """
+        comments = self.model._meta.get_field("comments").related_model.objects.filter(post=OuterRef("pk"))
+        count = comments.order_by().values("post").annotate(n=Count("pk")).values("n")
+        newest = comments.order_by("-created_at").values("created_at")[:1]
+        return self.update(
+            comment_count=Coalesce(Subquery(count, output_field=IntegerField()), 0),
+            last_comment_at=Subquery(newest),
+        )
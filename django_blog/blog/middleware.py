@@ -0,0 +1,173 @@
+import mimetypes
+import os
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed, SuspiciousFileOperation
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from .routers import begin_routing, current_routing, end_routing
+from .storage import ENCODINGS
+
+
+# Cookie holding the time until which this client reads from the primary
+PRIMARY_COOKIE = "blog_primary_until"
+
+# Content-hashed names never change content, so caches may keep them forever
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Set up ReplicaRouter's per-request state.
+
+    GET/HEAD requests to views with ``replica_reads = True`` may read from a
+    replica. A request that writes posts, comments or tags sets a cookie
+    that keeps the client on the primary for ``BLOG_REPLICA_STICKY_SECONDS``,
+    so the redirect after a form post shows the new row even while the
+    replicas lag behind.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state, token = begin_routing(self.pinned(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            end_routing(token)
+        return self.stick(response, state)
+
+    async def __acall__(self, request):
+        state, token = begin_routing(self.pinned(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            end_routing(token)
+        return self.stick(response, state)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        state = current_routing()
+        if state is not None and request.method in ("GET", "HEAD"):
+            view = getattr(view_func, "view_class", view_func)
+            state.replica_reads = getattr(view, "replica_reads", False)
+        return None
+
+    def pinned(self, request):
+        try:
+            return float(request.COOKIES.get(PRIMARY_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
+
+    def stick(self, response, state):
+        if state.wrote:
+            seconds = settings.BLOG_REPLICA_STICKY_SECONDS
+            response.set_cookie(
+                PRIMARY_COOKIE, f"{time.time() + seconds:.0f}",
+                max_age=seconds, httponly=True, samesite="Lax",
+            )
+        return response
+
+
+def accepted_encodings(header):
+    """
+    Content codings an Accept-Encoding header allows (``q`` above zero).
+    """
+    accepted = set()
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        quality = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                pass
+        if quality > 0 and coding.strip():
+            accepted.add(coding.strip().lower())
+    if "*" in accepted:
+        accepted.update(encoding for encoding, _ in ENCODINGS)
+    return accepted
+
+
+class StaticFilesMiddleware:
+    """
+    Serve files collected into ``STATIC_ROOT`` ahead of the rest of the stack.
+
+    Picks the ``.br`` or ``.gz`` variant that collectstatic wrote
+    (blog.storage) when the client accepts it. Names listed in the
+    staticfiles manifest carry a content hash and get
+    ``IMMUTABLE_CACHE_CONTROL``; anything else may change in place, so it
+    gets ``BLOG_STATIC_MAX_AGE`` and answers If-Modified-Since with 304.
+    Requests for files that were never collected fall through to Django.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.STATIC_ROOT:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.root = str(settings.STATIC_ROOT)
+        self.prefix = settings.STATIC_URL
+        # Loaded once: collectstatic runs before the servers restart
+        self.hashed = set(getattr(staticfiles_storage, "hashed_files", {}).values())
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.serve(request) or self.get_response(request)
+
+    async def __acall__(self, request):
+        return self.serve(request) or await self.get_response(request)
+
+    def serve(self, request):
+        if request.method not in ("GET", "HEAD") or not request.path.startswith(self.prefix):
+            return None
+        name = request.path[len(self.prefix):]
+        try:
+            path = safe_join(self.root, name)
+        except SuspiciousFileOperation:
+            return None
+        if not name or not os.path.isfile(path):
+            return None
+
+        served, encoding = path, None
+        accepted = accepted_encodings(request.headers.get("Accept-Encoding", ""))
+        for coding, suffix in ENCODINGS:
+            if coding in accepted and os.path.isfile(path + suffix):
+                served, encoding = path + suffix, coding
+                break
+
+        immutable = name in self.hashed
+        mtime = os.stat(path).st_mtime
+        if not immutable and not was_modified_since(request.headers.get("If-Modified-Since"), int(mtime)):
+            return HttpResponseNotModified()
+
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        # Name the asset, not the .gz/.br variant file actually opened
+        response = FileResponse(open(served, "rb"), content_type=content_type, filename=os.path.basename(path))
+        if encoding:
+            response["Content-Encoding"] = encoding
+        response["Vary"] = "Accept-Encoding"
+        response["Last-Modified"] = http_date(mtime)
+        response["Cache-Control"] = (
+            IMMUTABLE_CACHE_CONTROL if immutable else f"public, max-age={settings.BLOG_STATIC_MAX_AGE}"
+        )
+        return response
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:34
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_post_search_vector'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='post',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='blog_post_title_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        # taggit's Tag lives in another app, so its trigram index is created here.
+        migrations.RunSQL(
+            "CREATE INDEX IF NOT EXISTS blog_taggit_tag_name_trgm ON taggit_tag USING gin (name gin_trgm_ops);",
+            reverse_sql="DROP INDEX IF EXISTS blog_taggit_tag_name_trgm;",
+        ),
+    ]
@@ -1,8 +1,14 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.urls import reverse
 from django.utils import timezone
 from taggit.managers import TaggableManager
+from taggit.models import Tag
+
+from .managers import PostQuerySet
+from .rendering import count_words, make_excerpt, reading_time, render_html
 
 
 class Post(models.Model):
@@ -16,6 +22,46 @@ class Post(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     # Replace ManyToManyField with TaggableManager
     tags = TaggableManager()
+    # Weighted title/tags/content vector, maintained by blog.signals
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Derived from content in save(), so templates never transform text per request
+    rendered_html = models.TextField(blank=True, editable=False)
+    excerpt = models.TextField(blank=True, editable=False)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    reading_time = models.PositiveSmallIntegerField(default=1, editable=False, help_text="Minutes")
+    # Denormalized comment activity, maintained by blog.signals
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    last_comment_at = models.DateTimeField(null=True, blank=True, editable=False)
+    # Page views and their time-decayed "hot" score, flushed in batches by blog.popularity
+    view_count = models.PositiveBigIntegerField(default=0, editable=False)
+    hot_score = models.FloatField(null=True, blank=True, editable=False)
+
+    objects = PostQuerySet.as_manager()
+
+    RENDERED_FIELDS = ('rendered_html', 'excerpt', 'word_count', 'reading_time')
+
+    class Meta:
+        indexes = [
+            # Keyset pagination walks (created_at, id) newest first
+            models.Index(fields=['created_at', 'id'], name='blog_post_created_id_idx'),
+            # Per-author archives walk one author's (created_at, id) range
+            models.Index(fields=['author', 'created_at', 'id'], name='blog_post_author_created_idx'),
+            # "Recently discussed" listing walks (last_comment_at, id)
+            models.Index(
+                fields=['last_comment_at', 'id'],
+                name='blog_post_activity_idx',
+                condition=models.Q(last_comment_at__isnull=False),
+            ),
+            # "Popular" listing walks (hot_score, id) over posts with views
+            models.Index(
+                fields=['hot_score', 'id'],
+                name='blog_post_hot_idx',
+                condition=models.Q(hot_score__isnull=False),
+            ),
+            GinIndex(fields=['search_vector'], name='blog_post_search_gin'),
+            # Trigram index for typo-tolerant title matching and autocomplete
+            GinIndex(fields=['title'], name='blog_post_title_trgm', opclasses=['gin_trgm_ops']),
+        ]
 
     def __str__(self):
         """
@@ -23,12 +69,38 @@ class Post(models.Model):
         """
         return self.title
 
+    def render_content(self):
+        """
+        Compute rendered_html, excerpt, word_count and reading_time from content.
+        """
+        self.rendered_html = render_html(self.content)
+        self.excerpt = make_excerpt(self.content)
+        self.word_count = count_words(self.content)
+        self.reading_time = reading_time(self.word_count)
+
+    def save(self, *args, **kwargs):
+        self.render_content()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'content' in update_fields:
+            kwargs['update_fields'] = {*update_fields, *self.RENDERED_FIELDS}
+        super().save(*args, **kwargs)
+
     def get_absolute_url(self):
         """
         Returns the URL to access a detail view of this post.
         """
         return reverse('post_detail', args=[str(self.id)])
 
+    def comments_for_display(self):
+        """
+        Lazy queryset of this post's comments with their authors joined,
+        in (created_at, id) order to match the comments API cursor.
+
+        It only hits the database when iterated, so a cached comment
+        block costs no query at all.
+        """
+        return self.comments.select_related('author').order_by('created_at', 'id')
+
 class Comment(models.Model):
     """
     Model representing a comment made by a user on a blog post.
@@ -56,6 +128,11 @@ class Comment(models.Model):
     content = models.TextField(
         help_text='The content of the comment.'
     )
+    rendered_html = models.TextField(
+        blank=True,
+        editable=False,
+        help_text='The content rendered to HTML, computed on save.'
+    )
     created_at = models.DateTimeField(
         auto_now_add=True,
         help_text='The date and time when the comment was created.'
@@ -69,9 +146,92 @@ class Comment(models.Model):
         ordering = ['created_at']  # Comments will be ordered chronologically
         verbose_name = 'Comment'
         verbose_name_plural = 'Comments'
+        indexes = [
+            # Serves each page of a post's comments by (created_at, id) cursor
+            models.Index(fields=['post', 'created_at', 'id'], name='blog_comment_post_created_idx'),
+        ]
 
     def __str__(self):
         return f'Comment by {self.author.username} on {self.post.title}'
 
+    def save(self, *args, **kwargs):
+        self.rendered_html = render_html(self.content)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'content' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'rendered_html'}
+        super().save(*args, **kwargs)
+
 
+class RelatedPost(models.Model):
+    """
+    One precomputed "related posts" entry: ``related`` is among the top
+    matches for ``post`` by weighted tag overlap and recency.
+
+    Maintained by blog.related; read by the detail page in one indexed query.
+    """
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='related_entries')
+    # The FK index doubles as the "which posts list this one" lookup
+    related = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'related'], name='blog_relatedpost_unique_pair'),
+        ]
+        indexes = [
+            # A post's entries, best first
+            models.Index(fields=['post', '-score'], name='blog_related_post_score_idx'),
+        ]
 
+    def __str__(self):
+        return f'{self.related_id} related to {self.post_id} ({self.score:.3f})'
+
+
+class TagStat(models.Model):
+    """
+    Per-tag usage counters, so tag listings and the tag cloud never GROUP BY
+    over taggit's TaggedItem table.
+
+    Maintained incrementally by blog.signals (and by import_blog);
+    ``manage.py recount_tags`` recomputes them from scratch.
+    """
+    tag = models.OneToOneField(Tag, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    post_count = models.PositiveIntegerField(default=0)
+    last_used_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Most-used tags first (scanned backwards): tag cloud and tag listing
+            models.Index(fields=['post_count', 'tag'], name='blog_tagstat_count_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.tag_id}: {self.post_count} posts'
+
+
+class MonthlyPostCount(models.Model):
+    """
+    Rollup of posts per calendar month, per author and site-wide
+    (``author`` is NULL), for the archive sidebar.
+
+    Maintained by blog.signals on post create/delete (and by import_blog);
+    ``manage.py recount_archive`` rebuilds it.
+    """
+    author = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    month = models.DateField(help_text='First day of the month')
+    post_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['author', 'month'], condition=models.Q(author__isnull=False),
+                name='blog_monthly_author_month_unique',
+            ),
+            models.UniqueConstraint(
+                fields=['month'], condition=models.Q(author__isnull=True),
+                name='blog_monthly_site_month_unique',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.month:%Y-%m} ({self.author_id or "all"}): {self.post_count}'
@@ -0,0 +1,274 @@
+import base64
+import json
+import math
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.models import Q
+from django.http import Http404
+from django.utils.dateparse import parse_datetime
+
+
+def _json_default(value):
+    # Full-precision isoformat; DjangoJSONEncoder would drop microseconds
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor.")
+
+
+def encode_cursor(values):
+    """
+    Encode a tuple of ordering values into an opaque, URL-safe cursor string.
+    """
+    raw = json.dumps(list(values), default=_json_default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _cursor_value(field, value):
+    """
+    Check one decoded cursor value against the field it pages on; ``field``
+    is None for an annotation such as "rank". Raises ValueError.
+    """
+    if field is not None and field.is_relation:
+        field = field.target_field  # e.g. "tag_id" pages on the tag's primary key
+    if isinstance(field, models.DateTimeField):
+        value = parse_datetime(value) if isinstance(value, str) else None
+        if value is None:
+            raise ValueError("Invalid datetime in cursor.")
+        return value
+    if isinstance(field, models.IntegerField):
+        if type(value) is not int:
+            raise ValueError("Invalid integer in cursor.")
+        return value
+    if field is None or isinstance(field, models.FloatField):
+        # Scores (rank, hot_score) are floats; JSON may have written 1.0 as 1
+        if type(value) not in (int, float) or not math.isfinite(value):
+            raise ValueError("Invalid score in cursor.")
+        return float(value)
+    return value
+
+
+def decode_cursor(cursor, fields, model):
+    """
+    Decode a cursor produced by encode_cursor back into typed values.
+
+    Raises ValueError if the cursor is malformed or a value does not fit
+    its field, so a crafted cursor never reaches the database.
+    """
+    padded = cursor + "=" * (-len(cursor) % 4)
+    values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    if not isinstance(values, list) or len(values) != len(fields):
+        raise ValueError("Cursor does not match the ordering fields.")
+    decoded = []
+    for name, value in zip(fields, values):
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            field = None  # an annotation such as "rank"
+        decoded.append(_cursor_value(field, value))
+    return decoded
+
+
+def keyset_filter(fields, values, older):
+    """
+    Build the WHERE clause for "rows strictly after these values".
+
+    For fields (a, b) and descending order this is:
+        a <= x AND (a < x OR b < y)
+    The leading range bound lets the database seek straight into the
+    composite index instead of skipping rows like OFFSET does.
+    """
+    op = "lt" if older else "gt"
+    bound = "lte" if older else "gte"
+    first, rest = fields[0], fields[1:]
+    condition = Q(**{f"{first}__{op}": values[0]})
+    for i, name in enumerate(rest, start=1):
+        equal = Q(**{fields[j]: values[j] for j in range(i)})
+        condition |= equal & Q(**{f"{name}__{op}": values[i]})
+    return Q(**{f"{first}__{bound}": values[0]}) & condition
+
+
+def keyset_slice(queryset, fields, cursor=None, limit=20):
+    """
+    Return up to ``limit`` rows after ``cursor`` in ascending order of
+    ``fields``, plus the cursor for the following slice (None at the end).
+
+    Raises ValueError for a malformed cursor.
+    """
+    if cursor:
+        values = decode_cursor(cursor, fields, queryset.model)
+        queryset = queryset.filter(keyset_filter(fields, values, older=False))
+    rows = list(queryset.order_by(*fields)[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(getattr(rows[-1], name) for name in fields)
+    return rows, next_cursor
+
+
+class KeysetPage:
+    """
+    A page of results from keyset pagination.
+
+    Mirrors the parts of Django's Page that templates use, minus anything
+    that needs a COUNT(*) (number, num_pages, page_range).
+    """
+
+    def __init__(self, object_list, fields, has_newer, has_older):
+        self.object_list = object_list
+        self.fields = fields
+        self.has_newer = has_newer
+        self.has_older = has_older
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def _cursor_for(self, obj):
+        return encode_cursor(getattr(obj, name) for name in self.fields)
+
+    @property
+    def newer_cursor(self):
+        if self.has_newer and self.object_list:
+            return self._cursor_for(self.object_list[0])
+        return None
+
+    @property
+    def older_cursor(self):
+        if self.has_older and self.object_list:
+            return self._cursor_for(self.object_list[-1])
+        return None
+
+    # Django Page API names, so generic templates keep working
+    def has_previous(self):
+        return self.has_newer
+
+    def has_next(self):
+        return self.has_older
+
+    def has_other_pages(self):
+        return self.has_newer or self.has_older
+
+
+class KeysetPaginationMixin:
+    """
+    Cursor-based pagination for ListViews, newest first.
+
+    Pages are addressed with ``?older=<cursor>`` / ``?newer=<cursor>`` instead of
+    ``?page=N``, so page N costs one index range scan of ``paginate_by + 1`` rows
+    and never issues COUNT(*) or OFFSET.
+
+    Adds ``older_url`` / ``newer_url`` to the context and matching
+    ``Link: <...>; rel="next"`` / ``rel="prev"`` headers to the response.
+    """
+
+    paginate_by = 10
+    cursor_fields = ("created_at", "id")
+
+    def get_cursor_fields(self):
+        return self.cursor_fields
+
+    def get_cursor(self, model):
+        """
+        The requested cursor as ``(values, older)``; values are None on the
+        first page. Raises Http404 for a malformed cursor.
+        """
+        older = self.request.GET.get("older")
+        cursor = older or self.request.GET.get("newer")
+        if not cursor:
+            return None, True
+        try:
+            return decode_cursor(cursor, self.get_cursor_fields(), model), bool(older)
+        except (ValueError, TypeError):
+            raise Http404("Invalid page cursor.")
+
+    def get_page_queryset(self, queryset, page_size):
+        """
+        Return the requested page as an ordered, sliced queryset.
+
+        The slice holds ``page_size + 1`` rows (the extra one only tells
+        whether another page exists) and, for ``?newer=``, is in ascending
+        order. ``paginate_queryset`` evaluates it; cheaper callers (such as
+        ETag computation) can take ``values()`` from it instead.
+        """
+        fields = self.get_cursor_fields()
+        values, older = self.get_cursor(queryset.model)
+        if values is not None:
+            queryset = queryset.filter(keyset_filter(fields, values, older=older))
+
+        if not older:
+            # Walk towards newer rows; paginate_queryset flips them back
+            return queryset.order_by(*fields)[:page_size + 1]
+        return queryset.order_by(*[f"-{name}" for name in fields])[:page_size + 1]
+
+    def build_page(self, rows, page_size):
+        """
+        Turn the rows fetched from ``get_page_queryset`` into a KeysetPage.
+        """
+        fields = self.get_cursor_fields()
+        older = bool(self.request.GET.get("older"))
+        newer = bool(self.request.GET.get("newer"))
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+
+        if newer and not older:
+            page = KeysetPage(list(reversed(rows)), fields, has_newer=has_more, has_older=True)
+        else:
+            page = KeysetPage(rows, fields, has_newer=older, has_older=has_more)
+        return page
+
+    def paginate_queryset(self, queryset, page_size):
+        page = self.build_page(list(self.get_page_queryset(queryset, page_size)), page_size)
+        return (None, page, page.object_list, page.has_other_pages())
+
+    def _page_url(self, param, cursor):
+        query = self.request.GET.copy()
+        query.pop("older", None)
+        query.pop("newer", None)
+        query[param] = cursor
+        return f"{self.request.path}?{query.urlencode()}"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        page = context.get("page_obj")
+        if page is not None:
+            context["newer_url"] = self._page_url("newer", page.newer_cursor) if page.newer_cursor else None
+            context["older_url"] = self._page_url("older", page.older_cursor) if page.older_cursor else None
+        return context
+
+    def render_to_response(self, context, **response_kwargs):
+        response = super().render_to_response(context, **response_kwargs)
+        links = []
+        if context.get("older_url"):
+            links.append(f'<{self.request.build_absolute_uri(context["older_url"])}>; rel="next"')
+        if context.get("newer_url"):
+            links.append(f'<{self.request.build_absolute_uri(context["newer_url"])}>; rel="prev"')
+        if links:
+            response["Link"] = ", ".join(links)
+        return response
+
+
+class AsyncKeysetListMixin:
+    """
+    Async ``get()`` for a keyset-paginated ListView.
+
+    The page is fetched with the async ORM before the (synchronous, DB-free)
+    context and template code runs; views override ``aget_queryset`` when
+    building the queryset itself needs a query. Put it before the ListView
+    subclass it makes async.
+    """
+
+    async def aget_queryset(self):
+        return self.get_queryset()
+
+    async def get(self, request, *args, **kwargs):
+        self.object_list = await self.aget_queryset()
+        page_size = self.get_paginate_by(self.object_list)
+        rows = [row async for row in self.get_page_queryset(self.object_list, page_size)]
+        self.page = self.build_page(rows, page_size)
+        return self.render_to_response(self.get_context_data())
+
+    def paginate_queryset(self, queryset, page_size):
+        return (None, self.page, self.page.object_list, self.page.has_other_pages())
@@ -0,0 +1,138 @@
+import logging
+import math
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections, transaction
+
+from .models import Post
+
+
+logger = logging.getLogger(__name__)
+
+
+# A view this many hours old counts half as much towards the hot score
+HOT_HALF_LIFE_HOURS = 48
+# Scores are stored relative to this moment, so old rows never need rewriting
+HOT_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp()
+# Flush buffered views after this many seconds or this many views
+FLUSH_INTERVAL = 30
+FLUSH_THRESHOLD = 500
+
+_HOT_TAU = HOT_HALF_LIFE_HOURS * 3600 / math.log(2)
+
+
+def hot_increment(views, now):
+    """
+    Log-space weight of ``views`` seen at ``now`` (a Unix timestamp).
+
+    ``hot_score`` is ``ln(sum of 2 ** ((t - HOT_EPOCH) / half-life))`` over
+    every view time ``t``. A newer view's weight is larger by exactly the
+    decay an older one has suffered, so ordering by the stored score ranks
+    posts by decayed views without ever updating rows that get no views.
+    """
+    return math.log(views) + (now - HOT_EPOCH) / _HOT_TAU
+
+
+class ViewBuffer:
+    """
+    In-process buffer of post views.
+
+    ``record()`` only bumps a counter under a lock, so hot posts never queue
+    on a row lock. Once ``interval`` seconds or ``threshold`` views have
+    passed, the next finished request writes the buffer in one
+    UPDATE ... FROM (VALUES ...) (see blog.signals). Views still buffered
+    when a process dies are lost, at most one interval's worth.
+    """
+
+    def __init__(self, interval=FLUSH_INTERVAL, threshold=FLUSH_THRESHOLD):
+        self.interval = interval
+        self.threshold = threshold
+        self.lock = threading.Lock()
+        self.pending = Counter()
+        self.total = 0
+        self.last_flush = time.monotonic()
+
+    def record(self, post_id):
+        if not getattr(settings, "BLOG_BUFFER_VIEWS", True):
+            return
+        with self.lock:
+            self.pending[int(post_id)] += 1
+            self.total += 1
+
+    def due(self):
+        return bool(self.total) and (
+            self.total >= self.threshold or time.monotonic() - self.last_flush >= self.interval
+        )
+
+    def drain(self):
+        with self.lock:
+            pending, self.pending = self.pending, Counter()
+            self.total = 0
+            self.last_flush = time.monotonic()
+        return pending
+
+    def flush(self, now=None):
+        """
+        Apply the buffered views with a single UPDATE; returns rows updated.
+
+        If that UPDATE fails, each post's views are retried on their own, so
+        one bad id costs only its own views, not the whole batch.
+        """
+        pending = self.drain()
+        if not pending:
+            return 0
+        try:
+            return _apply_in_savepoint(pending, now)
+        except DatabaseError:
+            logger.exception("Flushing views of %d posts failed; retrying them one by one", len(pending))
+        updated = 0
+        for post_id, views in pending.items():
+            try:
+                updated += _apply_in_savepoint({post_id: views}, now)
+            except DatabaseError:
+                logger.exception("Dropped %d buffered views of post %s", views, post_id)
+        return updated
+
+
+def _apply_in_savepoint(views, now):
+    # A failed statement must not abort a transaction the flush runs inside
+    with transaction.atomic(using=DEFAULT_DB_ALIAS):
+        return apply_views(views, now)
+
+
+def apply_views(views, now=None):
+    """
+    Add ``{post_id: views}`` to ``view_count`` and fold them into
+    ``hot_score`` (a log-sum-exp) for all posts in one statement.
+
+    Runs as raw SQL on ``default``: the VALUES join has no ORM spelling, and
+    it keeps these background writes out of the replica router's
+    read-your-writes tracking.
+    """
+    now = time.time() if now is None else now
+    rows = [(post_id, count, hot_increment(count, now)) for post_id, count in sorted(views.items())]
+    table = Post._meta.db_table
+    values = ", ".join(["(%s::bigint, %s::bigint, %s::double precision)"] * len(rows))
+    sql = f"""
+        UPDATE {table} AS p
+        SET view_count = p.view_count + v.views,
+            hot_score = CASE
+                WHEN p.hot_score IS NULL THEN v.score
+                -- ln(e^a + e^b), with EXP kept clear of underflow
+                ELSE GREATEST(p.hot_score, v.score)
+                     + LN(1 + EXP(-LEAST(ABS(p.hot_score - v.score), 700)))
+            END
+        FROM (VALUES {values}) AS v(id, views, score)
+        WHERE p.id = v.id
+    """
+    with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+        cursor.execute(sql, [value for row in rows for value in row])
+        return cursor.rowcount
+
+
+# Shared by every request thread in this process
+view_buffer = ViewBuffer()
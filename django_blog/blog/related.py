@@ -0,0 +1,102 @@
+import math
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Case, FloatField, Sum, Value, When
+from django.utils import timezone
+
+from .models import Post, RelatedPost, TagStat
+from .tags import post_tagged_items
+
+
+# Related posts stored (and shown) per post
+RELATED_POSTS = 5
+# Best tag-overlap candidates considered before re-ranking by recency
+CANDIDATES = RELATED_POSTS * 10
+# A post this many days old scores half as much as a brand-new one
+RECENCY_HALF_LIFE_DAYS = 180
+# Most other posts one tag change refreshes; the periodic rebuild covers the rest
+FANOUT_LIMIT = 50
+
+
+def tag_weights(tag_ids):
+    """
+    Weight each tag by rarity, ``1 / ln(2 + posts using it)``: sharing a niche
+    tag says more than sharing a tag on every post. Counts come from TagStat.
+    """
+    counts = dict(TagStat.objects.filter(tag_id__in=tag_ids).values_list("tag_id", "post_count"))
+    return {tag_id: 1 / math.log(2 + counts.get(tag_id, 0)) for tag_id in tag_ids}
+
+
+def recency(created_at, now):
+    age_days = max((now - created_at).total_seconds(), 0) / 86400
+    return 0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS)
+
+
+def compute_related(post_ids, now=None):
+    """
+    Return unsaved RelatedPost rows (top ``RELATED_POSTS`` each) for ``post_ids``.
+
+    Candidates are ranked by summed tag weights in the database, then the
+    best ``CANDIDATES`` are re-scored with a recency decay.
+    """
+    now = now or timezone.now()
+    tags_by_post = defaultdict(set)
+    for object_id, tag_id in post_tagged_items().filter(object_id__in=post_ids).values_list("object_id", "tag_id"):
+        tags_by_post[object_id].add(tag_id)
+    if not tags_by_post:
+        return []
+    weights = tag_weights(set().union(*tags_by_post.values()))
+
+    entries = []
+    for post_id, tag_ids in tags_by_post.items():
+        overlap = Sum(
+            Case(*[When(tag_id=tag_id, then=Value(weights[tag_id])) for tag_id in tag_ids], output_field=FloatField())
+        )
+        candidates = list(
+            post_tagged_items().filter(tag_id__in=tag_ids).exclude(object_id=post_id)
+            .values("object_id").annotate(overlap=overlap)
+            .order_by("-overlap", "-object_id")
+            .values_list("object_id", "overlap")[:CANDIDATES]
+        )
+        created = dict(Post.objects.filter(pk__in=[pk for pk, _ in candidates]).values_list("pk", "created_at"))
+        scored = sorted(
+            ((overlap * recency(created[pk], now), pk) for pk, overlap in candidates if pk in created),
+            reverse=True,
+        )[:RELATED_POSTS]
+        entries.extend(RelatedPost(post_id=post_id, related_id=pk, score=score) for score, pk in scored)
+    return entries
+
+
+def refresh_related(post_ids):
+    """
+    Replace the stored related posts of ``post_ids`` in one transaction.
+    """
+    post_ids = list(post_ids)
+    entries = compute_related(post_ids)
+    with transaction.atomic():
+        RelatedPost.objects.filter(post_id__in=post_ids).delete()
+        RelatedPost.objects.bulk_create(entries)
+    return len(entries)
+
+
+
+def affected_posts(post_id, tag_ids=()):
+    """
+    Posts whose related list may change when ``post_id``'s tags change: the
+    post itself, plus at most ``FANOUT_LIMIT`` others, the posts listing it
+    first, then the newest posts sharing a changed tag.
+    """
+    listing = list(
+        RelatedPost.objects.filter(related_id=post_id).order_by("-post_id")
+        .values_list("post_id", flat=True)[:FANOUT_LIMIT]
+    )
+    affected = {post_id, *listing}
+    room = FANOUT_LIMIT - len(listing)
+    if tag_ids and room > 0:
+        sharing = (
+            post_tagged_items().filter(tag_id__in=tag_ids).exclude(object_id__in=affected)
+            .order_by("-object_id").values_list("object_id", flat=True).distinct()[:room]
+        )
+        affected.update(sharing)
+    return affected
@@ -0,0 +1,33 @@
+import math
+
+from django.utils.html import linebreaks
+from django.utils.text import Truncator
+
+
+# Words shown in list-page excerpts (previously `truncatewords:30` in templates)
+EXCERPT_WORDS = 30
+# Average reading speed used for Post.reading_time
+WORDS_PER_MINUTE = 200
+
+
+def render_html(text):
+    """
+    Escape user text and convert newlines to <p>/<br>, exactly like the
+    `linebreaks` template filter.
+    """
+    return linebreaks(text, autoescape=True)
+
+
+def make_excerpt(text):
+    return Truncator(text).words(EXCERPT_WORDS)
+
+
+def count_words(text):
+    return len(text.split())
+
+
+def reading_time(word_count):
+    """
+    Estimated reading time in whole minutes (at least one).
+    """
+    return max(1, math.ceil(word_count / WORDS_PER_MINUTE))
@@ -0,0 +1,95 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+
+# Content apps: their reads may go to a replica, and writing to them pins
+# the writer to the primary for a while. Sessions and users always use the
+# primary, so a fresh login is never lost to replication lag.
+REPLICATED_APPS = {"blog", "taggit"}
+
+
+class RoutingState:
+    """
+    Per-request routing decisions, set up by ReplicaRoutingMiddleware.
+
+    ``replica`` is picked once per request, so every read of a page (ETag
+    validators, rows, prefetches) sees the same snapshot.
+    """
+
+    def __init__(self, pinned=False):
+        self.pinned = pinned        # the client wrote recently: read your writes
+        self.replica_reads = False  # the resolved view opted in to replica reads
+        self.wrote = False          # this request wrote to a sticky app
+        self.replica = None
+
+
+_state = ContextVar("blog_db_routing", default=None)
+
+
+def replica_aliases():
+    return list(getattr(settings, "BLOG_DB_REPLICAS", []))
+
+
+def begin_routing(pinned=False):
+    """
+    Start routing for a request; returns (state, token for end_routing).
+    """
+    state = RoutingState(pinned)
+    return state, _state.set(state)
+
+
+def current_routing():
+    """
+    The current request's RoutingState, or None outside requests.
+    """
+    return _state.get()
+
+
+def end_routing(token):
+    _state.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Send reads of replica-safe requests to a read replica, everything else
+    to ``default``.
+
+    Reads of ``REPLICATED_APPS`` only leave the primary inside a request
+    whose view sets ``replica_reads = True``, that is not pinned to the
+    primary by a recent write, and that has not written anything itself. Management commands,
+    signals run outside requests and tests without replicas all stay on
+    ``default``.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or not state.replica_reads or state.pinned or state.wrote:
+            return DEFAULT_DB_ALIAS
+        if model._meta.app_label not in REPLICATED_APPS:
+            return DEFAULT_DB_ALIAS
+        if state.replica is None:
+            replicas = replica_aliases()
+            state.replica = random.choice(replicas) if replicas else DEFAULT_DB_ALIAS
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None and model._meta.app_label in REPLICATED_APPS:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        databases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive schema changes through replication
+        if db in replica_aliases():
+            return False
+        return None
@@ -0,0 +1,160 @@
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import (
+    SearchQuery, SearchRank, SearchVector, TrigramSimilarity, TrigramWordSimilarity,
+)
+from django.db.models import F, FloatField, OuterRef, Q, Subquery, TextField, Value
+from django.db.models.functions import Cast, Coalesce
+from taggit.models import Tag, TaggedItem
+
+from .models import Post
+
+
+# Text search configuration used both when building and when querying vectors.
+SEARCH_CONFIG = getattr(settings, "BLOG_SEARCH_CONFIG", "english")
+
+# Upper bound on how many suggestions a single autocomplete request may ask for.
+MAX_SUGGESTIONS = 20
+
+
+def as_double(expression):
+    """
+    Cast a ``real`` score to double precision.
+
+    Scores are used as pagination cursors; a float4 read into Python and sent
+    back as float8 no longer compares equal to itself, so cast up front.
+    """
+    return Cast(expression, FloatField())
+
+
+def build_search_vector(tag_names):
+    """
+    Build the weighted search vector expression for a post.
+
+    Weights:
+        A → title
+        B → tag names (passed in, since tags live in taggit's tables)
+        C → content
+    """
+    return (
+        SearchVector("title", weight="A", config=SEARCH_CONFIG)
+        + SearchVector(Value(" ".join(tag_names), output_field=TextField()), weight="B", config=SEARCH_CONFIG)
+        + SearchVector("content", weight="C", config=SEARCH_CONFIG)
+    )
+
+
+def update_search_vector(post):
+    """
+    Recompute and store the search vector of a single post.
+
+    Uses a queryset ``update()`` so no signals fire and ``updated_at`` is untouched.
+    """
+    Post.objects.filter(pk=post.pk).update(search_vector=build_search_vector(post.tags.names()))
+
+
+def update_search_vectors(queryset):
+    """
+    Recompute the search vector of every post in ``queryset`` with one UPDATE.
+
+    Tag names are aggregated per row by a correlated subquery on taggit's
+    table, so this suits bulk loads that bypass the save() signals.
+    """
+    tag_names = (
+        TaggedItem.objects.filter(content_type=ContentType.objects.get_for_model(Post), object_id=OuterRef("pk"))
+        .order_by()
+        .values("object_id")
+        .annotate(names=StringAgg("tag__name", delimiter=" "))
+        .values("names")
+    )
+    tags = Coalesce(Subquery(tag_names, output_field=TextField()), Value("", output_field=TextField()))
+    return queryset.update(
+        search_vector=(
+            SearchVector("title", weight="A", config=SEARCH_CONFIG)
+            + SearchVector(tags, weight="B", config=SEARCH_CONFIG)
+            + SearchVector("content", weight="C", config=SEARCH_CONFIG)
+        )
+    )
+
+
+def search_posts(queryset, query):
+    """
+    Filter a Post queryset with a full-text query and order it by relevance.
+
+    The match runs against the stored, GIN-indexed ``search_vector`` column,
+    so no per-row text processing or tag join happens at query time.
+    """
+    search_query = SearchQuery(query, search_type="websearch", config=SEARCH_CONFIG)
+    return (
+        queryset.filter(search_vector=search_query)
+        .annotate(rank=as_double(SearchRank(F("search_vector"), search_query)))
+        .order_by("-rank", "-id")
+    )
+
+
+def fuzzy_search_posts(queryset, query):
+    """
+    Typo-tolerant title match, used when full-text search finds nothing.
+
+    ``trigram_word_similar`` compiles to the ``%>`` operator, which the
+    ``gin_trgm_ops`` index on ``Post.title`` can answer without a scan.
+    """
+    return (
+        queryset.filter(title__trigram_word_similar=query)
+        .annotate(similarity=as_double(TrigramWordSimilarity(query, "title")))
+        .order_by("-similarity", "-id")
+    )
+
+
+def union_of_branches(queryset, branches, limit):
+    """
+    The best ``limit`` rows matching any of ``branches`` (Q objects), in
+    ``queryset``'s order.
+
+    Each branch is its own LIMITed query in a UNION instead of one OR: Postgres
+    plans an OR of ILIKE and a trigram operator as a filter over the whole
+    table, while either condition alone is a scan of the trigram index. Every
+    branch keeps its own top ``limit`` rows, so the top of the union is the
+    top overall. ``queryset`` must be ordered and select its ordering columns.
+    """
+    ordering = queryset.query.order_by
+    parts = [queryset.filter(branch)[:limit] for branch in branches]
+    return parts[0].union(*parts[1:]).order_by(*ordering)[:limit]
+
+
+def title_suggestions(prefix, limit):
+    """
+    Post titles containing or resembling ``prefix``, closest first.
+    """
+    posts = (
+        Post.objects.annotate(similarity=TrigramWordSimilarity(prefix, "title"))
+        .order_by("-similarity", "-created_at")
+        .values("id", "title", "similarity", "created_at")
+    )
+    return union_of_branches(
+        posts, [Q(title__ilike_contains=prefix), Q(title__trigram_word_similar=prefix)], limit
+    )
+
+
+def tag_suggestions(prefix, limit):
+    """
+    Tags containing or resembling ``prefix``, closest first.
+    """
+    tags = (
+        Tag.objects.annotate(similarity=TrigramSimilarity("name", prefix))
+        .order_by("-similarity", "name")
+        .values("name", "slug", "similarity")
+    )
+    return union_of_branches(tags, [Q(name__ilike_contains=prefix), Q(name__trigram_similar=prefix)], limit)
+
+
+def suggest(prefix, limit=8):
+    """
+    Return the top ``limit`` post titles and tags for a prefix or near-miss.
+
+    Both lookups union an ILIKE branch and a trigram-similarity branch on a
+    column carrying a ``gin_trgm_ops`` index, so each branch is a bitmap index
+    scan. (``ilike_contains``, not ``icontains``: see blog.lookups.)
+    """
+    limit = max(1, min(limit, MAX_SUGGESTIONS))
+    return {"titles": list(title_suggestions(prefix, limit)), "tags": list(tag_suggestions(prefix, limit))}
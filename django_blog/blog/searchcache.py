@@ -0,0 +1,175 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, router
+from django.db.models import Case, FloatField, Value, When
+
+from .cache import SEARCH_VERSION_KEY, get_versions
+from .facets import facet_counts, narrow
+from .models import Post
+from .search import SEARCH_CONFIG, fuzzy_search_posts, search_posts
+
+
+# How long a result list lives; writes invalidate it long before that
+# through the corpus version, so this mainly bounds memory
+SEARCH_CACHE_TIMEOUT = getattr(settings, "BLOG_SEARCH_CACHE_TIMEOUT", 60 * 10)
+# Results kept per query; paging past them falls back to the database
+SEARCH_CACHE_LIMIT = getattr(settings, "BLOG_SEARCH_CACHE_LIMIT", 200)
+
+HITS_KEY = "blog:search:hits"
+MISSES_KEY = "blog:search:misses"
+
+
+def fold(query):
+    """
+    Case-folded query with runs of whitespace collapsed to single spaces.
+    """
+    return " ".join(query.casefold().split())
+
+
+def _digest(text):
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def _stem_key(folded):
+    return f"blog:search:stem:{_digest(folded)}"
+
+
+def stem(folded):
+    """
+    The query as PostgreSQL parses it for the search: websearch syntax,
+    stop words dropped, each word stemmed by ``SEARCH_CONFIG``. Queries
+    that differ only in word forms ("Caching tests", "cached test") have
+    the same stemmed text and therefore the same full-text matches.
+    """
+    alias = router.db_for_read(Post)
+    with connections[alias].cursor() as cursor:
+        cursor.execute("SELECT websearch_to_tsquery(%s::regconfig, %s)::text", [SEARCH_CONFIG, folded])
+        return cursor.fetchone()[0]
+
+
+def _count(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+class CachedResults:
+    """
+    Ranked ``(score, id)`` pairs of one search, best first, and the
+    search's facet counts (see blog.facets.facet_counts).
+
+    ``fields`` are the keyset cursor fields the pairs correspond to:
+    ``("rank", "id")``, or ``("similarity", "id")`` for fuzzy matches.
+    ``complete`` is False when results beyond ``SEARCH_CACHE_LIMIT`` exist.
+    """
+
+    def __init__(self, fields, entries, complete, facets):
+        self.fields = fields
+        self.entries = entries
+        self.complete = complete
+        self.facets = facets
+
+    @property
+    def fuzzy(self):
+        return self.fields[0] == "similarity"
+
+    def page_queryset(self, queryset, page_size, cursor=None, older=True):
+        """
+        The keyset page after (or, with ``older=False``, before) ``cursor``
+        as one ``id__in`` query on ``queryset``, with the cached score
+        annotated so cursors work as for a database-ranked page. Returns
+        None when the page reaches past the cached results.
+        """
+        entries = self.entries
+        if cursor is None:
+            chunk = entries[:page_size + 1]
+        elif older:
+            chunk = [entry for entry in entries if entry < tuple(cursor)][:page_size + 1]
+        else:
+            if not self.complete and entries and tuple(cursor) < entries[-1]:
+                return None  # the rows just above the cursor were never cached
+            chunk = [entry for entry in entries if entry > tuple(cursor)][-(page_size + 1):]
+        if len(chunk) <= page_size and (older or cursor is None) and not self.complete:
+            return None
+
+        score = Case(
+            *[When(pk=pk, then=Value(value)) for value, pk in chunk], output_field=FloatField()
+        )
+        order = self.fields if cursor is not None and not older else [f"-{name}" for name in self.fields]
+        return (
+            queryset.filter(pk__in=[pk for _, pk in chunk])
+            .annotate(**{self.fields[0]: score})
+            .order_by(*order)
+        )
+
+
+def _ranked(queryset, score_field):
+    rows = list(queryset.values_list(score_field, "id")[:SEARCH_CACHE_LIMIT + 1])
+    if not rows:
+        return rows, True, {"tags": [], "years": []}
+    return rows[:SEARCH_CACHE_LIMIT], len(rows) <= SEARCH_CACHE_LIMIT, facet_counts(queryset)
+
+
+def cached_search(query, tags=(), year=None):
+    """
+    CachedResults for ``query`` narrowed to the selected ``tags`` and
+    ``year`` facets, from the cache when possible.
+
+    Full-text results are keyed by the stemmed query, fuzzy (title
+    trigram) ones by the folded query, and both by the facet selection and
+    the corpus version that post and tag writes bump. A hit costs two cache
+    round trips and no queries; a miss ranks the matches and counts their
+    facets in one query each.
+    """
+    folded = fold(query)
+    stem_key = _stem_key(folded)
+    found = cache.get_many([stem_key, SEARCH_VERSION_KEY])
+    stemmed = found.get(stem_key)
+    if stemmed is None:
+        stemmed = stem(folded)
+        cache.set(stem_key, stemmed, timeout=None)  # depends only on SEARCH_CONFIG
+    version = found.get(SEARCH_VERSION_KEY) or get_versions([SEARCH_VERSION_KEY])[SEARCH_VERSION_KEY]
+
+    selection = _digest(repr((tags, year)))
+    text_key = f"blog:search:{version}:text:{_digest(stemmed)}:{selection}"
+    fuzzy_key = f"blog:search:{version}:fuzzy:{_digest(folded)}:{selection}"
+    found = cache.get_many([text_key, fuzzy_key])
+    entries = found.get(text_key)
+    if entries and entries[0]:
+        _count(HITS_KEY)
+        return CachedResults(("rank", "id"), *entries)
+    if entries is not None and fuzzy_key in found:
+        _count(HITS_KEY)
+        return CachedResults(("similarity", "id"), *found[fuzzy_key])
+
+    _count(MISSES_KEY)
+    queryset = narrow(Post.objects.order_by(), tags, year)
+    if entries is None:
+        entries = _ranked(search_posts(queryset, query), "rank")
+        cache.set(text_key, entries, SEARCH_CACHE_TIMEOUT)
+        if entries[0]:
+            return CachedResults(("rank", "id"), *entries)
+    # No full-text matches: typo-tolerant title matches instead
+    entries = _ranked(fuzzy_search_posts(queryset, query), "similarity")
+    cache.set(fuzzy_key, entries, SEARCH_CACHE_TIMEOUT)
+    return CachedResults(("similarity", "id"), *entries)
+
+
+def search_cache_metrics():
+    """
+    Hit and miss counts of the search-result cache, shared by all
+    processes using the cache, with the settings that tune it.
+    """
+    counts = cache.get_many([HITS_KEY, MISSES_KEY])
+    hits, misses = counts.get(HITS_KEY, 0), counts.get(MISSES_KEY, 0)
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+        "timeout": SEARCH_CACHE_TIMEOUT,
+        "limit": SEARCH_CACHE_LIMIT,
+    }
@@ -0,0 +1,252 @@
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.signals import request_finished
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+from taggit.models import Tag, TaggedItem
+
+from .archive import adjust_monthly_counts, month_of
+from .cache import (
+    FEEDS_VERSION_KEY, GLOBAL_TAGS_KEY, SEARCH_VERSION_KEY, bump, card_version_key, comments_version_key,
+)
+from .frontpage import invalidate_front_page
+from .models import Comment, Post
+from .popularity import view_buffer
+from .related import affected_posts, refresh_related
+from .search import update_search_vector, update_search_vectors
+from .tags import adjust_tag_stats, post_tagged_items
+from . import sitemaps
+
+
+@receiver(post_save, sender=Post)
+def refresh_search_vector_on_save(sender, instance, **kwargs):
+    """
+    Keep the stored search vector in sync whenever a post is saved.
+    """
+    update_search_vector(instance)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def refresh_search_vector_on_tag_change(sender, instance, action, **kwargs):
+    """
+    Tag names are part of the search vector, so rebuild it when tags change.
+    """
+    if action in ("post_add", "post_remove", "post_clear") and isinstance(instance, Post):
+        update_search_vector(instance)
+
+
+@receiver(post_save, sender=Tag)
+def refresh_search_vectors_on_tag_rename(sender, instance, created, **kwargs):
+    """
+    A renamed tag changes the vector of every post carrying it: one UPDATE.
+    """
+    if not created:
+        tagged = post_tagged_items().filter(tag_id=instance.pk).values("object_id")
+        update_search_vectors(Post.objects.filter(pk__in=tagged))
+
+
+@receiver(post_save, sender=Comment)
+def count_new_comment(sender, instance, created, **kwargs):
+    """
+    Bump the post's comment counter in a single atomic UPDATE.
+    """
+    if created:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F("comment_count") + 1,
+            last_comment_at=Greatest(
+                Coalesce("last_comment_at", instance.created_at), instance.created_at
+            ),
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    """
+    Decrement the counter and fall back to the newest remaining comment.
+    """
+    newest = Comment.objects.filter(post=OuterRef("pk")).order_by("-created_at").values("created_at")[:1]
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+        comment_count=F("comment_count") - 1,
+        last_comment_at=Subquery(newest),
+    )
+
+
+# --- Fragment cache invalidation ---
+
+@receiver(post_save, sender=Post)
+def invalidate_post_card(sender, instance, **kwargs):
+    bump(card_version_key(instance.pk), FEEDS_VERSION_KEY, SEARCH_VERSION_KEY)
+
+
+@receiver(post_delete, sender=Post)
+def forget_post_fragments(sender, instance, **kwargs):
+    cache.delete_many([card_version_key(instance.pk), comments_version_key(instance.pk)])
+    bump(FEEDS_VERSION_KEY, SEARCH_VERSION_KEY)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_fragments(sender, instance, **kwargs):
+    """
+    The comment block changes on any comment write; the post card shows
+    the comment count, so it changes too.
+    """
+    bump(comments_version_key(instance.post_id), card_version_key(instance.post_id))
+
+
+@receiver(post_save, sender=TaggedItem)
+@receiver(post_delete, sender=TaggedItem)
+def invalidate_card_on_tagging(sender, instance, **kwargs):
+    if instance.content_type_id == ContentType.objects.get_for_model(Post).id:
+        bump(card_version_key(instance.object_id), FEEDS_VERSION_KEY, SEARCH_VERSION_KEY)
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_cards_on_tag_change(sender, instance, created=False, **kwargs):
+    """
+    A renamed or deleted tag appears on many cards and feed items; bump the
+    shared versions. New tags are on nothing yet, so creating one invalidates nothing.
+    """
+    if not created:
+        bump(GLOBAL_TAGS_KEY, FEEDS_VERSION_KEY, SEARCH_VERSION_KEY)
+
+
+# --- Sitemap shards ---
+
+def _refresh_sitemap(section, pk, index_changed):
+    """
+    After commit, rewrite the one shard holding ``pk`` (and the index when
+    rows were added or removed). Does nothing until sitemaps have been
+    generated once with ``manage.py generate_sitemaps``.
+    """
+    def refresh():
+        if not sitemaps.is_generated():
+            return
+        sitemaps.write_shard(section, sitemaps.shard_for(pk))
+        if index_changed:
+            sitemaps.write_index()
+
+    transaction.on_commit(refresh)
+
+
+def _lastmod(post):
+    # The day a post's sitemap entry shows (see sitemaps.write_shard)
+    return post.updated_at.date() if post.updated_at else None
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_lastmod(sender, instance, **kwargs):
+    """
+    Note the stored lastmod day before ``auto_now`` overwrites it; no query,
+    since the instance already holds the value it was loaded with.
+    """
+    if "updated_at" not in instance.get_deferred_fields():
+        instance._sitemap_lastmod = _lastmod(instance)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def refresh_post_sitemap(sender, instance, created=False, **kwargs):
+    """
+    A post's entry is its URL and lastmod day, so most edits leave its shard
+    as it is: rewrite it only when a post is added or removed, or when an
+    edit moves the lastmod to a new day.
+    """
+    index_changed = created or kwargs["signal"] is post_delete
+    if index_changed or getattr(instance, "_sitemap_lastmod", None) != _lastmod(instance):
+        _refresh_sitemap("posts", instance.pk, index_changed=index_changed)
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def refresh_tag_sitemap(sender, instance, created=False, **kwargs):
+    _refresh_sitemap("tags", instance.pk, index_changed=created or kwargs["signal"] is post_delete)
+
+
+# --- Related posts ---
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def refresh_related_on_tag_change(sender, instance, action, pk_set=None, **kwargs):
+    """
+    After commit, recompute in one batch the related posts of the retagged
+    post, the posts listing it and the newest posts sharing a changed tag
+    (``affected_posts`` caps the batch; ``rebuild_related_posts`` catches
+    up the long tail).
+    """
+    if not isinstance(instance, Post):
+        return
+    if action == "pre_clear":
+        # post_clear carries no pk_set, so note the tags being removed
+        tagged = post_tagged_items().filter(object_id=instance.pk)
+        instance._cleared_tag_ids = set(tagged.values_list("tag_id", flat=True))
+    elif action in ("post_add", "post_remove", "post_clear"):
+        post_id = instance.pk
+        tag_ids = set(pk_set or ()) | instance.__dict__.pop("_cleared_tag_ids", set())
+        transaction.on_commit(lambda: refresh_related(affected_posts(post_id, tag_ids)))
+
+
+# --- Tag statistics ---
+
+@receiver(post_save, sender=TaggedItem)
+def count_tag_use(sender, instance, created, **kwargs):
+    if created and instance.content_type_id == ContentType.objects.get_for_model(Post).id:
+        adjust_tag_stats({instance.tag_id: 1})
+
+
+@receiver(post_delete, sender=TaggedItem)
+def count_tag_removal(sender, instance, **kwargs):
+    if instance.content_type_id == ContentType.objects.get_for_model(Post).id:
+        adjust_tag_stats({instance.tag_id: -1})
+
+
+# --- Monthly archive rollup ---
+
+@receiver(post_save, sender=Post)
+def count_post_in_archive(sender, instance, created, **kwargs):
+    if created:
+        adjust_monthly_counts({(instance.author_id, month_of(instance.created_at)): 1})
+
+
+@receiver(post_delete, sender=Post)
+def uncount_post_in_archive(sender, instance, **kwargs):
+    adjust_monthly_counts({(instance.author_id, month_of(instance.created_at)): -1})
+
+
+# --- Buffered view counts ---
+
+@receiver(request_finished)
+def flush_view_counts(sender, **kwargs):
+    """
+    Write buffered post views once they are due. request_finished fires
+    after the response has gone out, so no reader waits for the UPDATE.
+    """
+    if view_buffer.due():
+        if view_buffer.flush():
+            invalidate_front_page()  # its popular list follows hot_score
+        connection = connections[DEFAULT_DB_ALIAS]
+        # Django already released this request's connection; don't keep the
+        # one the flush opened (unless connections are persistent anyway)
+        if not connection.in_atomic_block:
+            connection.close_if_unusable_or_obsolete()
+
+
+# --- Precomputed front page ---
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=TaggedItem)
+@receiver(post_delete, sender=TaggedItem)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_front_page_on_write(sender, instance, **kwargs):
+    """
+    Every section of the front page can change with these writes. Drop it
+    after commit, so a rebuild never caches rolled-back or uncommitted rows.
+    """
+    transaction.on_commit(invalidate_front_page)
@@ -0,0 +1,146 @@
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models import Max
+from django.urls import reverse
+from django.utils.xmlutils import SimplerXMLGenerator
+from taggit.models import Tag
+
+from .models import Post
+
+
+# Primary-key range covered by one child sitemap (the protocol allows 50,000 URLs)
+SHARD_SIZE = getattr(settings, "BLOG_SITEMAP_SHARD_SIZE", 10000)
+
+# Rows fetched per round trip while streaming a shard
+ITERATOR_CHUNK_SIZE = 2000
+
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+INDEX_FILENAME = "sitemap.xml"
+
+
+def sitemap_root():
+    return Path(getattr(settings, "BLOG_SITEMAP_ROOT", Path(settings.BASE_DIR) / "sitemaps"))
+
+
+def site_url():
+    return getattr(settings, "BLOG_SITE_URL", "http://localhost:8000").rstrip("/")
+
+
+def shard_for(pk):
+    return pk // SHARD_SIZE
+
+
+def shard_filename(section, shard):
+    return f"sitemap-{section}-{shard}.xml"
+
+
+def _post_entries(lo, hi):
+    rows = (
+        Post.objects.filter(pk__gte=lo, pk__lt=hi)
+        .order_by("pk")
+        .values_list("pk", "updated_at")
+        .iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+    )
+    for pk, updated_at in rows:
+        yield reverse("post_detail", args=[pk]), updated_at
+
+
+def _tag_entries(lo, hi):
+    rows = (
+        Tag.objects.filter(pk__gte=lo, pk__lt=hi)
+        .order_by("pk")
+        .values_list("slug", flat=True)
+        .iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+    )
+    for slug in rows:
+        yield reverse("posts_by_tag", args=[slug]), None
+
+
+# section name → (model whose pk ranges define the shards, entry generator)
+SECTIONS = {
+    "posts": (Post, _post_entries),
+    "tags": (Tag, _tag_entries),
+}
+
+
+def _write_atomically(filename, write):
+    """
+    Write a file through a temporary sibling and rename it into place, so a
+    crawler never reads a half-written sitemap.
+    """
+    root = sitemap_root()
+    root.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=root, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as out:
+            write(out)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, root / filename)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return root / filename
+
+
+def write_shard(section, shard):
+    """
+    Regenerate one child sitemap.
+
+    The shard is a single primary-key range query streamed with
+    ``iterator()``, so its cost is bounded by the shard size, not the table.
+    """
+    base = site_url()
+    entries = SECTIONS[section][1](shard * SHARD_SIZE, (shard + 1) * SHARD_SIZE)
+
+    def write(out):
+        xml = SimplerXMLGenerator(out, "utf-8", short_empty_elements=True)
+        xml.startDocument()
+        xml.startElement("urlset", {"xmlns": SITEMAP_NS})
+        for path, lastmod in entries:
+            xml.startElement("url", {})
+            xml.addQuickElement("loc", base + path)
+            if lastmod is not None:
+                xml.addQuickElement("lastmod", lastmod.date().isoformat())
+            xml.endElement("url")
+        xml.endElement("urlset")
+        xml.endDocument()
+
+    return _write_atomically(shard_filename(section, shard), write)
+
+
+def shard_count(section):
+    """
+    Number of shards in a section, from ``MAX(pk)`` (a single index probe).
+    """
+    max_pk = SECTIONS[section][0].objects.aggregate(max_pk=Max("pk"))["max_pk"]
+    return 0 if max_pk is None else shard_for(max_pk) + 1
+
+
+def write_index():
+    """
+    Regenerate ``sitemap.xml``, listing every shard of every section.
+    """
+    base = site_url()
+    counts = {section: shard_count(section) for section in SECTIONS}
+
+    def write(out):
+        xml = SimplerXMLGenerator(out, "utf-8", short_empty_elements=True)
+        xml.startDocument()
+        xml.startElement("sitemapindex", {"xmlns": SITEMAP_NS})
+        for section, count in counts.items():
+            for shard in range(count):
+                path = reverse("sitemap_section", args=[section, shard])
+                xml.startElement("sitemap", {})
+                xml.addQuickElement("loc", base + path)
+                xml.endElement("sitemap")
+        xml.endElement("sitemapindex")
+        xml.endDocument()
+
+    return _write_atomically(INDEX_FILENAME, write)
+
+
+def is_generated():
+    return (sitemap_root() / INDEX_FILENAME).exists()
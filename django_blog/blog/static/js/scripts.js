@@ -1,3 +1,101 @@
 document.addEventListener('DOMContentLoaded', function() {
     console.log('Blog page loaded');
+    setUpSearchSuggestions();
+    setUpLoadMoreComments();
 });
+
+// Navbar type-ahead: fetch title/tag suggestions as the user types
+function setUpSearchSuggestions() {
+    var input = document.querySelector('input[data-suggest-url]');
+    if (!input) {
+        return;
+    }
+    var list = document.getElementById(input.getAttribute('list'));
+    var timer = null;
+
+    input.addEventListener('input', function() {
+        clearTimeout(timer);
+        var q = input.value.trim();
+        if (q.length < 2) {
+            list.innerHTML = '';
+            return;
+        }
+        timer = setTimeout(function() {
+            fetch(input.dataset.suggestUrl + '?q=' + encodeURIComponent(q))
+                .then(function(response) { return response.json(); })
+                .then(function(data) {
+                    list.innerHTML = '';
+                    data.titles.forEach(function(item) {
+                        var option = document.createElement('option');
+                        option.value = item.title;
+                        list.appendChild(option);
+                    });
+                    data.tags.forEach(function(item) {
+                        var option = document.createElement('option');
+                        option.value = item.name;
+                        option.label = 'Tag';
+                        list.appendChild(option);
+                    });
+                });
+        }, 150);
+    });
+}
+
+// Post detail: fetch further pages of comments from the comments API
+function setUpLoadMoreComments() {
+    var button = document.getElementById('load-more-comments');
+    if (!button) {
+        return;
+    }
+
+    function renderComment(comment) {
+        var box = document.createElement('div');
+        box.className = 'comment mb-3 p-3 border rounded';
+
+        var author = document.createElement('p');
+        var name = document.createElement('strong');
+        name.textContent = comment.author;
+        author.appendChild(name);
+        author.appendChild(document.createTextNode(' said:'));
+        box.appendChild(author);
+
+        // Rendered (and escaped) server-side when the comment was saved
+        var content = document.createElement('div');
+        content.innerHTML = comment.html;
+        box.appendChild(content);
+
+        var posted = document.createElement('small');
+        posted.className = 'text-muted';
+        posted.textContent = 'Posted on ' + new Date(comment.created_at).toLocaleString();
+        box.appendChild(posted);
+
+        if (comment.can_edit) {
+            var actions = document.createElement('div');
+            actions.className = 'mt-2';
+            actions.innerHTML =
+                '<a class="btn btn-sm btn-outline-primary">Edit</a> ' +
+                '<a class="btn btn-sm btn-outline-danger">Delete</a>';
+            actions.children[0].href = comment.update_url;
+            actions.children[1].href = comment.delete_url;
+            box.appendChild(actions);
+        }
+        return box;
+    }
+
+    button.addEventListener('click', function() {
+        button.disabled = true;
+        fetch(button.dataset.url)
+            .then(function(response) { return response.json(); })
+            .then(function(data) {
+                data.comments.forEach(function(comment) {
+                    button.parentNode.insertBefore(renderComment(comment), button);
+                });
+                if (data.next) {
+                    button.dataset.url = data.next;
+                    button.disabled = false;
+                } else {
+                    button.remove();
+                }
+            });
+    });
+}
@@ -0,0 +1,66 @@
+import gzip
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # optional: without it collectstatic writes only .gz variants
+    brotli = None
+
+
+# Text assets worth compressing; images and fonts are compressed already
+COMPRESSIBLE_EXTENSIONS = {".css", ".js", ".map", ".svg", ".json", ".txt", ".xml", ".html"}
+# Below this size the encoded response saves less than its headers cost
+MIN_COMPRESS_SIZE = 256
+
+# Variant suffixes by Content-Encoding, most preferred first
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def compress(content):
+    """
+    ``{suffix: bytes}`` of each available encoding of ``content``.
+    """
+    variants = {".gz": gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = brotli.compress(content, quality=11)
+    return variants
+
+
+class PrecompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    ManifestStaticFilesStorage that also writes ``.gz`` and ``.br`` copies
+    of each hashed text asset, for blog.middleware.StaticFilesMiddleware
+    to serve without compressing per request.
+
+    Until the first collectstatic there is no manifest; URLs then stay
+    unhashed so development servers and test runs work without one.
+    """
+
+    def stored_name(self, name):
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            if not dry_run and isinstance(hashed_name, str):
+                self.write_variants(hashed_name)
+            yield name, hashed_name, processed
+
+    def write_variants(self, name):
+        if os.path.splitext(name)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+            return
+        with self.open(name) as original:
+            content = original.read()
+        if len(content) < MIN_COMPRESS_SIZE:
+            return
+        for suffix, data in compress(content).items():
+            variant = name + suffix
+            if self.exists(variant):
+                self.delete(variant)
+            # Keep only variants that are actually smaller
+            if len(data) < len(content):
+                self._save(variant, ContentFile(data))
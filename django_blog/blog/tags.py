@@ -0,0 +1,69 @@
+import math
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Case, F, IntegerField, Value, When
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+from taggit.models import TaggedItem
+
+from .models import Post, TagStat
+
+
+# Tags shown in the tag cloud, and the number of font-size steps
+TAG_CLOUD_SIZE = 50
+TAG_CLOUD_STEPS = 5
+
+
+def post_tagged_items():
+    """
+    taggit's TaggedItem rows that tag a Post.
+    """
+    return TaggedItem.objects.filter(content_type=ContentType.objects.get_for_model(Post))
+
+
+def adjust_tag_stats(deltas, used_at=None):
+    """
+    Apply ``{tag_id: change in post count}`` to the TagStat rows in two
+    queries, creating missing rows. Tags gaining posts get ``last_used_at``
+    moved forward to ``used_at`` (default: now).
+    """
+    deltas = {tag_id: delta for tag_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    used_at = used_at or timezone.now()
+    TagStat.objects.bulk_create([TagStat(tag_id=tag_id) for tag_id in deltas], ignore_conflicts=True)
+
+    change = Case(
+        *[When(tag_id=tag_id, then=Value(delta)) for tag_id, delta in deltas.items()],
+        output_field=IntegerField(),
+    )
+    gained = [tag_id for tag_id, delta in deltas.items() if delta > 0]
+    TagStat.objects.filter(tag_id__in=deltas).update(
+        post_count=Greatest(F("post_count") + change, Value(0)),
+        last_used_at=Case(
+            When(tag_id__in=gained, then=Greatest(Coalesce("last_used_at", Value(used_at)), Value(used_at))),
+            default=F("last_used_at"),
+        ),
+    )
+
+
+def tag_cloud(limit=TAG_CLOUD_SIZE, steps=TAG_CLOUD_STEPS):
+    """
+    The ``limit`` most used tags, alphabetically, each with a ``weight`` from
+    1 to ``steps`` on a log scale of its post count.
+
+    A single index scan of TagStat, however many tags or posts exist.
+    """
+    stats = list(
+        TagStat.objects.filter(post_count__gt=0)
+        .select_related("tag")
+        .order_by("-post_count", "-tag")[:limit]
+    )
+    if not stats:
+        return []
+    low = math.log(stats[-1].post_count)
+    spread = math.log(stats[0].post_count) - low
+    for stat in stats:
+        position = (math.log(stat.post_count) - low) / spread if spread else 1
+        stat.weight = 1 + round(position * (steps - 1))
+    return sorted(stats, key=lambda stat: stat.tag.name.lower())
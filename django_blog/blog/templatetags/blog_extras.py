@@ -0,0 +1,15 @@
+from django import template
+
+from blog.pagination import encode_cursor
+
+register = template.Library()
+
+
+@register.filter
+def comment_cursor(comment):
+    """
+    Cursor pointing just past ``comment``, for the comments API.
+
+    Usage: {{ comment|comment_cursor }}
+    """
+    return encode_cursor((comment.created_at, comment.id))
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+
+
+class BlogTestRunner(DiscoverRunner):
+    """
+    DiscoverRunner that switches off view-count buffering for the whole run.
+
+    The buffer is process-global and flushes on request_finished, so a flush
+    left due by one test would otherwise land inside another test's
+    assertNumQueries. Tests of the buffer itself turn it back on with
+    ``override_settings(BLOG_BUFFER_VIEWS=True)``.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._buffer_views = settings.BLOG_BUFFER_VIEWS
+        settings.BLOG_BUFFER_VIEWS = False
+
+    def teardown_test_environment(self, **kwargs):
+        settings.BLOG_BUFFER_VIEWS = self._buffer_views
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,87 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from blog.models import MonthlyPostCount, Post
+
+
+def at(year, month, day=15):
+    return datetime.datetime(year, month, day, 12, tzinfo=datetime.timezone.utc)
+
+
+class ArchiveTests(TestCase):
+    """
+    Tests for month / author archives and the monthly-counts rollup.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.alice = User.objects.create_user(username="alice", password="password")
+        self.bob = User.objects.create_user(username="bob", password="password")
+        self.make_post("Alice March", self.alice, at(2024, 3))
+        self.make_post("Bob March", self.bob, at(2024, 3, 31))
+        self.make_post("Alice April", self.alice, at(2024, 4, 1))
+
+    def make_post(self, title, author, created_at):
+        post = Post.objects.create(title=title, content="Body", author=author)
+        # created_at is auto_now_add; move it, then fix the rollup like an import would
+        Post.objects.filter(pk=post.pk).update(created_at=created_at)
+        return post
+
+    def counts(self, author=None):
+        rows = MonthlyPostCount.objects.filter(post_count__gt=0)
+        rows = rows.filter(author=author) if author else rows.filter(author__isnull=True)
+        return {row.month.strftime("%Y-%m"): row.post_count for row in rows}
+
+    def test_rollup_follows_create_and_delete(self):
+        call_command("recount_archive", stdout=StringIO())
+        self.assertEqual(self.counts(), {"2024-03": 2, "2024-04": 1})
+        self.assertEqual(self.counts(self.alice), {"2024-03": 1, "2024-04": 1})
+
+        post = Post.objects.create(title="Now", content="Body", author=self.bob)
+        this_month = post.created_at.strftime("%Y-%m")
+        self.assertEqual(self.counts(self.bob)[this_month], 1)
+        post.delete()
+        self.assertNotIn(this_month, self.counts(self.bob))
+        self.assertNotIn(this_month, self.counts())
+
+    def test_month_archive_lists_only_that_month(self):
+        call_command("recount_archive", stdout=StringIO())
+        response = self.client.get(reverse("archive_month", args=[2024, 3]))
+        titles = [post.title for post in response.context["posts"]]
+        self.assertEqual(titles, ["Bob March", "Alice March"])
+        self.assertContains(response, "Archive — March 2024")
+        self.assertContains(response, reverse("archive_month", args=[2024, 4]))
+
+    def test_author_archive(self):
+        call_command("recount_archive", stdout=StringIO())
+        response = self.client.get(reverse("author_archive", args=["alice"]))
+        self.assertEqual([p.title for p in response.context["posts"]], ["Alice April", "Alice March"])
+        self.assertContains(response, reverse("author_archive_month", args=["alice", 2024, 4]))
+
+        response = self.client.get(reverse("author_archive_month", args=["alice", 2024, 3]))
+        self.assertEqual([p.title for p in response.context["posts"]], ["Alice March"])
+
+    def test_sidebar_is_one_query(self):
+        url = reverse("archive_month", args=[2024, 3])
+        self.client.get(url)
+        with self.assertNumQueries(3):  # posts with authors, prefetched tags, sidebar rollup
+            self.client.get(url)
+
+    def test_bad_month_or_author_404s(self):
+        self.assertEqual(self.client.get(reverse("archive_month", args=[2024, 13])).status_code, 404)
+        self.assertEqual(self.client.get(reverse("author_archive", args=["nobody"])).status_code, 404)
+
+    def test_deleting_an_author_with_posts(self):
+        call_command("recount_archive", stdout=StringIO())
+        alice_id = self.alice.pk
+        self.alice.delete()
+        connection.check_constraints()  # the deferred FK checks a commit would run
+        self.assertEqual(self.counts(), {"2024-03": 1})
+        self.assertFalse(MonthlyPostCount.objects.filter(author_id=alice_id).exists())
@@ -0,0 +1,68 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import include, path
+
+from blog.models import Comment, Post
+from blog.views import AsyncPostDetailView, AsyncPostListView, AsyncPostSearchListView
+
+
+# The async views next to the normal routes, which templates reverse
+urlpatterns = [
+    path("async/posts/", AsyncPostListView.as_view()),
+    path("async/post/<int:pk>/", AsyncPostDetailView.as_view()),
+    path("async/search/", AsyncPostSearchListView.as_view()),
+    path("", include("blog.urls")),
+]
+
+
+@override_settings(ROOT_URLCONF="blog.tests.test_async_views")
+class AsyncViewTests(TestCase):
+    """
+    Tests for the async (ASGI) list, detail and search views.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="async", password="password")
+        self.post = Post.objects.create(title="Async Django", content="Event loops", author=self.user)
+        self.post.tags.add("asgi")
+        Comment.objects.create(post=self.post, author=self.user, content="Awaited comment")
+        for i in range(11):
+            Post.objects.create(title=f"Filler {i}", content="Body", author=self.user)
+
+    async def test_list_paginates_and_revalidates(self):
+        response = await self.async_client.get("/async/posts/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["posts"]), 10)
+        self.assertIn('rel="next"', response["Link"])
+
+        response = await self.async_client.get("/async/posts/", headers={"if-none-match": response["ETag"]})
+        self.assertEqual(response.status_code, 304)
+
+    async def test_detail_renders_comments_and_404s(self):
+        response = await self.async_client.get(f"/async/post/{self.post.pk}/")
+        self.assertContains(response, "Awaited comment")
+        self.assertContains(response, "asgi")
+
+        # Comment block now comes from the fragment cache, but the page is
+        # still loaded in case the fragment expires before the render
+        response = await self.async_client.get(f"/async/post/{self.post.pk}/")
+        self.assertContains(response, "Awaited comment")
+        self.assertIsInstance(response.context["comments"], list)
+
+        response = await self.async_client.get(f"/async/post/{self.post.pk + 1000}/")
+        self.assertEqual(response.status_code, 404)
+
+    async def test_detail_for_logged_in_user(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(f"/async/post/{self.post.pk}/")
+        self.assertContains(response, "Add a Comment")
+        self.assertContains(response, "Edit")
+
+    async def test_search_and_fuzzy_fallback(self):
+        response = await self.async_client.get("/async/search/", {"q": "event"})
+        self.assertEqual([p.title for p in response.context["posts"]], ["Async Django"])
+
+        response = await self.async_client.get("/async/search/", {"q": "Fillr"})
+        self.assertTrue(response.context["fuzzy"])
@@ -0,0 +1,59 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from blog.models import Comment, Post
+
+
+class FragmentCacheTests(TestCase):
+    """
+    Tests for the versioned post-card and comment-block fragment caches.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="cacher", password="password")
+        self.post = Post.objects.create(title="Cached Post", content="Original body", author=self.user)
+        self.post.tags.add("caching")
+
+    def test_card_served_from_cache_until_post_changes(self):
+        self.assertContains(self.client.get(reverse("post_list")), "Original body")
+        # A write that bypasses signals must not show up: the card is cached
+        Post.objects.filter(pk=self.post.pk).update(content="Sneaky body")
+        self.assertContains(self.client.get(reverse("post_list")), "Original body")
+        # A real save changes updated_at and the card version
+        self.post.content = "Edited body"
+        self.post.save()
+        self.assertContains(self.client.get(reverse("post_list")), "Edited body")
+
+    def test_card_invalidated_by_tag_changes(self):
+        self.client.get(reverse("post_list"))
+        self.post.tags.add("fresh")
+        self.assertContains(self.client.get(reverse("post_list")), "fresh")
+        self.post.tags.remove("fresh")
+        self.assertNotContains(self.client.get(reverse("post_list")), "fresh")
+
+    def test_card_invalidated_by_tag_rename(self):
+        self.client.get(reverse("post_list"))
+        tag = self.post.tags.get()
+        tag.name = "renamed"
+        tag.save()
+        self.assertContains(self.client.get(reverse("post_list")), "renamed")
+
+    def test_card_invalidated_by_new_comment(self):
+        self.assertContains(self.client.get(reverse("post_list")), "0 comments")
+        Comment.objects.create(post=self.post, author=self.user, content="Nice post!")
+        self.assertContains(self.client.get(reverse("post_list")), "1 comment")
+
+    def test_comment_block_cached_and_invalidated(self):
+        url = reverse("post_detail", args=[self.post.pk])
+        comment = Comment.objects.create(post=self.post, author=self.user, content="First thoughts")
+        self.client.get(url)
+        with self.assertNumQueries(4):  # ETag validators, post with author, tags, related posts; comments from cache
+            response = self.client.get(url)
+        self.assertContains(response, "First thoughts")
+
+        comment.content = "Second thoughts"
+        comment.save()
+        self.assertContains(self.client.get(url), "Second thoughts")
@@ -1,7 +1,11 @@
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import TestCase
 from django.urls import reverse
 from django.contrib.auth.models import User
 from blog.models import Post, Comment
+from blog.views import COMMENTS_PER_PAGE
 
 class CommentTests(TestCase):
     def setUp(self):
@@ -82,3 +86,83 @@ class CommentTests(TestCase):
         )
         self.assertEqual(response.status_code, 403)  # Forbidden
         self.assertTrue(Comment.objects.filter(id=self.comment.id).exists())
+
+
+class CommentCounterTests(TestCase):
+    """
+    Tests for the denormalized comment_count / last_comment_at columns on Post.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="counter", password="testpass123")
+        self.post = Post.objects.create(title="Counted Post", content="Post content", author=self.user)
+
+    def test_counter_follows_comment_views(self):
+        self.client.login(username="counter", password="testpass123")
+        self.client.post(reverse("comment_create", args=[self.post.id]), {"content": "First comment"})
+        self.client.post(reverse("comment_create", args=[self.post.id]), {"content": "Second comment"})
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 2)
+        newest = Comment.objects.latest("created_at")
+        self.assertEqual(self.post.last_comment_at, newest.created_at)
+
+        self.client.post(reverse("comment_delete", args=[newest.id]))
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 1)
+        self.assertEqual(self.post.last_comment_at, Comment.objects.get().created_at)
+
+    def test_recount_command_repairs_drift(self):
+        Comment.objects.create(post=self.post, author=self.user, content="A real comment")
+        Post.objects.filter(pk=self.post.pk).update(comment_count=42, last_comment_at=None)
+        call_command("recount_comments", batch_size=1, stdout=StringIO())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 1)
+        self.assertIsNotNone(self.post.last_comment_at)
+
+    def test_active_listing_orders_by_last_comment(self):
+        quiet = Post.objects.create(title="Quiet Post", content="Nobody replies", author=self.user)
+        older = Post.objects.create(title="Older Post", content="Post content", author=self.user)
+        Comment.objects.create(post=older, author=self.user, content="Old reply")
+        Comment.objects.create(post=self.post, author=self.user, content="New reply")
+        response = self.client.get(reverse("post_list"), {"sort": "active"})
+        self.assertEqual(list(response.context["posts"]), [self.post, older])
+        self.assertNotIn(quiet, response.context["posts"])
+
+
+class CommentPaginationTests(TestCase):
+    """
+    Tests for the first page of comments on the detail page and the JSON comments API.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="talker", password="testpass123")
+        self.post = Post.objects.create(title="Busy Post", content="Post content", author=self.user)
+        self.comments = [
+            Comment.objects.create(post=self.post, author=self.user, content=f"Comment number {i}")
+            for i in range(COMMENTS_PER_PAGE + 5)
+        ]
+
+    def test_detail_embeds_only_first_page(self):
+        response = self.client.get(reverse("post_detail", args=[self.post.id]))
+        self.assertContains(response, "Comment number 0")
+        self.assertContains(response, f"Comment number {COMMENTS_PER_PAGE - 1}")
+        self.assertNotContains(response, f"Comment number {COMMENTS_PER_PAGE}<")
+        self.assertContains(response, 'id="load-more-comments"')
+
+    def test_api_walks_all_comments_in_order(self):
+        url = reverse("comment_list_api", args=[self.post.id]) + "?limit=10"
+        seen = []
+        while url:
+            data = self.client.get(url).json()
+            seen.extend(item["id"] for item in data["comments"])
+            url = data["next"]
+        self.assertEqual(seen, [comment.id for comment in self.comments])
+
+    def test_api_marks_editable_comments(self):
+        self.client.login(username="talker", password="testpass123")
+        data = self.client.get(reverse("comment_list_api", args=[self.post.id])).json()
+        self.assertTrue(all(item["can_edit"] for item in data["comments"]))
+
+    def test_api_rejects_bad_cursor(self):
+        url = reverse("comment_list_api", args=[self.post.id])
+        self.assertEqual(self.client.get(url, {"after": "garbage"}).status_code, 404)
@@ -0,0 +1,75 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.http import http_date
+
+from blog.models import Comment, Post
+
+
+class ConditionalGetTests(TestCase):
+    """
+    Tests for ETag revalidation on detail and list pages.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="crawler", password="password")
+        self.post = Post.objects.create(title="Conditional Post", content="Body", author=self.user)
+        self.detail_url = reverse("post_detail", args=[self.post.pk])
+
+    def test_detail_sends_validators(self):
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.has_header("ETag"))
+        self.assertFalse(response.has_header("Last-Modified"))
+
+    def test_detail_304_on_matching_etag_with_one_query(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+        with self.assertNumQueries(1):
+            response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_if_modified_since_never_revalidates_a_stale_page(self):
+        """Comment edits change the page but no timestamp the view could send."""
+        comment = Comment.objects.create(post=self.post, author=self.user, content="Original")
+        since = http_date()
+        comment.content = "Edited comment"
+        comment.save()
+        response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Edited comment")
+
+    def test_detail_etag_changes_with_comments_and_edits(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+        comment = Comment.objects.create(post=self.post, author=self.user, content="New comment")
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        etag = response["ETag"]
+        comment.content = "Edited comment"
+        comment.save()
+        self.assertEqual(self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_detail_etag_differs_per_user(self):
+        anonymous_etag = self.client.get(self.detail_url)["ETag"]
+        self.client.login(username="crawler", password="password")
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=anonymous_etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_missing_post_still_404s(self):
+        response = self.client.get(reverse("post_detail", args=[self.post.pk + 1000]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_list_304_until_visible_page_changes(self):
+        url = reverse("post_list")
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.post.title = "Retitled Post"
+        self.post.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Retitled Post")
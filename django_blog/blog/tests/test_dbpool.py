@@ -0,0 +1,41 @@
+from django.contrib.auth.models import User
+from django.db import connections
+from django.test import TestCase
+from django.urls import reverse
+
+from blog.dbpool import pool_metrics
+from blog.management.commands.bench_db_connections import mode_settings
+
+
+class ConnectionPoolTests(TestCase):
+    """
+    Tests for the pool metrics endpoint and the connection benchmark.
+    """
+
+    def test_metrics_without_pool_report_persistent_settings(self):
+        metrics = pool_metrics()
+        self.assertFalse(metrics["pooled"])
+        self.assertEqual(metrics["alias"], "default")
+        self.assertIn("conn_max_age", metrics)
+
+    def test_metrics_endpoint_is_staff_only(self):
+        url = reverse("db_pool_metrics")
+        User.objects.create_user(username="reader", password="password")
+        self.client.login(username="reader", password="password")
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        User.objects.create_user(username="ops", password="password", is_staff=True)
+        self.client.login(username="ops", password="password")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["pooled"], False)
+
+    def test_benchmark_modes_override_only_connection_settings(self):
+        base = {**connections["default"].settings_dict, "OPTIONS": {"sslmode": "prefer", "pool": True}}
+        pooled = mode_settings(base, "pool")
+        self.assertEqual(pooled["CONN_MAX_AGE"], 0)
+        self.assertEqual(pooled["OPTIONS"], {"sslmode": "prefer", "pool": {"min_size": 1, "max_size": 1}})
+        self.assertEqual(pooled["NAME"], base["NAME"])
+        persistent = mode_settings(base, "persistent")
+        self.assertIsNone(persistent["CONN_MAX_AGE"])
+        self.assertEqual(persistent["OPTIONS"], {"sslmode": "prefer"})
@@ -0,0 +1,75 @@
+import csv
+import gzip
+import io
+import json
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from blog.export import export_chunks
+from blog.models import Comment, Post
+
+
+class ExportTests(TestCase):
+    """
+    Tests for the streaming corpus export.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="writer", password="password")
+        self.staff = User.objects.create_user(username="staff", password="password", is_staff=True)
+        for i in range(5):
+            post = Post.objects.create(title=f"Export {i}", content="Body, with comma", author=self.user)
+            post.tags.add("export", f"tag{i}")
+        Comment.objects.create(post=post, author=self.user, content="Nice")
+
+    def read(self, dataset, fmt="jsonl", compress=False, chunk_size=2):
+        data = b"".join(export_chunks(dataset, fmt, compress, chunk_size))
+        return gzip.decompress(data) if compress else data
+
+    def test_posts_jsonl_includes_tags(self):
+        rows = [json.loads(line) for line in self.read("posts").decode().splitlines()]
+        self.assertEqual([row["title"] for row in rows], [f"Export {i}" for i in range(5)])
+        self.assertEqual(sorted(rows[0]["tags"]), ["export", "tag0"])
+        self.assertEqual(rows[4]["comment_count"], 1)
+
+    def test_tags_are_prefetched_once_per_chunk(self):
+        # 3 chunks of 2 posts: one cursor query plus one tag prefetch per chunk
+        with self.assertNumQueries(4):
+            self.read("posts", chunk_size=2)
+
+    def test_csv_and_gzip(self):
+        rows = list(csv.DictReader(io.StringIO(self.read("posts", "csv", compress=True).decode())))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]["content"], "Body, with comma")
+        self.assertIn("export", rows[0]["tags"].split(","))
+
+        tags = list(csv.DictReader(io.StringIO(self.read("tags", "csv").decode())))
+        self.assertEqual(len(tags), 10)
+
+    def test_command_writes_file(self):
+        with tempfile.NamedTemporaryFile(suffix=".jsonl") as handle:
+            call_command("export_blog", "comments", output=handle.name, stderr=io.StringIO())
+            rows = [json.loads(line) for line in open(handle.name)]
+        self.assertEqual(rows[0]["content"], "Nice")
+        self.assertEqual(rows[0]["author"], "writer")
+
+    def test_endpoint_is_staff_only_and_streams(self):
+        url = reverse("export_dataset", args=["posts"])
+        self.client.login(username="writer", password="password")
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        self.client.login(username="staff", password="password")
+        response = self.client.get(url, {"format": "csv", "gzip": "1"})
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertIn('filename="posts.csv.gz"', response["Content-Disposition"])
+        body = gzip.decompress(b"".join(response.streaming_content)).decode()
+        self.assertTrue(body.startswith("id,title,content"))
+
+    def test_unknown_dataset_404s(self):
+        self.client.login(username="staff", password="password")
+        self.assertEqual(self.client.get(reverse("export_dataset", args=["users"])).status_code, 404)
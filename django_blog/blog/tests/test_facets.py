@@ -0,0 +1,94 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from blog.facets import facet_counts, narrow
+from blog.models import Post
+from blog.search import search_posts
+
+
+def at(year, month=6):
+    return datetime.datetime(year, month, 15, 12, tzinfo=datetime.timezone.utc)
+
+
+class SearchFacetTests(TestCase):
+    """
+    Tests for tag and year facets on the search page.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="faceter", password="password")
+        self.posts = {}
+        for title, year, tags in [
+            ("Facets in 2023", 2023, ["django", "search"]),
+            ("More facets 2023", 2023, ["django"]),
+            ("Facets in 2024", 2024, ["django", "postgres"]),
+            ("Unrelated 2024", 2024, ["django"]),
+        ]:
+            post = Post.objects.create(title=title, content="Notes.", author=self.user)
+            post.tags.add(*tags)
+            Post.objects.filter(pk=post.pk).update(created_at=at(year))
+            self.posts[title] = post
+
+    def search(self, **params):
+        return self.client.get(reverse("post_search"), {"q": "facets", **params})
+
+    def titles(self, response):
+        return sorted(post.title for post in response.context["posts"])
+
+    def test_counts_come_from_one_query(self):
+        with self.assertNumQueries(1):
+            facets = facet_counts(search_posts(Post.objects.all(), "facets"))
+        self.assertEqual(facets["tags"], [
+            {"slug": "django", "name": "django", "count": 3},
+            {"slug": "postgres", "name": "postgres", "count": 1},
+            {"slug": "search", "name": "search", "count": 1},
+        ])
+        self.assertEqual(facets["years"], [{"year": 2024, "count": 1}, {"year": 2023, "count": 2}])
+
+    def test_narrow_by_tag_slug_and_year(self):
+        matches = narrow(search_posts(Post.objects.all(), "facets"), ("django",), 2023)
+        self.assertEqual(sorted(post.title for post in matches), ["Facets in 2023", "More facets 2023"])
+
+    def test_search_page_shows_facets(self):
+        response = self.search()
+        facets = response.context["facets"]
+        self.assertEqual([tag["slug"] for tag in facets["tags"]], ["django", "postgres", "search"])
+        self.assertEqual([bucket["year"] for bucket in facets["years"]], [2024, 2023])
+        self.assertContains(response, "postgres</a> (1)")
+
+    def test_selected_facets_combine_with_query(self):
+        self.search()
+        response = self.search(tag="django", year=2023)
+        self.assertEqual(self.titles(response), ["Facets in 2023", "More facets 2023"])
+        self.assertEqual(response.context["facets"]["years"][0]["count"], 2)
+        self.assertTrue(response.context["facets"]["tags"][0]["selected"])
+
+        with self.assertNumQueries(2):  # cached: posts with authors by id, tags
+            again = self.search(year="2023", tag="django")
+        self.assertEqual(self.titles(again), self.titles(response))
+
+    def test_facet_links_toggle_the_selection(self):
+        response = self.search(tag="search")
+        self.assertEqual(self.titles(response), ["Facets in 2023"])
+        search_tag = next(tag for tag in response.context["facets"]["tags"] if tag["slug"] == "search")
+        self.assertEqual(self.titles(self.client.get(search_tag["url"])), [
+            "Facets in 2023", "Facets in 2024", "More facets 2023",
+        ])
+
+        year = response.context["facets"]["years"][0]
+        narrowed = self.client.get(year["url"])
+        self.assertEqual(narrowed.context["selected_year"], 2023)
+        self.assertEqual(self.titles(self.client.get(narrowed.context["clear_year_url"])), ["Facets in 2023"])
+
+    def test_invalid_year_is_ignored(self):
+        for year in ("soon", "0", "10000", "-5"):
+            response = self.search(year=year)
+            self.assertEqual(len(response.context["posts"]), 3, year)
+            self.assertIsNone(response.context["selected_year"])
+        self.assertEqual(len(self.search(year="1").context["posts"]), 0)
+        self.assertEqual(len(self.search(year="9999").context["posts"]), 0)
@@ -0,0 +1,87 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.http import http_date
+
+from blog.models import Post
+
+
+class FeedTests(TestCase):
+    """
+    Tests for the cached RSS / Atom feeds.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="writer", password="password")
+        self.other = User.objects.create_user(username="other", password="password")
+        self.post = Post.objects.create(title="Feed Post", content="Feed body", author=self.user)
+        self.post.tags.add("django")
+        Post.objects.create(title="Other Post", content="Other body", author=self.other)
+
+    def test_latest_feeds_list_posts(self):
+        rss = self.client.get(reverse("post_feed_rss"))
+        self.assertEqual(rss.status_code, 200)
+        self.assertIn("rss+xml", rss["Content-Type"])
+        self.assertContains(rss, "Feed Post")
+        self.assertContains(rss, "<category>django</category>")
+
+        atom = self.client.get(reverse("post_feed_atom"))
+        self.assertIn("atom+xml", atom["Content-Type"])
+        self.assertContains(atom, "Other Post")
+
+    def test_tag_and_author_feeds_are_filtered(self):
+        response = self.client.get(reverse("tag_feed_rss", args=["django"]))
+        self.assertContains(response, "Feed Post")
+        self.assertNotContains(response, "Other Post")
+
+        response = self.client.get(reverse("author_feed_atom", args=["other"]))
+        self.assertContains(response, "Other Post")
+        self.assertNotContains(response, "Feed Post")
+
+    def test_unknown_tag_or_author_404s(self):
+        self.assertEqual(self.client.get(reverse("tag_feed_rss", args=["missing"])).status_code, 404)
+        self.assertEqual(self.client.get(reverse("author_feed_rss", args=["nobody"])).status_code, 404)
+
+    def test_cached_feed_served_without_queries(self):
+        url = reverse("post_feed_rss")
+        first = self.client.get(url)
+        with self.assertNumQueries(0):
+            second = self.client.get(url)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first["ETag"], second["ETag"])
+
+    def test_304_on_matching_etag(self):
+        url = reverse("post_feed_atom")
+        first = self.client.get(url)
+        self.assertFalse(first.has_header("Last-Modified"))
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_if_modified_since_never_revalidates_a_stale_feed(self):
+        """A delete changes the feed but not its newest item's timestamp."""
+        url = reverse("post_feed_rss")
+        self.client.get(url)
+        since = http_date()
+        Post.objects.get(title="Other Post").delete()
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, "Other Post")
+
+    def test_post_write_invalidates_feed(self):
+        url = reverse("post_feed_rss")
+        etag = self.client.get(url)["ETag"]
+        self.post.title = "Renamed Feed Post"
+        self.post.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Renamed Feed Post")
+
+    def test_tagging_invalidates_tag_feed(self):
+        url = reverse("tag_feed_rss", args=["django"])
+        self.client.get(url)
+        other = Post.objects.get(title="Other Post")
+        other.tags.add("django")
+        self.assertContains(self.client.get(url), "Other Post")
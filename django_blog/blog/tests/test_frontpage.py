@@ -0,0 +1,92 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.frontpage import FRONT_PAGE_KEY, build_front_page, front_page
+from blog.models import Comment, Post
+from blog.popularity import apply_views, view_buffer
+
+
+class FrontPageTests(TestCase):
+    """
+    Tests for the precomputed front page.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.alice = User.objects.create_user(username="alice", password="password")
+        self.bob = User.objects.create_user(username="bob", password="password")
+        self.posts = []
+        for i, author in enumerate([self.alice, self.alice, self.bob]):
+            post = Post.objects.create(title=f"Front {i}", content="Body", author=author)
+            post.tags.add("django" if i else "python", "web")
+            self.posts.append(post)
+        Comment.objects.create(post=self.posts[0], author=self.bob, content="First")
+        Comment.objects.create(post=self.posts[0], author=self.bob, content="Second")
+        Comment.objects.create(post=self.posts[2], author=self.alice, content="Only")
+
+    def test_sections(self):
+        context = build_front_page()
+        self.assertEqual([post["title"] for post in context["latest_posts"]], ["Front 2", "Front 1", "Front 0"])
+        self.assertEqual(
+            sorted(tag["name"] for tag in context["latest_posts"][2]["tags"]), ["python", "web"]
+        )
+        self.assertEqual([post["id"] for post in context["most_discussed"]], [self.posts[0].pk, self.posts[2].pk])
+        self.assertEqual(
+            context["top_authors"], [{"username": "alice", "post_count": 2}, {"username": "bob", "post_count": 1}]
+        )
+        self.assertEqual(context["popular_tags"][-1], {"name": "web", "slug": "web", "post_count": 3, "weight": 5})
+
+    def test_popular_posts_follow_hot_score(self):
+        self.assertEqual(build_front_page()["popular_posts"], [])
+        apply_views({self.posts[0].pk: 2, self.posts[1].pk: 9})
+        popular = build_front_page()["popular_posts"]
+        self.assertEqual([post["id"] for post in popular], [self.posts[1].pk, self.posts[0].pk])
+
+    @override_settings(BLOG_BUFFER_VIEWS=True)
+    def test_view_flush_invalidates(self):
+        self.addCleanup(setattr, view_buffer, "interval", view_buffer.interval)
+        view_buffer.drain()
+        view_buffer.interval = 0
+        front_page()
+        self.client.get(reverse("post_detail", args=[self.posts[2].pk]))  # flushed once it finishes
+        self.assertIsNone(cache.get(FRONT_PAGE_KEY))
+        response = self.client.get(reverse("home"))
+        self.assertEqual([post["id"] for post in response.context["popular_posts"]], [self.posts[2].pk])
+        self.assertContains(response, "Popular This Week")
+
+    def test_stale_discussion_drops_out(self):
+        later = timezone.now() + datetime.timedelta(days=8)
+        self.assertEqual(build_front_page(now=later)["most_discussed"], [])
+
+    def test_home_costs_no_queries_once_built(self):
+        call_command("refresh_front_page", stdout=StringIO())
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("home"))
+        self.assertContains(response, "Latest Posts")
+        self.assertContains(response, reverse("post_detail", args=[self.posts[2].pk]))
+        self.assertContains(response, reverse("author_archive", args=["alice"]))
+        self.assertContains(response, reverse("posts_by_tag", args=["web"]))
+
+    def test_missing_blob_is_rebuilt(self):
+        self.client.get(reverse("home"))
+        self.assertIsNotNone(cache.get(FRONT_PAGE_KEY))
+
+    def test_writes_invalidate_after_commit(self):
+        front_page()
+        with self.captureOnCommitCallbacks(execute=True):
+            post = Post.objects.create(title="Fresh", content="Body", author=self.bob)
+            post.tags.add("fresh", "new", "tags")
+        self.assertIsNone(cache.get(FRONT_PAGE_KEY))  # dropped, not rebuilt per write
+        self.assertEqual(front_page()["latest_posts"][0]["id"], post.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for text in ("a", "b", "c"):
+                Comment.objects.create(post=post, author=self.alice, content=text)
+        self.assertEqual(front_page()["most_discussed"][0]["id"], post.pk)
@@ -0,0 +1,92 @@
+import datetime
+import json
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from taggit.models import Tag
+
+from blog.frontpage import front_page
+from blog.models import Comment, MonthlyPostCount, Post, TagStat
+from blog.search import search_posts
+from blog.searchcache import cached_search
+
+
+class ImportBlogCommandTests(TestCase):
+    """
+    Tests for the bulk JSONL import command.
+    """
+
+    def setUp(self):
+        self.alice = User.objects.create_user(username="alice", password="password")
+        self.bob = User.objects.create_user(username="bob", password="password")
+        Tag.objects.create(name="existing")
+
+    def run_import(self, records, batch_size=2):
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as handle:
+            for record in records:
+                handle.write(json.dumps(record) + "\n")
+        out = StringIO()
+        call_command("import_blog", handle.name, batch_size=batch_size, stdout=out)
+        return out.getvalue()
+
+    def records(self):
+        return [
+            {"type": "post", "id": "p1", "author": "alice", "title": "Imported Django",
+             "content": "Hello\n\nWorld", "tags": ["existing", "new tag"], "created_at": "2020-01-02T03:04:05+00:00"},
+            {"type": "post", "id": "p2", "author": "bob", "title": "Second", "content": "Body", "tags": ["new tag"]},
+            {"type": "post", "id": "p3", "author": "ghost", "title": "Orphan", "content": "Body"},
+            {"type": "comment", "post": "p1", "author": "bob", "content": "First!", "created_at": "2020-01-03T00:00:00+00:00"},
+            {"type": "comment", "post": "p1", "author": "alice", "content": "Thanks", "created_at": "2020-01-04T00:00:00+00:00"},
+            {"type": "comment", "post": "p3", "author": "bob", "content": "Lost"},
+        ]
+
+    def test_imports_posts_comments_and_tags(self):
+        output = self.run_import(self.records())
+        self.assertIn("2 posts, 2 comments, 3 tag assignments, 2 skipped", output)
+        self.assertIn("rows/s", output)
+
+        post = Post.objects.get(title="Imported Django")
+        self.assertEqual(post.author, self.alice)
+        self.assertEqual(post.created_at.year, 2020)
+        self.assertEqual(post.rendered_html, "<p>Hello</p>\n\n<p>World</p>")
+        self.assertEqual(sorted(post.tags.names()), ["existing", "new tag"])
+        self.assertEqual(Tag.objects.filter(name="new tag").count(), 1)
+        self.assertEqual(TagStat.objects.get(tag__name="new tag").post_count, 2)
+        self.assertEqual(
+            MonthlyPostCount.objects.get(author=self.alice, month=datetime.date(2020, 1, 1)).post_count, 1
+        )
+
+        self.assertEqual(post.comment_count, 2)
+        self.assertEqual(post.last_comment_at.day, 4)
+        self.assertEqual(Comment.objects.get(content="First!").rendered_html, "<p>First!</p>")
+
+    def test_imported_posts_are_searchable_by_tag(self):
+        self.run_import(self.records())
+        titles = set(search_posts(Post.objects.all(), "existing").values_list("title", flat=True))
+        self.assertEqual(titles, {"Imported Django"})
+
+    def test_imported_posts_reach_front_page(self):
+        front_page()
+        self.run_import(self.records())
+        self.assertIn("Second", [post["title"] for post in front_page()["latest_posts"]])
+
+    def test_imported_posts_reach_cached_search(self):
+        cache.clear()
+        self.assertEqual(cached_search("second").entries, [])
+        self.run_import(self.records())
+        second = Post.objects.get(title="Second")
+        self.assertEqual([pk for _, pk in cached_search("second").entries], [second.pk])
+
+    def test_queries_do_not_grow_per_row(self):
+        self.run_import(self.records(), batch_size=100)
+        records = [
+            {"type": "post", "id": f"x{i}", "author": "alice", "title": f"Bulk {i}", "content": "Body", "tags": ["bulk"]}
+            for i in range(50)
+        ]
+        with self.assertNumQueries(13):
+            self.run_import(records, batch_size=100)
+        self.assertEqual(Post.objects.filter(title__startswith="Bulk").count(), 50)
@@ -0,0 +1,103 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.models import Post
+from blog.pagination import encode_cursor
+from blog.views import PostListView
+
+
+class KeysetPaginationTests(TestCase):
+    """
+    Tests for cursor-based pagination on the post listings.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="pager", password="password")
+        now = timezone.now()
+        # 25 posts; two share a timestamp so the id tie-breaker matters
+        self.posts = []
+        for i in range(25):
+            post = Post.objects.create(title=f"Post number {i}", content="Body", author=self.user)
+            self.posts.append(post)
+        for i, post in enumerate(self.posts):
+            created = now - timedelta(minutes=25 - i)
+            if i == 13:
+                created = now - timedelta(minutes=25 - 12)
+            Post.objects.filter(pk=post.pk).update(created_at=created)
+        self.newest_first = sorted(
+            Post.objects.all(), key=lambda p: (p.created_at, p.id), reverse=True
+        )
+
+    def walk(self, url, params=None):
+        """Follow older_url links until the end, collecting every post."""
+        seen = []
+        response = self.client.get(url, params or {})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            seen.extend(response.context["posts"])
+            older_url = response.context["older_url"]
+            if not older_url:
+                return seen
+            response = self.client.get(older_url)
+
+    def test_first_page_is_limited(self):
+        response = self.client.get(reverse("post_list"))
+        self.assertEqual(len(response.context["posts"]), PostListView.paginate_by)
+        self.assertIsNone(response.context["newer_url"])
+        self.assertIsNotNone(response.context["older_url"])
+
+    def test_walk_visits_every_post_once_in_order(self):
+        self.assertEqual(self.walk(reverse("post_list")), self.newest_first)
+
+    def test_newer_cursor_returns_previous_page(self):
+        first = self.client.get(reverse("post_list"))
+        second = self.client.get(first.context["older_url"])
+        back = self.client.get(second.context["newer_url"])
+        self.assertEqual(list(back.context["posts"]), list(first.context["posts"]))
+        self.assertIsNone(back.context["newer_url"])
+
+    def test_link_header(self):
+        first = self.client.get(reverse("post_list"))
+        self.assertIn('rel="next"', first["Link"])
+        self.assertNotIn('rel="prev"', first["Link"])
+        second = self.client.get(first.context["older_url"])
+        self.assertIn('rel="prev"', second["Link"])
+
+    def test_no_count_or_offset_queries(self):
+        first = self.client.get(reverse("post_list"))
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(first.context["older_url"])
+        for query in ctx.captured_queries:
+            self.assertNotIn("COUNT(", query["sql"].upper())
+            self.assertNotIn("OFFSET", query["sql"].upper())
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(reverse("post_list"), {"older": "not-a-cursor"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_mistyped_cursor_values_return_404(self):
+        created = self.newest_first[5].created_at.isoformat()
+        for url, params, values in [
+            (reverse("post_list"), {}, [created, "x"]),
+            (reverse("post_list"), {}, [created, 1.5]),
+            (reverse("post_list"), {}, [1, 1]),
+            (reverse("post_list"), {}, ["yesterday", 1]),
+            (reverse("post_list"), {"sort": "popular"}, ["abc", 1]),
+            (reverse("post_list"), {"sort": "popular"}, [[1], 1]),
+            (reverse("post_list"), {"sort": "popular"}, [None, 1]),
+            (reverse("tag_list"), {}, [1, "x"]),
+            (reverse("tag_list"), {}, ["x", 1]),
+        ]:
+            for param in ("older", "newer"):
+                response = self.client.get(url, {**params, param: encode_cursor(values)})
+                self.assertEqual(response.status_code, 404, (url, params, values, param))
+
+    def test_search_results_keep_query_across_pages(self):
+        results = self.walk(reverse("post_search"), {"q": "number"})
+        self.assertCountEqual(results, self.posts)
@@ -0,0 +1,114 @@
+import math
+import time
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from blog.models import Post
+from blog.popularity import HOT_HALF_LIFE_HOURS, ViewBuffer, apply_views, hot_increment, view_buffer
+
+
+@override_settings(BLOG_BUFFER_VIEWS=True)
+class ViewCountTests(TestCase):
+    """
+    Tests for the buffered view counter, the hot score and the popular listing.
+    """
+
+    def setUp(self):
+        cache.clear()
+        view_buffer.drain()
+        self.user = User.objects.create_user(username="reader", password="password")
+        self.posts = [
+            Post.objects.create(title=f"Popular {i}", content="Body", author=self.user) for i in range(3)
+        ]
+
+    def test_buffer_is_due_after_threshold_or_interval(self):
+        buffer = ViewBuffer(interval=3600, threshold=3)
+        self.assertFalse(buffer.due())
+        buffer.record(1)
+        buffer.record(1)
+        self.assertFalse(buffer.due())
+        buffer.record(2)
+        self.assertTrue(buffer.due())
+
+        buffer.drain()
+        buffer.interval = 0
+        self.assertFalse(buffer.due())  # nothing buffered
+        buffer.record(1)
+        self.assertTrue(buffer.due())
+
+    def test_flush_is_one_update(self):
+        buffer = ViewBuffer()
+        for post, views in zip(self.posts, (5, 1, 3)):
+            for _ in range(views):
+                buffer.record(post.pk)
+        with self.assertNumQueries(3):  # the UPDATE, inside a savepoint
+            self.assertEqual(buffer.flush(), 3)
+        self.assertEqual(
+            [p.view_count for p in Post.objects.filter(pk__in=[p.pk for p in self.posts]).order_by("pk")],
+            [5, 1, 3],
+        )
+        self.assertEqual(buffer.flush(), 0)  # drained
+
+    def test_bad_id_costs_only_its_own_views(self):
+        buffer = ViewBuffer()
+        buffer.record(self.posts[0].pk)
+        buffer.record(10 ** 20)  # out of bigint range: the batched UPDATE fails
+        with self.assertLogs("blog.popularity", "ERROR"):
+            self.assertEqual(buffer.flush(), 1)
+        self.assertEqual(Post.objects.get(pk=self.posts[0].pk).view_count, 1)
+
+    @override_settings(BLOG_BUFFER_VIEWS=False)
+    def test_buffering_can_be_turned_off(self):
+        self.client.get(reverse("post_detail", args=[self.posts[0].pk]))
+        self.assertFalse(view_buffer.pending)
+
+    def test_missing_posts_are_not_buffered(self):
+        for pk in (self.posts[-1].pk + 1000, 10 ** 20):
+            self.assertEqual(self.client.get(reverse("post_detail", args=[pk])).status_code, 404)
+        self.assertFalse(view_buffer.pending)
+
+    def test_hot_score_adds_views_in_log_space(self):
+        now = time.time()
+        post = self.posts[0]
+        apply_views({post.pk: 5}, now)
+        apply_views({post.pk: 5}, now)
+        once = self.posts[1]
+        apply_views({once.pk: 10}, now)
+        post.refresh_from_db()
+        once.refresh_from_db()
+        self.assertEqual(post.view_count, 10)
+        self.assertAlmostEqual(post.hot_score, once.hot_score)
+
+    def test_old_views_decay(self):
+        now = time.time()
+        apply_views({self.posts[0].pk: 10}, now - 7 * 24 * 3600)  # ten views a week ago
+        apply_views({self.posts[1].pk: 3}, now)                  # three views today
+        ranked = Post.objects.filter(hot_score__isnull=False).order_by("-hot_score").values_list("pk", flat=True)
+        self.assertEqual(list(ranked), [self.posts[1].pk, self.posts[0].pk])
+        # A view one half-life newer weighs twice as much
+        self.assertAlmostEqual(
+            hot_increment(1, now + HOT_HALF_LIFE_HOURS * 3600) - hot_increment(1, now), math.log(2)
+        )
+
+    def test_detail_hits_are_buffered_not_written(self):
+        url = reverse("post_detail", args=[self.posts[0].pk])
+        self.client.get(url)
+        self.client.get(url)
+        self.assertEqual(view_buffer.pending[self.posts[0].pk], 2)
+        self.assertEqual(Post.objects.get(pk=self.posts[0].pk).view_count, 0)
+
+    def test_due_views_flushed_after_response(self):
+        self.addCleanup(setattr, view_buffer, "interval", view_buffer.interval)
+        view_buffer.interval = 0
+        self.client.get(reverse("post_detail", args=[self.posts[0].pk]))
+        self.assertEqual(Post.objects.get(pk=self.posts[0].pk).view_count, 1)
+        self.assertFalse(view_buffer.pending)
+
+    def test_popular_listing(self):
+        apply_views({self.posts[0].pk: 1, self.posts[2].pk: 20})
+        response = self.client.get(reverse("post_list"), {"sort": "popular"})
+        self.assertContains(response, "Popular This Week")
+        self.assertEqual([p.pk for p in response.context["posts"]], [self.posts[2].pk, self.posts[0].pk])
@@ -0,0 +1,70 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from blog.models import Comment, Post
+
+
+class QueryCountTests(TestCase):
+    """
+    List and detail pages must run a fixed number of queries,
+    however many posts, tags or comments they render.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.authors = [
+            User.objects.create_user(username=f"author{i}", password="password") for i in range(3)
+        ]
+
+    def make_posts(self, count):
+        posts = []
+        for i in range(count):
+            post = Post.objects.create(
+                title=f"Query post {i}",
+                content="Counting queries " * 50,
+                author=self.authors[i % len(self.authors)],
+            )
+            post.tags.add(f"tag{i}", "shared")
+            posts.append(post)
+        return posts
+
+    def add_comments(self, post, count):
+        for i in range(count):
+            Comment.objects.create(
+                post=post, author=self.authors[i % len(self.authors)], content=f"Comment number {i}"
+            )
+
+    def test_post_list_query_count_is_constant(self):
+        self.make_posts(2)
+        with self.assertNumQueries(3):  # ETag validators, posts with authors, prefetched tags
+            self.client.get(reverse("post_list"))
+        self.make_posts(8)
+        with self.assertNumQueries(3):
+            self.client.get(reverse("post_list"))
+
+    def test_search_query_count_is_constant(self):
+        self.make_posts(2)
+        with self.assertNumQueries(5):  # stemmed query, ranked ids, facet counts, posts with authors, tags
+            self.client.get(reverse("post_search"), {"q": "query"})
+        self.make_posts(8)
+        with self.assertNumQueries(4):  # new posts invalidated the cached ids; the stemmed query stays cached
+            self.client.get(reverse("post_search"), {"q": "query"})
+        with self.assertNumQueries(2):  # cached ids: posts with authors, tags
+            self.client.get(reverse("post_search"), {"q": "query"})
+
+    def test_post_detail_query_count_is_constant(self):
+        post = self.make_posts(1)[0]
+        self.add_comments(post, 1)
+        with self.assertNumQueries(5):  # ETag validators, post with author, tags, comments with authors, related posts
+            self.client.get(reverse("post_detail", args=[post.pk]))
+        self.add_comments(post, 10)
+        with self.assertNumQueries(5):
+            self.client.get(reverse("post_detail", args=[post.pk]))
+
+    def test_listing_defers_full_content(self):
+        self.make_posts(1)
+        post = Post.objects.for_listing().get()
+        self.assertIn("content", post.get_deferred_fields())
+        self.assertTrue(post.excerpt.startswith("Counting queries"))
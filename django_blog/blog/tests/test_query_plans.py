@@ -0,0 +1,262 @@
+import json
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test import RequestFactory, TestCase, tag
+from taggit.models import Tag, TaggedItem
+
+from blog.models import Comment, Post
+from blog.pagination import encode_cursor, keyset_filter
+from blog.search import search_posts, title_suggestions
+from blog.searchcache import SEARCH_CACHE_LIMIT
+from blog.views import (
+    COMMENTS_PER_PAGE, PostByTagListView, PostDetailView, PostListView, PostSearchListView,
+)
+
+
+# Synthetic dataset size: large enough that a sequential scan is never the
+# cheapest plan, small enough to seed in a few seconds
+POSTS = 20000
+COMMENTS_PER_POST = 3
+TAGS = 200
+TAGS_PER_POST = 3
+AUTHORS = 5
+# One long-running thread, so ordered comment pages beat fetch-and-sort
+HOT_POST_COMMENTS = 5000
+
+# Planner cost ceilings (arbitrary units, roughly page fetches). Each sits
+# a few times above the cost of the healthy index plan and far below the
+# cost of scanning the table, so a regression trips it.
+BUDGETS = {
+    "list": 100,
+    "list_deep": 150,
+    "list_active": 150,
+    "list_popular": 150,
+    "detail": 50,
+    "comments": 300,
+    "comments_deep": 500,
+    "tag_popular": 500,
+    "tag_rare": 4000,
+    "search": 1000,
+    "search_page": 100,
+    "suggest": 1000,
+}
+
+
+# Tables big enough that a sequential scan of them is always a regression
+LARGE_TABLES = {Post._meta.db_table, Comment._meta.db_table, TaggedItem._meta.db_table}
+
+
+def plan_nodes(plan):
+    """
+    Yield every node of an EXPLAIN (FORMAT JSON) plan tree, depth first.
+    """
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from plan_nodes(child)
+
+
+def table_indexes(table):
+    """
+    Names of every index on ``table``, unique ones and those named by
+    third-party migrations with generated hashes.
+    """
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, table)
+    return [name for name, info in constraints.items() if info["index"] or info["unique"]]
+
+
+def explain(queryset):
+    """
+    Return the root plan node the database picks for ``queryset``.
+    """
+    return json.loads(queryset.explain(format="json"))[0]["Plan"]
+
+
+@tag("plans")
+class QueryPlanTests(TestCase):
+    """
+    Guards the index plans of the blog's hot queries.
+
+    Seeds tens of thousands of rows with set-based SQL, refreshes planner
+    statistics, then checks the EXPLAIN (FORMAT JSON) output of each query
+    a page runs: the expected index must appear, no large table may be read
+    sequentially, and the estimated cost must stay within its budget.
+    Skip with ``manage.py test --exclude-tag plans``.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        authors = User.objects.bulk_create(
+            [User(username=f"planner{i}", password="!") for i in range(AUTHORS)]
+        )
+        author_ids = [author.pk for author in authors]
+        tags = Tag.objects.bulk_create([Tag(name=f"topic {i}", slug=f"topic-{i}") for i in range(TAGS)])
+        tag_ids = [t.pk for t in tags]
+        post_type = ContentType.objects.get_for_model(Post)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {Post._meta.db_table}
+                    (title, content, author_id, created_at, updated_at, rendered_html, excerpt,
+                     word_count, reading_time, comment_count, last_comment_at, view_count, hot_score, search_vector)
+                SELECT
+                    'Post ' || i || ' about topic ' || (i %% %(tags)s),
+                    repeat('Body text for plan checks. ', 20) || 'serial' || i,
+                    (%(authors)s)[1 + i %% %(author_count)s],
+                    now() - i * interval '1 hour',
+                    now() - i * interval '1 hour',
+                    '<p>Body</p>', 'Body text', 120, 1,
+                    %(comments)s,
+                    CASE WHEN i %% 10 = 0 THEN now() - i * interval '1 minute' END,
+                    0, CASE WHEN i %% 5 = 0 THEN (i * 7919 %% 1000) / 10.0 END,
+                    to_tsvector('english', 'Post ' || i || ' about topic ' || (i %% %(tags)s)
+                        || ' serial' || i || CASE WHEN i %% 500 = 0 THEN ' planner' ELSE '' END)
+                FROM generate_series(1, %(posts)s) AS i
+                """,
+                {
+                    "posts": POSTS, "tags": TAGS, "authors": author_ids,
+                    "author_count": AUTHORS, "comments": COMMENTS_PER_POST,
+                },
+            )
+            cls.post = Post.objects.order_by("-created_at")[POSTS // 2]
+            cursor.execute(
+                f"""
+                INSERT INTO {Comment._meta.db_table}
+                    (post_id, author_id, content, rendered_html, created_at, updated_at)
+                SELECT p.id, p.author_id, 'Comment ' || n, '<p>Comment</p>',
+                       p.created_at + n * interval '1 minute', p.created_at + n * interval '1 minute'
+                FROM {Post._meta.db_table} p, generate_series(1, %(per_post)s) AS n
+                """,
+                {"per_post": COMMENTS_PER_POST},
+            )
+            cursor.execute(
+                f"""
+                INSERT INTO {Comment._meta.db_table}
+                    (post_id, author_id, content, rendered_html, created_at, updated_at)
+                SELECT %(post)s, %(author)s, 'Reply ' || n, '<p>Reply</p>',
+                       now() - n * interval '1 second', now() - n * interval '1 second'
+                FROM generate_series(1, %(count)s) AS n
+                """,
+                {"post": cls.post.pk, "author": author_ids[0], "count": HOT_POST_COMMENTS},
+            )
+            # Tags spread evenly over the posts, except the first, which is on half of them
+            cursor.execute(
+                f"""
+                INSERT INTO {TaggedItem._meta.db_table} (content_type_id, object_id, tag_id)
+                SELECT DISTINCT %(ct)s, p.id, CASE
+                    WHEN n = 1 AND p.id %% 2 = 0 THEN (%(tag_ids)s)[1]
+                    ELSE (%(tag_ids)s)[1 + (p.id * 7919 + n * 104729) %% %(tag_count)s]
+                END
+                FROM {Post._meta.db_table} p, generate_series(1, %(per_post)s) AS n
+                """,
+                {"ct": post_type.pk, "tag_ids": tag_ids, "tag_count": TAGS, "per_post": TAGS_PER_POST},
+            )
+            for model in (Post, Comment, TaggedItem, Tag, User):
+                cursor.execute(f"ANALYZE {model._meta.db_table}")
+            # Move fresh entries out of the GIN pending list, as autovacuum would
+            for index in ("blog_post_search_gin", "blog_post_title_trgm"):
+                cursor.execute("SELECT gin_clean_pending_list(%s::regclass)", [index])
+
+        cls.common_tag, cls.rare_tag = tags[0], tags[TAGS // 2]
+        cls.factory = RequestFactory()
+
+    def view(self, view_class, params=None, **kwargs):
+        view = view_class()
+        view.setup(self.factory.get("/", params or {}), **kwargs)
+        return view
+
+    def page_queryset(self, view_class, params=None, **kwargs):
+        """
+        The sliced, ordered queryset a keyset-paginated ListView evaluates.
+        """
+        view = self.view(view_class, params, **kwargs)
+        return view.get_page_queryset(view.get_queryset(), view.paginate_by)
+
+    def assertPlan(self, queryset, budget, *indexes):
+        """
+        Fail unless the plan uses one of ``indexes``, reads none of the
+        ``LARGE_TABLES`` sequentially, and its total cost fits within
+        ``BUDGETS[budget]``.
+        """
+        plan = explain(queryset)
+        nodes = list(plan_nodes(plan))
+        dump = json.dumps(plan, indent=2)
+        used = {node["Index Name"] for node in nodes if "Index Name" in node}
+        self.assertTrue(used & set(indexes), f"{budget}: expected {indexes}, plan used {sorted(used)}\n{dump}")
+        seq_scans = {node["Relation Name"] for node in nodes if node["Node Type"] == "Seq Scan"} & LARGE_TABLES
+        self.assertFalse(seq_scans, f"{budget}: sequential scan of {sorted(seq_scans)}\n{dump}")
+        self.assertLessEqual(
+            plan["Total Cost"], BUDGETS[budget],
+            f"{budget}: cost {plan['Total Cost']} over budget {BUDGETS[budget]}\n{dump}",
+        )
+
+    def test_post_list_first_page(self):
+        self.assertPlan(self.page_queryset(PostListView), "list", "blog_post_created_id_idx")
+
+    def test_post_list_deep_page(self):
+        middle = Post.objects.order_by("-created_at")[POSTS // 2]
+        cursor = encode_cursor([middle.created_at, middle.pk])
+        self.assertPlan(
+            self.page_queryset(PostListView, {"older": cursor}), "list_deep", "blog_post_created_id_idx"
+        )
+
+    def test_post_list_recently_active(self):
+        self.assertPlan(
+            self.page_queryset(PostListView, {"sort": "active"}), "list_active", "blog_post_activity_idx"
+        )
+
+    def test_post_list_popular(self):
+        self.assertPlan(
+            self.page_queryset(PostListView, {"sort": "popular"}), "list_popular", "blog_post_hot_idx"
+        )
+
+    def test_post_detail(self):
+        queryset = self.view(PostDetailView, pk=self.post.pk).get_queryset().filter(pk=self.post.pk)
+        self.assertPlan(queryset, "detail", "blog_post_pkey")
+
+    def test_comment_block(self):
+        queryset = self.post.comments_for_display()[:COMMENTS_PER_PAGE]
+        self.assertPlan(queryset, "comments", "blog_comment_post_created_idx")
+
+    def test_comment_api_page(self):
+        first = self.post.comments_for_display().first()
+        queryset = (
+            self.post.comments_for_display()
+            .filter(keyset_filter(("created_at", "id"), (first.created_at, first.pk), older=False))
+            [:COMMENTS_PER_PAGE + 1]
+        )
+        self.assertPlan(queryset, "comments_deep", "blog_comment_post_created_idx")
+
+    def test_posts_by_popular_tag(self):
+        # Walk posts newest first, probing each one's tags by (content_type,
+        # object_id); a join through object_id::bigint can't probe and costs 50x
+        queryset = self.page_queryset(PostByTagListView, tag_slug=self.common_tag.slug)
+        self.assertPlan(queryset, "tag_popular", *table_indexes(TaggedItem._meta.db_table))
+
+    def test_posts_by_rare_tag(self):
+        # Walking posts newest first and fetching the tag's rows then
+        # sorting are both fine, through any of taggit's indexes
+        queryset = self.page_queryset(PostByTagListView, tag_slug=self.rare_tag.slug)
+        self.assertPlan(queryset, "tag_rare", *table_indexes(TaggedItem._meta.db_table))
+
+    def test_title_suggestions(self):
+        # The ILIKE and %> branches of the union each scan the trigram index
+        queryset = title_suggestions("19999 about", 8)
+        self.assertPlan(queryset, "suggest", "blog_post_title_trgm")
+        branches = explain(queryset)
+        while branches["Node Type"] != "Append":
+            (branches,) = branches["Plans"]
+        for branch in branches["Plans"]:
+            used = {node.get("Index Name") for node in plan_nodes(branch)}
+            self.assertIn("blog_post_title_trgm", used, json.dumps(branch, indent=2))
+
+    def test_search(self):
+        # A cache miss ranks the matches through the GIN index...
+        ranked = search_posts(Post.objects.order_by(), "planner").values_list("rank", "id")
+        self.assertPlan(ranked[:SEARCH_CACHE_LIMIT + 1], "search", "blog_post_search_gin")
+        # ...and each page then loads its posts by id
+        queryset = self.page_queryset(PostSearchListView, {"q": "planner"})
+        self.assertPlan(queryset, "search_page", "blog_post_pkey")
@@ -0,0 +1,93 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from blog.models import Post, RelatedPost
+from blog.related import refresh_related
+
+
+class RelatedPostsTests(TestCase):
+    """
+    Tests for the precomputed related-posts table.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="relator", password="password")
+
+    def make_post(self, title, *tags):
+        post = Post.objects.create(title=title, content="Body", author=self.user)
+        post.tags.add(*tags)
+        return post
+
+    def related_titles(self, post):
+        return list(
+            RelatedPost.objects.filter(post=post).order_by("-score").values_list("related__title", flat=True)
+        )
+
+    def test_scores_by_weighted_overlap(self):
+        source = self.make_post("Source", "django", "postgres", "common")
+        both = self.make_post("Both", "django", "postgres", "common")
+        niche = self.make_post("Niche", "postgres")
+        self.make_post("Common only", "common")
+        self.make_post("Unrelated", "cooking")
+        for i in range(4):
+            self.make_post(f"Filler {i}", "common")
+
+        refresh_related([source.pk, both.pk, niche.pk])
+        titles = self.related_titles(source)
+        self.assertEqual(titles[:2], ["Both", "Niche"])
+        self.assertNotIn("Unrelated", titles)
+        self.assertNotIn("Source", titles)
+
+    def test_tag_change_refreshes_affected_posts(self):
+        first = self.make_post("First", "alpha")
+        second = self.make_post("Second", "beta")
+        for i in range(3):
+            self.make_post(f"Sharing {i}", "alpha")
+        with self.captureOnCommitCallbacks(execute=True):
+            second.tags.add("alpha")
+        self.assertEqual(len(self.related_titles(second)), 4)
+        # Posts sharing the new tag pick up the retagged post
+        self.assertIn("Second", self.related_titles(first))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.tags.remove("alpha")
+        self.assertEqual(self.related_titles(second), [])
+        # ...and the posts that listed it drop it again
+        self.assertNotIn("Second", self.related_titles(first))
+
+    def test_tag_clear_refreshes_posts_listing_the_post(self):
+        first = self.make_post("First", "alpha")
+        second = self.make_post("Second", "alpha")
+        refresh_related([first.pk])
+        with self.captureOnCommitCallbacks(execute=True):
+            second.tags.clear()
+        self.assertEqual(self.related_titles(first), [])
+
+    @mock.patch("blog.related.FANOUT_LIMIT", 2)
+    def test_tag_change_fanout_is_capped(self):
+        sharing = [self.make_post(f"Sharing {i}", "alpha") for i in range(4)]
+        retagged = self.make_post("Retagged", "beta")
+        with self.captureOnCommitCallbacks(execute=True):
+            retagged.tags.add("alpha")
+        refreshed = set(RelatedPost.objects.values_list("post_id", flat=True))
+        # The retagged post plus the two newest posts sharing the tag
+        self.assertEqual(refreshed, {retagged.pk, sharing[3].pk, sharing[2].pk})
+
+    def test_rebuild_command(self):
+        first = self.make_post("First", "gamma")
+        self.make_post("Second", "gamma")
+        call_command("rebuild_related_posts", workers=1, batch_size=1, stdout=StringIO())
+        self.assertEqual(self.related_titles(first), ["Second"])
+
+    def test_detail_page_shows_related_posts(self):
+        first = self.make_post("First", "delta")
+        self.make_post("Second", "delta")
+        refresh_related([first.pk])
+        response = self.client.get(reverse("post_detail", args=[first.pk]))
+        self.assertContains(response, "Related posts")
+        self.assertEqual([e.related.title for e in response.context["related_posts"]], ["Second"])
@@ -0,0 +1,57 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from blog.models import Comment, Post
+
+
+class PreRenderedContentTests(TestCase):
+    """
+    Tests for the HTML, excerpt and reading-time fields computed at save time.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="renderer", password="password")
+        self.post = Post.objects.create(
+            title="Rendered Post",
+            content="First paragraph with <b>markup</b>.\n\nSecond paragraph.",
+            author=self.user,
+        )
+
+    def test_post_fields_computed_on_save(self):
+        self.assertEqual(
+            self.post.rendered_html,
+            "<p>First paragraph with &lt;b&gt;markup&lt;/b&gt;.</p>\n\n<p>Second paragraph.</p>",
+        )
+        self.assertEqual(self.post.word_count, 6)
+        self.assertEqual(self.post.reading_time, 1)
+
+    def test_excerpt_truncates_long_content(self):
+        self.post.content = "word " * 500
+        self.post.save()
+        self.assertEqual(self.post.excerpt, " ".join(["word"] * 30) + "…")
+        self.assertEqual(self.post.reading_time, 3)
+
+    def test_update_fields_includes_rendered_fields(self):
+        self.post.content = "Changed content"
+        self.post.save(update_fields=["content"])
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.rendered_html, "<p>Changed content</p>")
+
+    def test_comment_rendered_on_save(self):
+        comment = Comment.objects.create(post=self.post, author=self.user, content="Line one\nLine two")
+        self.assertEqual(comment.rendered_html, "<p>Line one<br>Line two</p>")
+
+    def test_backfill_command(self):
+        Post.objects.filter(pk=self.post.pk).update(rendered_html="", excerpt="", word_count=0)
+        call_command("render_content", batch_size=1, stdout=StringIO())
+        self.post.refresh_from_db()
+        self.assertIn("Second paragraph", self.post.rendered_html)
+        self.assertEqual(self.post.word_count, 6)
+
+    def test_detail_page_uses_rendered_html(self):
+        response = self.client.get(reverse("post_detail", args=[self.post.pk]))
+        self.assertContains(response, "<p>Second paragraph.</p>", html=False)
@@ -0,0 +1,111 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from blog import middleware
+from blog.middleware import PRIMARY_COOKIE
+from blog.models import Comment, Post
+from blog.routers import ReplicaRouter, begin_routing, end_routing
+
+
+@override_settings(BLOG_DB_REPLICAS=["replica1", "replica2"])
+class ReplicaRouterTests(TestCase):
+    """
+    Unit tests for ReplicaRouter's per-request decisions.
+    """
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def begin(self, **flags):
+        state, token = begin_routing()
+        self.addCleanup(end_routing, token)
+        for name, value in flags.items():
+            setattr(state, name, value)
+        return state
+
+    def test_outside_requests_everything_uses_primary(self):
+        self.assertEqual(self.router.db_for_read(Post), "default")
+
+    def test_replica_safe_reads_stick_to_one_replica(self):
+        self.begin(replica_reads=True)
+        chosen = {self.router.db_for_read(Post) for _ in range(10)}
+        self.assertEqual(len(chosen), 1)
+        self.assertIn(chosen.pop(), ["replica1", "replica2"])
+
+    def test_sessions_and_users_stay_on_primary(self):
+        self.begin(replica_reads=True)
+        self.assertEqual(self.router.db_for_read(Session), "default")
+        self.assertEqual(self.router.db_for_read(User), "default")
+
+    def test_views_without_opt_in_read_primary(self):
+        self.begin()
+        self.assertEqual(self.router.db_for_read(Post), "default")
+
+    def test_pinned_client_reads_primary(self):
+        self.begin(replica_reads=True, pinned=True)
+        self.assertEqual(self.router.db_for_read(Post), "default")
+
+    def test_write_switches_rest_of_request_to_primary(self):
+        state = self.begin(replica_reads=True)
+        self.assertEqual(self.router.db_for_write(Comment), "default")
+        self.assertTrue(state.wrote)
+        self.assertEqual(self.router.db_for_read(Post), "default")
+
+    def test_replicas_are_never_migrated(self):
+        self.assertFalse(self.router.allow_migrate("replica1", "blog"))
+        self.assertIsNone(self.router.allow_migrate("default", "blog"))
+
+
+# The primary stands in for the replica, so queries run; the routing state
+# shows which path each request took
+@override_settings(BLOG_DB_REPLICAS=["default"])
+class ReplicaRoutingMiddlewareTests(TestCase):
+    """
+    Tests for the middleware: which requests may use a replica, and the
+    read-your-writes cookie.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="writer", password="password")
+        self.post = Post.objects.create(title="Routed", content="Body", author=self.user)
+        self.states = []
+        real_begin = middleware.begin_routing
+
+        def capture(pinned=False):
+            state, token = real_begin(pinned)
+            self.states.append(state)
+            return state, token
+
+        patcher = mock.patch.object(middleware, "begin_routing", side_effect=capture)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_list_and_detail_reads_use_replica(self):
+        for url in (reverse("post_list"), reverse("post_detail", args=[self.post.pk])):
+            self.client.get(url)
+            state = self.states[-1]
+            self.assertTrue(state.replica_reads)
+            self.assertEqual(state.replica, "default")
+
+    def test_other_views_read_primary(self):
+        self.client.get(reverse("post_create"))
+        self.assertFalse(self.states[-1].replica_reads)
+
+    def test_comment_pins_writer_to_primary(self):
+        self.client.login(username="writer", password="password")
+        response = self.client.post(reverse("comment_create", args=[self.post.pk]), {"content": "Hi"})
+        self.assertTrue(self.states[-1].wrote)
+        self.assertIn(PRIMARY_COOKIE, response.cookies)
+
+        self.client.get(reverse("post_detail", args=[self.post.pk]))
+        state = self.states[-1]
+        self.assertTrue(state.pinned)
+        self.assertIsNone(state.replica)
+
+    def test_reads_do_not_pin(self):
+        response = self.client.get(reverse("post_list"))
+        self.assertNotIn(PRIMARY_COOKIE, response.cookies)
@@ -1,6 +1,11 @@
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import TestCase
+from django.urls import reverse
 from django.contrib.auth.models import User
 from blog.models import Post
+from blog.search import title_suggestions
 
 class PostSearchTests(TestCase):
     def setUp(self):
@@ -63,3 +68,119 @@ class PostSearchTests(TestCase):
         """
         results = Post.objects.filter(title__icontains="Nonexistent").distinct()
         self.assertEqual(results.count(), 0)
+
+
+class PostFullTextSearchViewTests(TestCase):
+    """
+    Tests for the ranked full-text search behind PostSearchListView.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="searcher", password="password")
+
+        self.title_match = Post.objects.create(
+            title="Django Tutorial",
+            content="Step by step guide.",
+            author=self.user,
+        )
+        self.content_match = Post.objects.create(
+            title="Weekly Notes",
+            content="This week I finally tried Django.",
+            author=self.user,
+        )
+        self.tag_match = Post.objects.create(
+            title="Framework Roundup",
+            content="A look at a few web frameworks.",
+            author=self.user,
+        )
+        self.tag_match.tags.add("django")
+        self.other = Post.objects.create(
+            title="Python Basics",
+            content="Introduction to Python programming.",
+            author=self.user,
+        )
+
+    def search(self, query):
+        response = self.client.get(reverse("post_search"), {"q": query})
+        self.assertEqual(response.status_code, 200)
+        return list(response.context["posts"])
+
+    def test_search_vector_is_stored_on_save(self):
+        self.title_match.refresh_from_db()
+        self.assertIsNotNone(self.title_match.search_vector)
+
+    def test_matches_title_content_and_tags(self):
+        results = self.search("django")
+        self.assertCountEqual(results, [self.title_match, self.content_match, self.tag_match])
+        self.assertNotIn(self.other, results)
+
+    def test_results_ranked_by_weight(self):
+        """Title matches (weight A) outrank tag (B) and content (C) matches."""
+        results = self.search("django")
+        self.assertEqual(results[0], self.title_match)
+        self.assertEqual(results[-1], self.content_match)
+
+    def test_tag_changes_update_search_vector(self):
+        self.other.tags.add("snakes")
+        self.assertIn(self.other, self.search("snakes"))
+        self.other.tags.remove("snakes")
+        self.assertNotIn(self.other, self.search("snakes"))
+
+    def test_tag_rename_updates_search_vector(self):
+        tag = self.tag_match.tags.get(name="django")
+        tag.name = "webframework"
+        tag.save()
+        self.assertEqual(self.search("webframework"), [self.tag_match])
+
+    def test_rebuild_command_backfills_vectors(self):
+        Post.objects.update(search_vector=None)
+        call_command("rebuild_search_vectors", batch_size=2, stdout=StringIO())
+        self.assertCountEqual(self.search("django"), [self.title_match, self.content_match, self.tag_match])
+
+    def test_stemming(self):
+        """Full-text search matches word stems, e.g. 'programs' → 'programming'."""
+        self.assertIn(self.other, self.search("programs"))
+
+    def test_empty_query_returns_all_posts(self):
+        self.assertEqual(len(self.search("")), 4)
+
+
+class SearchSuggestionTests(TestCase):
+    """
+    Tests for trigram-based fuzzy search and the autocomplete endpoint.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="typist", password="password")
+        self.post = Post.objects.create(
+            title="Deploying Django with Docker",
+            content="Containers all the way down.",
+            author=self.user,
+        )
+        self.post.tags.add("deployment")
+
+    def test_suggest_endpoint_matches_prefix(self):
+        response = self.client.get(reverse("post_search_suggest"), {"q": "Deplo"})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["titles"][0]["id"], self.post.id)
+        self.assertEqual(data["titles"][0]["url"], reverse("post_detail", args=[self.post.id]))
+        self.assertEqual(data["tags"][0]["name"], "deployment")
+
+    def test_suggest_endpoint_ignores_short_queries(self):
+        response = self.client.get(reverse("post_search_suggest"), {"q": "d"})
+        self.assertEqual(response.json(), {"query": "d", "titles": [], "tags": []})
+
+    def test_suggestions_match_the_bare_column(self):
+        """ILIKE on the column itself, which the trigram index can serve."""
+        sql = str(title_suggestions("50%_off", 8).query)
+        self.assertIn('"blog_post"."title" ILIKE', sql)
+        self.assertNotIn("UPPER", sql)
+        self.assertEqual([row["title"] for row in title_suggestions("DOCKER", 8)], [self.post.title])
+        self.assertEqual(list(title_suggestions("50%_off", 8)), [])
+
+    def test_search_falls_back_to_fuzzy_title_match(self):
+        """A misspelled query with no full-text hits still finds the post."""
+        response = self.client.get(reverse("post_search"), {"q": "Dockerr"})
+        self.assertTrue(response.context["fuzzy"])
+        self.assertIn(self.post, response.context["posts"])
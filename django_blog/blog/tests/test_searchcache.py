@@ -0,0 +1,105 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from blog.models import Post
+from blog.pagination import encode_cursor
+from blog.searchcache import fold, search_cache_metrics
+from blog.views import PostSearchListView
+
+
+class SearchCacheTests(TestCase):
+    """
+    Tests for the normalized search-result cache.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="searcher", password="password")
+        self.posts = [
+            Post.objects.create(title=f"Caching tests {i}", content="Notes on caching.", author=self.user)
+            for i in range(3)
+        ]
+
+    def search(self, query, **params):
+        return self.client.get(reverse("post_search"), {"q": query, **params})
+
+    def ids(self, response):
+        return [post.pk for post in response.context["posts"]]
+
+    def test_fold(self):
+        self.assertEqual(fold("  Caching\tTESTS \n"), "caching tests")
+
+    def test_word_forms_share_one_entry(self):
+        first = self.ids(self.search("Caching tests"))
+        with self.assertNumQueries(3):  # stemming the new wording, posts with authors by id, tags
+            second = self.ids(self.search("cached TEST"))
+        with self.assertNumQueries(2):  # the folded wording's stem is cached too
+            third = self.ids(self.search("  Cached   test "))
+        self.assertEqual(first, second)
+        self.assertEqual(first, third)
+        self.assertEqual(first, [post.pk for post in reversed(self.posts)])
+        metrics = search_cache_metrics()
+        self.assertEqual((metrics["hits"], metrics["misses"]), (2, 1))
+
+    def test_post_writes_invalidate(self):
+        self.search("caching")
+        post = Post.objects.create(title="More caching", content="Body", author=self.user)
+        self.assertIn(post.pk, self.ids(self.search("caching")))
+        post.delete()
+        self.assertNotIn(post.pk, self.ids(self.search("caching")))
+
+    def test_tag_changes_invalidate(self):
+        other = Post.objects.create(title="Unrelated", content="Body", author=self.user)
+        self.assertNotIn(other.pk, self.ids(self.search("memoization")))
+        other.tags.add("memoization")
+        self.assertEqual(self.ids(self.search("memoization")), [other.pk])
+
+    def test_fuzzy_results_are_cached(self):
+        first = self.ids(self.search("Cachingg"))
+        self.assertTrue(first)
+        with self.assertNumQueries(2):
+            response = self.search("cachingg")
+        self.assertTrue(response.context["fuzzy"])
+        self.assertEqual(self.ids(response), first)
+
+    @mock.patch("blog.searchcache.SEARCH_CACHE_LIMIT", 3)
+    @mock.patch.object(PostSearchListView, "paginate_by", 2)
+    def test_paging_past_cached_results_falls_back_to_database(self):
+        self.posts += [
+            Post.objects.create(title=f"Caching tests {i}", content="Notes on caching.", author=self.user)
+            for i in range(3, 7)
+        ]
+        expected = [post.pk for post in reversed(self.posts)]
+
+        pages, response = [], self.search("caching")
+        while True:
+            pages.append(self.ids(response))
+            if not response.context["older_url"]:
+                break
+            response = self.client.get(response.context["older_url"])
+        self.assertEqual(sum(pages, []), expected)
+
+        back = []
+        while response.context["newer_url"]:
+            response = self.client.get(response.context["newer_url"])
+            back.insert(0, self.ids(response))
+        self.assertEqual(back, pages[:-1])
+
+    def test_crafted_cursors_return_404(self):
+        self.search("caching")  # cache the results the cursors page through
+        for values in (["x", 1], [None, 1], [0.5, "1"], [0.5, 1.5], [True, 1]):
+            for param in ("older", "newer"):
+                response = self.search("caching", **{param: encode_cursor(values)})
+                self.assertEqual(response.status_code, 404, (values, param))
+
+    def test_metrics_endpoint_is_staff_only(self):
+        url = reverse("search_cache_metrics")
+        self.assertEqual(self.client.get(url).status_code, 302)
+        User.objects.create_user(username="ops", password="password", is_staff=True)
+        self.client.login(username="ops", password="password")
+        self.search("caching")
+        self.assertEqual(self.client.get(url).json()["misses"], 1)
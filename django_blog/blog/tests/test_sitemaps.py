@@ -0,0 +1,95 @@
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from blog import sitemaps
+from blog.models import Post
+
+
+class SitemapTests(TestCase):
+    """
+    Tests for the sharded, pre-generated sitemaps.
+    """
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        settings_override = override_settings(BLOG_SITEMAP_ROOT=self.root, BLOG_SITE_URL="https://blog.example")
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        shard_patch = mock.patch.object(sitemaps, "SHARD_SIZE", 2)
+        shard_patch.start()
+        self.addCleanup(shard_patch.stop)
+
+        self.user = User.objects.create_user(username="mapper", password="password")
+        self.posts = [
+            Post.objects.create(title=f"Mapped {i}", content="Body", author=self.user) for i in range(3)
+        ]
+        self.posts[0].tags.add("maps")
+
+    def shard_of(self, post):
+        return reverse("sitemap_section", args=["posts", sitemaps.shard_for(post.pk)])
+
+    def test_index_lists_every_shard(self):
+        response = self.client.get(reverse("sitemap_index"))
+        self.assertEqual(response["Content-Type"], "application/xml")
+        body = b"".join(response.streaming_content).decode()
+        for post in self.posts:
+            self.assertIn("https://blog.example" + self.shard_of(post), body)
+        self.assertIn("sitemap-tags-", body)
+
+    def test_shard_contains_its_posts_only(self):
+        post = self.posts[0]
+        body = b"".join(self.client.get(self.shard_of(post)).streaming_content).decode()
+        self.assertIn("https://blog.example" + post.get_absolute_url(), body)
+        for other in self.posts:
+            if sitemaps.shard_for(other.pk) != sitemaps.shard_for(post.pk):
+                self.assertNotIn(other.get_absolute_url(), body)
+
+    def test_shard_is_one_range_query_then_static(self):
+        url = self.shard_of(self.posts[-1])
+        with self.assertNumQueries(2):  # MAX(pk) for bounds + the range query
+            self.client.get(url)
+        with self.assertNumQueries(0):
+            b"".join(self.client.get(url).streaming_content)
+
+    def test_shard_beyond_last_id_404s(self):
+        url = reverse("sitemap_section", args=["posts", sitemaps.shard_for(self.posts[-1].pk) + 5])
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertEqual(self.client.get("/sitemap-nope-0.xml").status_code, 404)
+
+    def test_command_and_post_writes_update_only_their_shard(self):
+        call_command("generate_sitemaps", stdout=mock.Mock())
+        untouched = self.posts[0]
+        with mock.patch.object(sitemaps, "write_shard", wraps=sitemaps.write_shard) as write_shard:
+            with self.captureOnCommitCallbacks(execute=True):
+                new_post = Post.objects.create(title="Fresh", content="Body", author=self.user)
+        write_shard.assert_called_once_with("posts", sitemaps.shard_for(new_post.pk))
+
+        body = b"".join(self.client.get(self.shard_of(new_post)).streaming_content).decode()
+        self.assertIn(new_post.get_absolute_url(), body)
+        index = b"".join(self.client.get(reverse("sitemap_index")).streaming_content).decode()
+        self.assertIn(self.shard_of(new_post), index)
+        self.assertIn(self.shard_of(untouched), index)
+
+    def test_edits_rewrite_the_shard_only_when_lastmod_changes_day(self):
+        call_command("generate_sitemaps", stdout=mock.Mock())
+        post = Post.objects.get(pk=self.posts[1].pk)
+        with mock.patch.object(sitemaps, "write_shard") as write_shard:
+            with self.captureOnCommitCallbacks(execute=True):
+                post.title = "Retitled"
+                post.save()
+            write_shard.assert_not_called()
+
+            Post.objects.filter(pk=post.pk).update(updated_at=timezone.now() - timedelta(days=2))
+            post = Post.objects.get(pk=post.pk)
+            with self.captureOnCommitCallbacks(execute=True):
+                post.save()
+            write_shard.assert_called_once_with("posts", sitemaps.shard_for(post.pk))
@@ -0,0 +1,77 @@
+import gzip
+import os
+import shutil
+import tempfile
+from unittest import skipIf
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.templatetags.static import static
+from django.test import TestCase, override_settings
+
+from blog.middleware import IMMUTABLE_CACHE_CONTROL, accepted_encodings
+from blog.storage import brotli
+
+
+class StaticAssetTests(TestCase):
+    """
+    Tests for hashed, precompressed static files and how they are served.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.root)
+        cls.static_override = override_settings(STATIC_ROOT=cls.root)
+        cls.static_override.enable()
+        cls.addClassCleanup(cls.static_override.disable)
+        call_command("collectstatic", interactive=False, verbosity=0)
+        cls.css = staticfiles_storage.stored_name("css/styles.css")
+
+    def original(self, name):
+        with open(os.path.join(self.root, name), "rb") as f:
+            return f.read()
+
+    def test_names_are_hashed(self):
+        self.assertRegex(self.css, r"^css/styles\.[0-9a-f]{12}\.css$")
+        self.assertEqual(static("css/styles.css"), f"/static/{self.css}")
+
+    def test_text_assets_are_precompressed(self):
+        path = os.path.join(self.root, self.css)
+        with open(path + ".gz", "rb") as f:
+            self.assertEqual(gzip.decompress(f.read()), self.original(self.css))
+        self.assertEqual(os.path.exists(path + ".br"), brotli is not None)
+
+    def test_serves_gzip_variant_with_immutable_caching(self):
+        response = self.client.get(f"/static/{self.css}", HTTP_ACCEPT_ENCODING="gzip, deflate")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Content-Type"], "text/css")
+        self.assertEqual(response["Cache-Control"], IMMUTABLE_CACHE_CONTROL)
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(response["Content-Disposition"], f'inline; filename="{os.path.basename(self.css)}"')
+        self.assertEqual(gzip.decompress(b"".join(response.streaming_content)), self.original(self.css))
+
+    @skipIf(brotli is None, "brotli is not installed")
+    def test_prefers_brotli(self):
+        response = self.client.get(f"/static/{self.css}", HTTP_ACCEPT_ENCODING="gzip, br")
+        self.assertEqual(response["Content-Encoding"], "br")
+
+    def test_identity_without_accept_encoding(self):
+        response = self.client.get(f"/static/{self.css}")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(b"".join(response.streaming_content), self.original(self.css))
+
+    def test_unhashed_names_revalidate(self):
+        response = self.client.get("/static/css/styles.css")
+        self.assertEqual(response["Cache-Control"], "public, max-age=60")
+        again = self.client.get("/static/css/styles.css", HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+        self.assertEqual(again.status_code, 304)
+
+    def test_paths_outside_static_root_fall_through(self):
+        self.assertEqual(self.client.get("/static/../manage.py").status_code, 404)
+        self.assertEqual(self.client.get("/static/css/missing.css").status_code, 404)
+
+    def test_accepted_encodings(self):
+        self.assertEqual(accepted_encodings("gzip;q=0.5, br;q=0, identity"), {"gzip", "identity"})
+        self.assertEqual(accepted_encodings("*"), {"*", "br", "gzip"})
@@ -0,0 +1,94 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from taggit.models import Tag
+
+from blog.models import Post, TagStat
+from blog.tags import tag_cloud
+
+
+class TagStatsTests(TestCase):
+    """
+    Tests for the materialized tag statistics, tag listing and tag cloud.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="tagger", password="password")
+
+    def make_post(self, title, *tags):
+        post = Post.objects.create(title=title, content="Body", author=self.user)
+        post.tags.add(*tags)
+        return post
+
+    def count(self, name):
+        return TagStat.objects.get(tag__name=name).post_count
+
+    def test_counts_follow_add_remove_clear_and_delete(self):
+        first = self.make_post("First", "django", "python")
+        second = self.make_post("Second", "django")
+        self.assertEqual(self.count("django"), 2)
+        self.assertEqual(self.count("python"), 1)
+        self.assertIsNotNone(TagStat.objects.get(tag__name="django").last_used_at)
+
+        first.tags.remove("python")
+        self.assertEqual(self.count("python"), 0)
+        second.tags.clear()
+        self.assertEqual(self.count("django"), 1)
+        first.delete()
+        self.assertEqual(self.count("django"), 0)
+
+    def test_recount_command_matches_incremental_counts(self):
+        self.make_post("First", "django", "python")
+        self.make_post("Second", "django")
+        expected = dict(TagStat.objects.values_list("tag__name", "post_count"))
+        TagStat.objects.update(post_count=99)
+        call_command("recount_tags", stdout=StringIO())
+        self.assertEqual(dict(TagStat.objects.values_list("tag__name", "post_count")), expected)
+
+    def test_tag_cloud_weights(self):
+        for i in range(4):
+            self.make_post(f"Post {i}", "popular")
+        self.make_post("Rare", "rare")
+        cloud = tag_cloud()
+        self.assertEqual([stat.tag.name for stat in cloud], ["popular", "rare"])
+        self.assertEqual([stat.weight for stat in cloud], [5, 1])
+
+    def test_tag_listing_reads_only_stats(self):
+        self.make_post("First", "django", "python")
+        with self.assertNumQueries(2):  # page of stats with tags, tag cloud
+            response = self.client.get(reverse("tag_list"))
+        self.assertContains(response, reverse("posts_by_tag", args=["django"]))
+        self.assertContains(response, "tag-weight-")
+
+
+class PostByTagViewTests(TestCase):
+    """
+    Tests for the tag page, looked up by slug.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="tagger", password="password")
+        for i in range(12):
+            post = Post.objects.create(title=f"Tagged {i}", content="Body", author=self.user)
+            post.tags.add("Web Dev")
+        Post.objects.create(title="Untagged", content="Body", author=self.user)
+
+    def test_lookup_by_slug_and_paginate(self):
+        slug = Tag.objects.get(name="Web Dev").slug
+        response = self.client.get(reverse("posts_by_tag", args=[slug]))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Posts tagged "Web Dev"')
+        self.assertEqual(len(response.context["posts"]), 10)
+        self.assertNotContains(response, "Untagged")
+
+        response = self.client.get(response.context["older_url"])
+        self.assertEqual([p.title for p in response.context["posts"]], ["Tagged 1", "Tagged 0"])
+
+    def test_unknown_slug_404s(self):
+        self.assertEqual(self.client.get(reverse("posts_by_tag", args=["missing"])).status_code, 404)
@@ -1,32 +1,75 @@
+from django.conf import settings
 from django.urls import path
 from django.contrib.auth import views as auth_views
 
 from . import views  # keep this for register & profile
+from .feeds import (
+    AuthorPostsAtomFeed, AuthorPostsFeed, LatestPostsAtomFeed, LatestPostsFeed,
+    TagPostsAtomFeed, TagPostsFeed,
+)
 from .views import (
     PostListView, PostDetailView, PostCreateView,
-    PostUpdateView, PostDeleteView, PostsByTagListView, PostSearchListView,
-    CommentCreateView, CommentUpdateView, CommentDeleteView
+    PostUpdateView, PostDeleteView, PostByTagListView, PostSearchListView, TagListView,
+    MonthArchiveView, AuthorArchiveView,
+    CommentCreateView, CommentUpdateView, CommentDeleteView,
+    AsyncPostListView, AsyncPostDetailView, AsyncPostSearchListView,
 )
 
+# Under ASGI (settings.BLOG_ASYNC_VIEWS) the read path uses the async-ORM views
+if settings.BLOG_ASYNC_VIEWS:
+    post_list_view = AsyncPostListView.as_view()
+    post_detail_view = AsyncPostDetailView.as_view()
+    post_search_view = AsyncPostSearchListView.as_view()
+else:
+    post_list_view = PostListView.as_view()
+    post_detail_view = PostDetailView.as_view()
+    post_search_view = PostSearchListView.as_view()
+
 urlpatterns = [
     # -------------------------
     # Blog Post URLs
     # -------------------------
 
-    # Homepage showing all posts
-    path('', PostListView.as_view(), name='home'),
+    # Front page, precomputed into one cache entry
+    path('', views.home, name='home'),
 
     # Post list
-    path('posts/', PostListView.as_view(), name='post_list'),
-    path('posts/', PostListView.as_view(), name='posts'),
+    path('posts/', post_list_view, name='post_list'),
+    path('posts/', post_list_view, name='posts'),
 
     # Tag and search urls
+    path("tags/", TagListView.as_view(), name="tag_list"),
     path("tags/<slug:tag_slug>/", PostByTagListView.as_view(), name="posts_by_tag"),
-    path("search/", PostSearchListView.as_view(), name="post_search"),
+    path("search/", post_search_view, name="post_search"),
+
+    # Archives by month and by author
+    path("archive/<int:year>/<int:month>/", MonthArchiveView.as_view(), name="archive_month"),
+    path("authors/<str:username>/", AuthorArchiveView.as_view(), name="author_archive"),
+    path("authors/<str:username>/<int:year>/<int:month>/", AuthorArchiveView.as_view(), name="author_archive_month"),
+    path("search/suggest/", views.search_suggestions, name="post_search_suggest"),
+
+    # Sitemaps (pre-generated files, sharded by primary-key range)
+    path("sitemap.xml", views.sitemap_index, name="sitemap_index"),
+    path("sitemap-<slug:section>-<int:shard>.xml", views.sitemap_section, name="sitemap_section"),
+
+    # Staff-only streaming export (JSONL / CSV, optionally gzipped)
+    path("export/<slug:dataset>/", views.export_dataset, name="export_dataset"),
+    # Staff-only database connection pool metrics (JSON)
+    path("metrics/db-pool/", views.db_pool_metrics, name="db_pool_metrics"),
+    # Staff-only search-result cache hit / miss counters (JSON)
+    path("metrics/search-cache/", views.search_cache_metrics, name="search_cache_metrics"),
+
+    # RSS / Atom feeds
+    path("feeds/rss/", LatestPostsFeed(), name="post_feed_rss"),
+    path("feeds/atom/", LatestPostsAtomFeed(), name="post_feed_atom"),
+    path("tags/<slug:tag_slug>/feed/rss/", TagPostsFeed(), name="tag_feed_rss"),
+    path("tags/<slug:tag_slug>/feed/atom/", TagPostsAtomFeed(), name="tag_feed_atom"),
+    path("authors/<str:username>/feed/rss/", AuthorPostsFeed(), name="author_feed_rss"),
+    path("authors/<str:username>/feed/atom/", AuthorPostsAtomFeed(), name="author_feed_atom"),
 
 
     # Post detail view
-    path('post/<int:pk>/', PostDetailView.as_view(), name='post_detail'),
+    path('post/<int:pk>/', post_detail_view, name='post_detail'),
 
     # Create a new post (login required)
     path('post/new/', PostCreateView.as_view(), name='post_create'),
@@ -40,6 +83,9 @@ urlpatterns = [
     # -------------------------
     # Comment URLs (Class-Based Views)
     # -------------------------
+    # Paginated comments for a post (JSON, used by "Load more comments")
+    path("post/<int:pk>/comments/", views.comment_list_api, name="comment_list_api"),
+
     # Create a new comment on a post
 path(
     "post/<int:pk>/comments/new/",
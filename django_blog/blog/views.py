@@ -1,19 +1,37 @@
-from django.db.models import Q
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
+from django.contrib.admin.views.decorators import staff_member_required
 from django.utils.decorators import method_decorator
 from django.contrib import messages
+from django.db import transaction
 from django.contrib.auth.models import User
 from django import forms
-from django.http import HttpResponse
-from django.urls import reverse_lazy
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.urls import reverse, reverse_lazy
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
 
-from .models import Post, Comment
+from .models import Post, Comment, RelatedPost, TagStat
 from taggit.models import Tag
 from .forms import PostForm, CommentForm
+from .archive import archive_months, month_bounds
+from .dbpool import pool_metrics
+from .frontpage import front_page
+from .cache import attach_card_versions, comments_version
+from .conditional import (
+    AsyncPostDetailConditionalMixin, AsyncPostListConditionalMixin,
+    PostDetailConditionalMixin, PostListConditionalMixin,
+)
+from .popularity import view_buffer
+from .pagination import AsyncKeysetListMixin, KeysetPaginationMixin, keyset_slice
+from .related import RELATED_POSTS
+from .export import DATASETS, FORMATS, export_chunks
+from .facets import narrow, selected_facets
+from .search import fuzzy_search_posts, search_posts, suggest
+from .tags import tag_cloud
+from . import searchcache, sitemaps
 
 
 # --- Create a Profile Form ---
@@ -48,7 +66,11 @@ def profile(request):
     return render(request, "blog/profile.html", {"form": form})
 
 def home(request):
-    return render(request, "blog/home.html")
+    """
+    The front page, rendered from one precomputed cache entry (see
+    blog.frontpage): a single cache read and no queries per request.
+    """
+    return render(request, "blog/home.html", front_page())
 
 def post_list(request):
     posts = Post.objects.all().order_by("-published_date")  # fetch all posts
@@ -65,47 +87,187 @@ def register(request):
         form = UserCreationForm()
     return render(request, "blog/register.html", {"form": form})
 
+# Comments embedded in the post detail page; the rest load via comment_list_api
+COMMENTS_PER_PAGE = 20
+# Upper bound for ?limit= on the comments API
+MAX_COMMENTS_PER_PAGE = 100
+
+
 # List all blog posts
-class PostListView(ListView):
+class PostListView(PostListConditionalMixin, KeysetPaginationMixin, ListView):
     """
-    Displays a list of all blog posts.
+    Displays a list of all blog posts, newest first, one cursor page at a time.
+
+    `?sort=active` lists recently discussed posts instead, ordered by
+    the denormalized `last_comment_at` column; `?sort=popular` lists the
+    most viewed posts by decayed `hot_score`.
     """
     model = Post
     template_name = 'blog/post_list.html'  # Custom template
     context_object_name = 'posts'
-    ordering = ['-created_at']  # Newest posts first
+    replica_reads = True  # Read-only: blog.routers may send its queries to a replica
+    ordering = ['-created_at', '-id']  # Newest posts first
+
+    def get_queryset(self):
+        self.sort = self.request.GET.get("sort", "")
+        qs = Post.objects.for_listing()
+        if self.sort == "active":
+            return qs.filter(last_comment_at__isnull=False)
+        if self.sort == "popular":
+            return qs.filter(hot_score__isnull=False)
+        return qs.order_by(*self.ordering)
+
+    def get_cursor_fields(self):
+        if self.sort == "active":
+            return ("last_comment_at", "id")
+        if self.sort == "popular":
+            return ("hot_score", "id")
+        return self.cursor_fields
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["sort"] = self.sort
+        attach_card_versions(context["posts"])
+        return context
 
 # Display details of a single blog post
-class PostDetailView(DetailView):
+class PostDetailView(PostDetailConditionalMixin, DetailView):
     """
     Displays details of a single blog post.
+
+    Sends an ETag and answers revalidation with 304
+    before any template rendering. Every hit (304s included) is counted in
+    the in-process view buffer, which is flushed in batches after responses.
     """
     model = Post
     template_name = 'blog/post_detail.html'
     context_object_name = 'post'
+    replica_reads = True
+
+    def get(self, request, *args, **kwargs):
+        response = super().get(request, *args, **kwargs)
+        # Reached only for a post that exists (a missing one raises Http404)
+        view_buffer.record(self.kwargs["pk"])
+        return response
+
+    def get_queryset(self):
+        # Author, tags and comment authors in a fixed number of queries
+        return Post.objects.for_detail()
 
     def get_context_data(self, **kwargs):
         # Get default context from DetailView
         context = super().get_context_data(**kwargs)
         # Add a fresh comment form
         context['comment_form'] = CommentForm()
+        # First page of comments; loads only if its cached fragment is missing
+        context['comments'] = self.object.comments_for_display()[:COMMENTS_PER_PAGE]
+        context['has_more_comments'] = self.object.comment_count > COMMENTS_PER_PAGE
+        context['comments_version'] = comments_version(self.object.pk)
+        # Precomputed related posts: one query on the (post, -score) index
+        context['related_posts'] = (
+            RelatedPost.objects.filter(post=self.object)
+            .select_related('related')
+            .only('score', 'related__title', 'related__created_at')
+            .order_by('-score')[:RELATED_POSTS]
+        )
         return context
     
-class PostByTagListView(ListView):
+class PostByTagListView(PostListConditionalMixin, KeysetPaginationMixin, ListView):
     """
-    View to list posts filtered by a specific tag.
+    View to list posts filtered by a specific tag, newest first.
     """
     model = Post
     template_name = "blog/post_list.html"
     context_object_name = "posts"
+    replica_reads = True
 
     def get_queryset(self):
-        self.tag = Tag.objects.get(name=self.kwargs["tag_name"])
-        return Post.objects.filter(tags=self.tag)
+        # Slug is unique (and indexed) on taggit's Tag
+        self.tag = get_object_or_404(Tag, slug=self.kwargs["tag_slug"])
+        return Post.objects.for_listing().tagged(self.tag)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["tag"] = self.tag
+        attach_card_versions(context["posts"])
+        return context
+
+class MonthArchiveView(KeysetPaginationMixin, ListView):
+    """
+    Posts from one calendar month, newest first, with the archive sidebar.
+
+    The month is a ``created_at`` range on the (created_at, id) index; the
+    sidebar reads the MonthlyPostCount rollup instead of grouping posts.
+    """
+    model = Post
+    template_name = "blog/post_list.html"
+    context_object_name = "posts"
+
+    def get_month_range(self):
+        if "year" not in self.kwargs:
+            return None
+        try:
+            return month_bounds(self.kwargs["year"], self.kwargs["month"])
+        except ValueError:
+            raise Http404("Invalid archive month.")
+
+    def get_queryset(self):
+        self.month_range = self.get_month_range()
+        qs = Post.objects.for_listing()
+        if self.month_range:
+            qs = qs.filter(created_at__gte=self.month_range[0], created_at__lt=self.month_range[1])
+        return qs
+
+    def get_archive_author(self):
+        return None
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        author = self.get_archive_author()
+        title = f"Posts by {author.username}" if author else "Archive"
+        if self.month_range:
+            title += self.month_range[0].strftime(" — %B %Y")
+        context["archive_title"] = title
+        context["archive_author"] = author
+        context["archive_months"] = archive_months(author)
+        attach_card_versions(context["posts"])
+        return context
+
+
+class AuthorArchiveView(MonthArchiveView):
+    """
+    One author's posts, optionally limited to a month, on the
+    (author, created_at, id) index.
+    """
+
+    def get_archive_author(self):
+        if not hasattr(self, "author"):
+            self.author = get_object_or_404(User, username=self.kwargs["username"])
+        return self.author
+
+    def get_queryset(self):
+        return super().get_queryset().filter(author=self.get_archive_author())
+
+
+class TagListView(KeysetPaginationMixin, ListView):
+    """
+    All tags, most used first, with the tag cloud on top.
+
+    Reads only the TagStat counters, so neither the listing nor the cloud
+    aggregates over tagged items.
+    """
+    template_name = "blog/tag_list.html"
+    context_object_name = "tag_stats"
+    replica_reads = True
+    paginate_by = 50
+    cursor_fields = ("post_count", "tag_id")
+
+    def get_queryset(self):
+        return TagStat.objects.filter(post_count__gt=0).select_related("tag")
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["tag_cloud"] = tag_cloud()
         return context
 
 # Create a new blog post (authenticated users only)
@@ -205,15 +367,59 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
 
     def form_valid(self, form):
         form.instance.author = self.request.user
-        post_id = self.kwargs.get("post_id")
+        post_id = self.kwargs.get("pk")
         form.instance.post = get_object_or_404(Post, pk=post_id)
-        return super().form_valid(form)
+        # Insert the comment and bump Post.comment_count together
+        with transaction.atomic():
+            return super().form_valid(form)
 
 
     def get_success_url(self):
         return reverse_lazy("post_detail", kwargs={"pk": self.object.post.pk})
 
 
+def comment_list_api(request, pk):
+    """
+    JSON page of a post's comments, oldest first.
+
+    GET /post/<pk>/comments/?after=<cursor>&limit=<n>
+    Pages are addressed by (created_at, id) cursor and read from the
+    (post_id, created_at, id) index, so any page costs the same.
+    """
+    try:
+        limit = min(int(request.GET.get("limit", COMMENTS_PER_PAGE)), MAX_COMMENTS_PER_PAGE)
+    except ValueError:
+        limit = COMMENTS_PER_PAGE
+    limit = max(limit, 1)
+
+    post = get_object_or_404(Post.objects.only("pk"), pk=pk)
+    try:
+        comments, next_cursor = keyset_slice(
+            post.comments_for_display(), ("created_at", "id"), request.GET.get("after"), limit
+        )
+    except (ValueError, TypeError):
+        raise Http404("Invalid page cursor.")
+
+    next_url = None
+    if next_cursor:
+        next_url = f"{reverse('comment_list_api', args=[pk])}?after={next_cursor}&limit={limit}"
+    data = [
+        {
+            "id": comment.id,
+            "author": comment.author.username,
+            "content": comment.content,
+            "html": comment.rendered_html,
+            "created_at": comment.created_at.isoformat(),
+            "updated_at": comment.updated_at.isoformat(),
+            "can_edit": request.user == comment.author,
+            "update_url": reverse("comment_update", args=[comment.id]),
+            "delete_url": reverse("comment_delete", args=[comment.id]),
+        }
+        for comment in comments
+    ]
+    return JsonResponse({"comments": data, "next": next_url})
+
+
 class CommentUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
     model = Comment
     form_class = CommentForm
@@ -235,54 +441,95 @@ class CommentDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
         comment = self.get_object()
         return self.request.user == comment.author
 
+    def form_valid(self, form):
+        # Delete the comment and decrement Post.comment_count together
+        with transaction.atomic():
+            return super().form_valid(form)
+
     def get_success_url(self):
         return reverse_lazy("post_detail", kwargs={"pk": self.object.post.pk})
 
-class PostSearchListView(ListView):
+class PostSearchListView(KeysetPaginationMixin, ListView):
     """
     Displays a list of blog posts filtered by a search query.
 
-    This view extends Django's generic ListView to provide search functionality
-    across multiple fields in the Post model. It allows users to search posts
-    by title, content, or tags using a query string (`q`) passed through the URL.
+    This view extends Django's generic ListView to provide PostgreSQL full-text
+    search over the Post model. It matches the query string (`q`) passed through
+    the URL against each post's stored search vector (title, tags and content,
+    weighted in that order) and ranks the results by relevance.
 
     Features:
-        - Retrieves all posts if no search query is provided.
-        - Filters posts dynamically when a search query exists.
-        - Matches posts whose title, content, or tag names contain the query text.
-        - Removes duplicates with `.distinct()` to handle posts with multiple tags.
+        - Retrieves all posts (newest first) if no search query is provided.
+        - Parses the query with websearch syntax ("quoted phrases", OR, -exclude).
+        - Uses the GIN-indexed `search_vector` column, so there is no sequential
+          scan, tag join or `.distinct()` on each search.
+        - Orders matches by `SearchRank`, then by id.
+        - Caches the ranked ids of each query under its normalized (folded,
+          stemmed) form and the corpus version, so a repeated search only
+          loads the page's posts by id (see blog.searchcache).
+        - Narrows results by `?tag=<slug>` (repeatable) and `?year=<yyyy>`
+          facets inside the same ranking query, and shows tag and year counts
+          for the results, computed together in one grouped query.
+        - Paginates with (rank, id) cursors for searches and (created_at, id)
+          cursors otherwise, so deep pages never use OFFSET.
         - Passes the search query back to the template for display in the search bar.
 
     Template:
         Expects a template located at: blog/post_search.html
 
     Context:
-        posts (QuerySet): List of filtered Post objects.
+        posts (QuerySet): List of matching Post objects (annotated with `rank`).
         query (str): The search term entered by the user.
+        facets (dict): Tag and year counts, each entry with a `url` toggling it.
     """
 
     model = Post
     template_name = "blog/post_search.html"  # The template for rendering results
     context_object_name = "posts"  # Name of the queryset in the template
+    replica_reads = True
 
     def get_queryset(self):
         """
-        Overrides ListView's get_queryset to apply search filtering.
+        Overrides ListView's get_queryset to apply full-text search.
 
         Retrieves the search query parameter (`q`) from the GET request.
-        If `q` exists, filters posts by title, content, or tag names.
+        If `q` exists, returns ranked matches from the search index.
         Otherwise, returns all posts.
         """
-        query = self.request.GET.get("q")
-        qs = Post.objects.all()
+        query = self.request.GET.get("q", "").strip()
+        self.tags, self.year = selected_facets(self.request.GET)
+        self.results = searchcache.cached_search(query, self.tags, self.year) if query else None
+        return self.search_queryset(query)
+
+    def search_queryset(self, query):
+        qs = narrow(Post.objects.for_listing(), self.tags, self.year).order_by("-created_at", "-id")
+        self.query = query
+        # No exact keyword hits: the results are typo-tolerant title matches
+        self.fuzzy = self.results is not None and self.results.fuzzy
         if query:
-            qs = qs.filter(
-                Q(title__icontains=query) |
-                Q(content__icontains=query) |
-                Q(tags__name__icontains=query)
-            ).distinct()
+            qs = fuzzy_search_posts(qs, query) if self.fuzzy else search_posts(qs, query)
         return qs
 
+    def get_page_queryset(self, queryset, page_size):
+        """
+        Load a page of cached results by id, unless it lies past the
+        cached part of a long result list.
+        """
+        if self.results is not None:
+            values, older = self.get_cursor(Post)
+            page = self.results.page_queryset(Post.objects.for_listing(), page_size, values, older)
+            if page is not None:
+                return page
+        return super().get_page_queryset(queryset, page_size)
+
+    def get_cursor_fields(self):
+        """
+        Page by relevance when searching, by recency when listing everything.
+        """
+        if not self.query:
+            return self.cursor_fields
+        return ("similarity", "id") if self.fuzzy else ("rank", "id")
+
     def get_context_data(self, **kwargs):
         """
         Adds the search query string to the template context.
@@ -292,5 +539,215 @@ class PostSearchListView(ListView):
         """
         context = super().get_context_data(**kwargs)
         context["query"] = self.request.GET.get("q", "")
+        context["fuzzy"] = self.fuzzy
+        context["selected_tags"] = [
+            {"slug": slug, "url": self.facet_url([tag for tag in self.tags if tag != slug], self.year)}
+            for slug in self.tags
+        ]
+        context["selected_year"] = self.year
+        context["clear_year_url"] = self.facet_url(self.tags, None)
+        context["facets"] = self.facet_links()
+        attach_card_versions(context["posts"])
         return context
 
+    def facet_url(self, tags, year):
+        """
+        This search with a different facet selection, from its first page.
+        """
+        query = self.request.GET.copy()
+        for param in ("older", "newer", "tag", "year"):
+            query.pop(param, None)
+        query.setlist("tag", sorted(tags))
+        if year is not None:
+            query["year"] = year
+        return f"{self.request.path}?{query.urlencode()}"
+
+    def facet_links(self):
+        """
+        The facet counts, each with the URL that toggles it in the selection.
+        """
+        if self.results is None:
+            return {"tags": [], "years": []}
+        facets = self.results.facets
+        tags = [
+            {
+                **tag,
+                "selected": tag["slug"] in self.tags,
+                "url": self.facet_url(set(self.tags) ^ {tag["slug"]}, self.year),
+            }
+            for tag in facets["tags"]
+        ]
+        years = [
+            {
+                **bucket,
+                "selected": bucket["year"] == self.year,
+                "url": self.facet_url(self.tags, None if bucket["year"] == self.year else bucket["year"]),
+            }
+            for bucket in facets["years"]
+        ]
+        return {"tags": tags, "years": years}
+
+
+# --- Async (ASGI) read path ---
+# Same templates and context as the views above, but every query goes through
+# the async ORM, so under ASGI a slow client never holds a worker thread.
+# blog/urls.py routes to these when settings.BLOG_ASYNC_VIEWS is set.
+
+class AsyncReadViewMixin:
+    """
+    Resolve ``request.user`` with the async auth API before the handler runs,
+    so ETag code and templates can read it without a synchronous session query.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        request.user = await request.auser()
+        return await super().dispatch(request, *args, **kwargs)
+
+
+class AsyncPostListView(AsyncReadViewMixin, AsyncPostListConditionalMixin, AsyncKeysetListMixin, PostListView):
+    """
+    Async PostListView.
+    """
+
+
+class AsyncPostDetailMixin:
+    async def get(self, request, *args, **kwargs):
+        try:
+            self.object = await self.get_queryset().aget(pk=self.kwargs["pk"])
+        except Post.DoesNotExist:
+            raise Http404("No post found matching the query")
+        context = self.get_context_data(object=self.object)
+        # Templates cannot run lazy queries here, so always load the first
+        # comments page: the fragment may expire between a cache check and
+        # the render, which would then query from async code
+        context["comments"] = [comment async for comment in context["comments"]]
+        context["related_posts"] = [entry async for entry in context["related_posts"]]
+        return self.render_to_response(context)
+
+
+class AsyncPostDetailView(AsyncReadViewMixin, AsyncPostDetailConditionalMixin, AsyncPostDetailMixin, PostDetailView):
+    """
+    Async PostDetailView.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        response = await super().get(request, *args, **kwargs)
+        view_buffer.record(self.kwargs["pk"])
+        return response
+
+
+class AsyncPostSearchListView(AsyncReadViewMixin, AsyncKeysetListMixin, PostSearchListView):
+    """
+    Async PostSearchListView.
+    """
+
+    async def aget_queryset(self):
+        query = self.request.GET.get("q", "").strip()
+        self.tags, self.year = selected_facets(self.request.GET)
+        # The stemming and facet queries are raw SQL, which has no async API
+        search = sync_to_async(searchcache.cached_search)
+        self.results = await search(query, self.tags, self.year) if query else None
+        return self.search_queryset(query)
+
+
+def search_suggestions(request):
+    """
+    JSON type-ahead endpoint for the navbar search box.
+
+    GET /search/suggest/?q=<prefix>&limit=<n>
+    Returns the closest post titles and tags; queries shorter than
+    two characters return empty lists without touching the database.
+    """
+    prefix = request.GET.get("q", "").strip()
+    try:
+        limit = int(request.GET.get("limit", 8))
+    except ValueError:
+        limit = 8
+
+    if len(prefix) < 2:
+        return JsonResponse({"query": prefix, "titles": [], "tags": []})
+
+    results = suggest(prefix, limit)
+    titles = [
+        {"id": p["id"], "title": p["title"], "url": reverse("post_detail", args=[p["id"]])}
+        for p in results["titles"]
+    ]
+    tags = [
+        {"name": t["name"], "slug": t["slug"], "url": reverse("posts_by_tag", args=[t["slug"]])}
+        for t in results["tags"]
+    ]
+    return JsonResponse({"query": prefix, "titles": titles, "tags": tags})
+
+
+def _serve_sitemap(path):
+    return FileResponse(open(path, "rb"), content_type="application/xml")
+
+
+def sitemap_index(request):
+    """
+    Serve the pre-generated ``sitemap.xml``.
+
+    Files are written by ``manage.py generate_sitemaps`` and kept current by
+    signal handlers; a missing index is rebuilt from two ``MAX(pk)`` probes.
+    """
+    path = sitemaps.sitemap_root() / sitemaps.INDEX_FILENAME
+    if not path.exists():
+        path = sitemaps.write_index()
+    return _serve_sitemap(path)
+
+
+def sitemap_section(request, section, shard):
+    """
+    Serve one pre-generated child sitemap, building it on first request
+    with a single primary-key range query.
+    """
+    if section not in sitemaps.SECTIONS:
+        raise Http404("Unknown sitemap section.")
+    path = sitemaps.sitemap_root() / sitemaps.shard_filename(section, shard)
+    if not path.exists():
+        if shard >= sitemaps.shard_count(section):
+            raise Http404("No such sitemap shard.")
+        path = sitemaps.write_shard(section, shard)
+    return _serve_sitemap(path)
+
+
+@staff_member_required
+def export_dataset(request, dataset):
+    """
+    Staff-only download of the blog corpus.
+
+    GET /export/<posts|comments|tags>/?format=jsonl|csv&gzip=1
+    The body is streamed straight from a server-side cursor.
+    """
+    if dataset not in DATASETS:
+        raise Http404("Unknown export dataset.")
+    fmt = request.GET.get("format", "jsonl")
+    if fmt not in FORMATS:
+        fmt = "jsonl"
+    compress = request.GET.get("gzip") in ("1", "true")
+
+    filename = f"{dataset}.{fmt}" + (".gz" if compress else "")
+    if compress:
+        content_type = "application/gzip"
+    else:
+        content_type = "text/csv; charset=utf-8" if fmt == "csv" else "application/x-ndjson; charset=utf-8"
+    response = StreamingHttpResponse(export_chunks(dataset, fmt, compress), content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+@staff_member_required
+def db_pool_metrics(request):
+    """
+    Staff-only JSON snapshot of this process's database connection pool:
+    in-use / idle connections, waiting requests and cumulative wait time.
+    """
+    return JsonResponse(pool_metrics())
+
+
+@staff_member_required
+def search_cache_metrics(request):
+    """
+    Staff-only JSON hit / miss counts of the search-result cache.
+    """
+    return JsonResponse(searchcache.search_cache_metrics())
@@ -38,6 +38,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',  # full-text search, GIN indexes
 
     # Third party apps
     'taggit',
@@ -48,10 +49,13 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # Collected static files (precompressed variants, far-future caching)
+    'blog.middleware.StaticFilesMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'blog.middleware.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -88,9 +92,55 @@ DATABASES = {
         "PASSWORD": "excell226",  # the password you set for that user
         "HOST": "127.0.0.1",         # or "localhost"
         "PORT": "5432",              # default PostgreSQL port
+        # Re-check a reused connection before each request instead of
+        # failing the request when the server dropped it
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
+# Keep connections open between requests (seconds; 0 = one per request),
+# or set BLOG_DB_POOL=1 to share a psycopg 3 connection pool per process.
+# The pool replaces persistent connections, so CONN_MAX_AGE must be 0.
+if os.environ.get("BLOG_DB_POOL", "") == "1":
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.environ.get("BLOG_DB_POOL_MIN", "2")),
+            "max_size": int(os.environ.get("BLOG_DB_POOL_MAX", "10")),
+            # Seconds a request waits for a free connection before erroring
+            "timeout": float(os.environ.get("BLOG_DB_POOL_TIMEOUT", "10")),
+            # Recycle connections after an hour, and idle ones after 10 minutes
+            "max_lifetime": 3600,
+            "max_idle": 600,
+        },
+    }
+else:
+    DATABASES["default"]["CONN_MAX_AGE"] = int(os.environ.get("BLOG_DB_CONN_MAX_AGE", "60"))
+
+# Read replicas: BLOG_DB_REPLICAS="host1,host2" adds aliases replica1, replica2
+# with the primary's credentials. blog.routers sends the reads of list,
+# detail, search, tag and feed pages there; everything else uses default.
+BLOG_DB_REPLICAS = []
+for number, host in enumerate(filter(None, os.environ.get("BLOG_DB_REPLICAS", "").split(",")), start=1):
+    alias = f"replica{number}"
+    DATABASES[alias] = {**DATABASES["default"], "HOST": host.strip(), "TEST": {"MIRROR": "default"}}
+    BLOG_DB_REPLICAS.append(alias)
+DATABASE_ROUTERS = ["blog.routers.ReplicaRouter"]
+# After writing a post, comment or tag, a client reads from the primary for
+# this many seconds, so it sees its own write despite replication lag
+BLOG_REPLICA_STICKY_SECONDS = 15
+
+
+# Cache
+# Holds rendered post-card / comment fragments and their version keys.
+# Use a shared backend (Redis, Memcached) in production so every worker
+# sees the same versions.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "django-blog",
+    }
+}
 
 
 # Password validation
@@ -135,8 +185,36 @@ STATICFILES_DIRS = [
     os.path.join(BASE_DIR, "static"),
 ]
 
-# In production, also set:
-# STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
+# collectstatic copies files here under content-hashed names (listed in
+# staticfiles.json), plus .gz / .br variants of text assets (.br needs the
+# optional brotli package); blog.middleware.StaticFilesMiddleware serves them
+STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
+
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "blog.storage.PrecompressedManifestStaticFilesStorage"},
+}
+
+# Cache lifetime (seconds) of static files served without a content hash
+BLOG_STATIC_MAX_AGE = 60
+
+# Full-text search configuration used for Post.search_vector
+BLOG_SEARCH_CONFIG = "english"
+
+# Pre-generated sitemaps (manage.py generate_sitemaps) and the absolute
+# URL prefix written into them
+BLOG_SITEMAP_ROOT = BASE_DIR / "sitemaps"
+BLOG_SITEMAP_SHARD_SIZE = 10000
+BLOG_SITE_URL = "http://localhost:8000"
+
+# Count post views in the in-process buffer (blog.popularity). The test
+# runner turns this off, so no flush lands inside another test's query counts
+BLOG_BUFFER_VIEWS = True
+TEST_RUNNER = "blog.tests.runner.BlogTestRunner"
+
+# Serve the list/detail/search pages with the async-ORM views; asgi.py turns
+# this on, so WSGI deployments keep the synchronous views
+BLOG_ASYNC_VIEWS = os.environ.get("BLOG_ASYNC_VIEWS", "") == "1"
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field